@@ -0,0 +1,48 @@
+"""add file_variants (image thumbnails / previews)
+
+Revision ID: 0d4a7b9e3c12
+Revises: f2b8c6d1e4a9
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0d4a7b9e3c12'
+down_revision: Union[str, None] = 'f2b8c6d1e4a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "file_variants",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "file_id",
+            sa.Integer(),
+            sa.ForeignKey("files.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("name", sa.String(length=20), nullable=False),
+        sa.Column("object_key", sa.String(length=512), nullable=False),
+        sa.Column("content_type", sa.String(length=100), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("width", sa.Integer(), nullable=False),
+        sa.Column("height", sa.Integer(), nullable=False),
+        sa.Column("checksum", sa.String(length=64), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("file_id", "name", name="uq_file_variants_file_id_name"),
+    )
+    op.create_index("ix_file_variants_id", "file_variants", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_file_variants_id", table_name="file_variants")
+    op.drop_table("file_variants")
@@ -0,0 +1,38 @@
+"""add posts keyset pagination indexes
+
+Revision ID: 3b8f1c2d4e5a
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8f1c2d4e5a'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_posts_board_id_created_at_id",
+        "posts",
+        ["board_id", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_posts_created_at_id",
+        "posts",
+        ["created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_posts_created_at_id", table_name="posts")
+    op.drop_index("ix_posts_board_id_created_at_id", table_name="posts")
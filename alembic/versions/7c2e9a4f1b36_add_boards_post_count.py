@@ -0,0 +1,36 @@
+"""add boards.post_count denormalized counter
+
+Revision ID: 7c2e9a4f1b36
+Revises: 3b8f1c2d4e5a
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e9a4f1b36'
+down_revision: Union[str, None] = '3b8f1c2d4e5a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "boards",
+        sa.Column("post_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    # backfill: 기존 게시글 수로 채움
+    op.execute(
+        "UPDATE boards SET post_count = "
+        "(SELECT COUNT(posts.id) FROM posts WHERE posts.board_id = boards.id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("boards", "post_count")
@@ -0,0 +1,61 @@
+"""add comments.path materialized path
+
+Revision ID: a91d5e3c7f20
+Revises: 7c2e9a4f1b36
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a91d5e3c7f20'
+down_revision: Union[str, None] = '7c2e9a4f1b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "comments",
+        sa.Column("path", sa.String(length=255), server_default="", nullable=False),
+    )
+
+    # backfill: 얕은 depth부터 부모 path + 10자리 0-패딩 id
+    conn = op.get_bind()
+    comments = sa.table(
+        "comments",
+        sa.column("id", sa.Integer),
+        sa.column("parent_id", sa.Integer),
+        sa.column("depth", sa.Integer),
+        sa.column("path", sa.String),
+    )
+    rows = conn.execute(
+        sa.select(comments.c.id, comments.c.parent_id).order_by(comments.c.depth, comments.c.id)
+    ).all()
+    paths: dict[int, str] = {}
+    for comment_id, parent_id in rows:
+        paths[comment_id] = paths.get(parent_id, "") + f"{comment_id:010d}"
+
+    update = (
+        sa.update(comments)
+        .where(comments.c.id == sa.bindparam("comment_id"))
+        .values(path=sa.bindparam("new_path"))
+    )
+    items = [{"comment_id": cid, "new_path": path} for cid, path in paths.items()]
+    for start in range(0, len(items), BATCH_SIZE):
+        conn.execute(update, items[start:start + BATCH_SIZE])
+
+    op.create_index("ix_comments_post_id_path", "comments", ["post_id", "path"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_comments_post_id_path", table_name="comments")
+    op.drop_column("comments", "path")
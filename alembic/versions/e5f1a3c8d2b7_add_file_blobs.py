@@ -0,0 +1,54 @@
+"""add file_blobs (content-addressed dedup storage)
+
+Revision ID: e5f1a3c8d2b7
+Revises: c4d7e2b9a815
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f1a3c8d2b7'
+down_revision: Union[str, None] = 'c4d7e2b9a815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "file_blobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("object_key", sa.String(length=512), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), server_default="1", nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("sha256", name="uq_file_blobs_sha256"),
+    )
+    op.create_index("ix_file_blobs_id", "file_blobs", ["id"])
+
+    # 여러 File 행이 같은 blob 경로를 공유하므로 files.object_key unique 제거
+    inspector = sa.inspect(op.get_bind())
+    with op.batch_alter_table("files") as batch:
+        for uc in inspector.get_unique_constraints("files"):
+            if uc["column_names"] == ["object_key"]:
+                batch.drop_constraint(uc["name"], type_="unique")
+        batch.add_column(sa.Column("blob_id", sa.Integer(), nullable=True))
+        batch.create_foreign_key("fk_files_blob_id", "file_blobs", ["blob_id"], ["id"])
+        batch.create_index("ix_files_blob_id", ["blob_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 주의: blob을 공유하던 File 행들은 object_key가 중복되므로 unique는 복원하지 않음
+    with op.batch_alter_table("files") as batch:
+        batch.drop_index("ix_files_blob_id")
+        batch.drop_constraint("fk_files_blob_id", type_="foreignkey")
+        batch.drop_column("blob_id")
+    op.drop_index("ix_file_blobs_id", table_name="file_blobs")
+    op.drop_table("file_blobs")
@@ -1,15 +1,18 @@
 # app/api/deps.py
 
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 
-from app.db.session import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal, AsyncSessionLocal, run_db
 from app.core.config import settings
-from app.crud.user import get_user_by_id
-from app.schemas.user import UserOut
+from app.crud.user import get_principal, principal_cache
+from app.schemas.user import UserPrincipal
 
 # DB 세션 Dependency
 def get_db() -> Generator:
@@ -24,16 +27,34 @@ def get_db() -> Generator:
         db.close()
 
 
+# 비동기 DB 세션 Dependency
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    요청마다 AsyncSession을 생성하고, 요청이 끝나면 종료 (DB_ASYNC=True 일 때 사용)
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def _get_sync_session(db: Session = Depends(get_db)) -> Session:
+    return db
+
+
+# 엔드포인트용 DB 세션 Dependency - DB_ASYNC 설정에 따라 AsyncSession 또는 Session.
+# 어느 쪽이든 엔드포인트에서는 `await run_db(db, crud_fn, ...)` 로 사용
+get_session = get_async_db if settings.DB_ASYNC else _get_sync_session
+
+
 # JWT 인증된 현재 유저 반환 Dependency
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 bearer_scheme = HTTPBearer()
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db = Depends(get_db)
-) -> UserOut:
+    db = Depends(get_session)
+) -> UserPrincipal:
     """
-    HTTP Bearer 토큰으로부터 현재 로그인된 유저 정보를 반환
+    HTTP Bearer 토큰으로부터 현재 로그인된 유저 정보(principal)를 반환
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -58,17 +79,18 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = get_user_by_id(db, user_id=user_id)
+    # 캐시 hit이면 DB(threadpool/greenlet) 왕복 없이 바로 반환
+    user = principal_cache.get(user_id) or await run_db(db, get_principal, user_id)
     if user is None:
         raise credentials_exception
     return user
 
 
-def get_current_user_oauth2(
+async def get_current_user_oauth2(
     # token: str = Depends(oauth2_scheme),
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db = Depends(get_db)
-) -> UserOut:
+    db = Depends(get_session)
+) -> UserPrincipal:
     """
     중요! 이건 OAuth2 방식. HTTPBearer 말고 OAuth2PasswordBearer 쓰려면 이걸로 할 것.
     JWT 토큰으로부터 현재 로그인된 유저 정보를 반환
@@ -100,15 +122,16 @@ def get_current_user_oauth2(
     except JWTError:
         raise credentials_exception
 
-    user = get_user_by_id(db, user_id=user_id)
+    # 캐시 hit이면 DB(threadpool/greenlet) 왕복 없이 바로 반환
+    user = principal_cache.get(user_id) or await run_db(db, get_principal, user_id)
     if user is None:
         raise credentials_exception
     return user
 
 # 관리자 권한 확인용 Dependency - Optional
-def get_current_admin(
-    current_user: UserOut = Depends(get_current_user)
-) -> UserOut:
+async def get_current_admin(
+    current_user: UserPrincipal = Depends(get_current_user)
+) -> UserPrincipal:
     """
     관리자만 접근 가능한 API 보호용 Dependency
     """
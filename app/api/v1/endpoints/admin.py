@@ -0,0 +1,42 @@
+# app/api/v1/endpoints/admin.py
+"""
+관리자 전용 운영 API (메트릭 등) - 라우터 단위로 get_current_admin 적용
+"""
+from typing import Literal
+
+from fastapi import APIRouter, Query, status
+
+from app.core.config import settings
+from app.db.pool_metrics import pool_metrics
+from app.db.query_profiler import query_report
+from app.schemas.metrics import PoolMetricsOut, SqlProfileReportOut
+
+router = APIRouter()
+
+
+@router.get("/metrics/db-pool", response_model=dict[str, PoolMetricsOut])
+async def read_db_pool_metrics():
+    """워커(프로세스)별 DB 커넥션 풀 상태 - 키는 풀 이름(sync / async)"""
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
+
+
+@router.get("/metrics/sql", response_model=SqlProfileReportOut)
+async def read_sql_profile(
+    sort: Literal["queries", "db_ms", "n_plus_one"] = Query("queries"),
+    limit: int = Query(20, ge=1, le=200),
+):
+    """
+    워커(프로세스)별 SQL 프로파일 리포트 - 요청당 쿼리가 많은(느린) 라우트 순
+    SQL_PROFILER_ENABLED=False면 endpoints는 비어 있음
+    """
+    return {
+        "enabled": settings.SQL_PROFILER_ENABLED,
+        "repeat_threshold": settings.SQL_PROFILER_REPEAT_THRESHOLD,
+        "endpoints": query_report.worst(sort, limit),
+    }
+
+
+@router.delete("/metrics/sql", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_sql_profile():
+    """SQL 프로파일 누적값 초기화 (측정 구간을 새로 시작할 때)"""
+    query_report.reset()
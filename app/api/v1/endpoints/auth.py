@@ -1,24 +1,26 @@
 # app/api/v1/endpoints/auth.py
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
 
 from app.schemas.auth import SignUpRequest, SignUpResponse, LoginRequest, TokenPair, RefreshToken
-from app.api.deps import get_db
+from app.api.deps import get_session
 from app.services.auth import register_user, authenticate_user, refresh_access_token
 
 router = APIRouter()
 
+# 회원 가입/로그인의 bcrypt 해싱은 전용 실행기(app/services/password_hasher.py)에서 실행
+# - 공용 threadpool을 차지하지 않고, 밀리면 503(Retry-After)으로 바로 거절
+
 
 @router.post("/signup", response_model=SignUpResponse, status_code=status.HTTP_201_CREATED)
-def signup(payload: SignUpRequest, db: Session = Depends(get_db)):
+async def signup(payload: SignUpRequest, db=Depends(get_session)):
     """회원 가입"""
-    user = register_user(db, payload)
+    user = await register_user(db, payload)
     return user
 
 @router.post("/login", response_model=TokenPair)
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
+async def login(payload: LoginRequest, db=Depends(get_session)):
     """JWT 로그인"""
-    token = authenticate_user(db, payload)
+    token = await authenticate_user(db, payload)
     return token
 
 @router.post("/refresh", response_model=TokenPair)
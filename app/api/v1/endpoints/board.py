@@ -1,67 +1,37 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.api.deps import get_db
-from app.schemas.board import BoardCreate, BoardOut
+from app.api.deps import get_session
+from app.crud import board as board_crud
 from app.db.models.board import Board
-from app.db.models.post import Post
+from app.db.session import run_db
+from app.schemas.board import BoardCreate, BoardOut
 
 router = APIRouter()
 
 
-@router.post("/", response_model=BoardOut)
-def create_board(payload: BoardCreate, db: Session = Depends(get_db)):
-    board = Board(**payload.dict())
-    db.add(board)
-    db.commit()
-    db.refresh(board)
+# 게시글 수는 boards.post_count(비정규화 카운터)를 그대로 사용 - posts 테이블 집계 없음
+def _to_board_out(board: Board) -> BoardOut:
     return BoardOut(
         id=board.id,
         name=board.name,
         description=board.description,
-        posts=0,
+        posts=board.post_count,
         created_at=board.created_at,
     )
 
+
+def _list_board_outs(db) -> list[BoardOut]:
+    return [_to_board_out(board) for board in board_crud.get_boards(db)]
+
+
+@router.post("/", response_model=BoardOut)
+async def create_board(payload: BoardCreate, db=Depends(get_session)):
+    return await run_db(db, lambda s: _to_board_out(board_crud.create_board(s, payload)))
+
 @router.get("/", response_model=list[BoardOut])
-def get_boards(db: Session = Depends(get_db)):
-    results = (
-        db.query(Board, func.count(Post.id).label("posts"))
-        .outerjoin(Post, Board.id == Post.board_id)
-        .group_by(Board.id)
-        .all()
-    )
-    boards = []
-    for board, posts in results:
-        boards.append(
-            BoardOut(
-                id=board.id,
-                name=board.name,
-                description=board.description,
-                posts=posts,
-                created_at=board.created_at,
-            )
-        )
-    return boards
+async def get_boards(db=Depends(get_session)):
+    return await run_db(db, _list_board_outs)
 
 
 @router.get("/all_boards", response_model=list[BoardOut])
-def list_all_boards(db: Session = Depends(get_db)):
-    results = (
-        db.query(Board, func.count(Post.id).label("posts"))
-        .outerjoin(Post, Board.id == Post.board_id)
-        .group_by(Board.id)
-        .all()
-    )
-    boards = []
-    for board, posts in results:
-        boards.append(
-            BoardOut(
-                id=board.id,
-                name=board.name,
-                description=board.description,
-                posts=posts,
-                created_at=board.created_at,
-            )
-        )
-    return boards
+async def list_all_boards(db=Depends(get_session)):
+    return await run_db(db, _list_board_outs)
@@ -1,11 +1,13 @@
 # app/api/v1/endpoints/comments.py
-from typing import List
-from fastapi import APIRouter, Depends, Path, status
+from typing import List, Sequence
+from fastapi import APIRouter, Depends, Path, Query, status
 from sqlalchemy.orm import Session
 
-from app.schemas.comment import CommentCreate, CommentUpdate, CommentOut
-from app.api.deps import get_db, get_current_user
+from app.core.config import settings
+from app.schemas.comment import CommentCreate, CommentUpdate, CommentOut, CommentTreePage
+from app.api.deps import get_session, get_current_user
 from app.crud import comment as comment_crud
+from app.db.session import run_db
 
 router = APIRouter()
 
@@ -13,51 +15,76 @@ router = APIRouter()
 # 댓글 ~~
 
 @router.get("/posts/{post_id}/comments", response_model=List[CommentOut])
-def list_comments(post_id: int, db: Session = Depends(get_db)):
-    return comment_crud.get_comments_by_post(db, post_id)
+async def list_comments(post_id: int, db=Depends(get_session)):
+    return await run_db(db, lambda s: _to_outs(comment_crud.get_comments_by_post(s, post_id)))
+
+@router.get("/posts/{post_id}/comments/tree", response_model=CommentTreePage)
+async def list_comment_tree(
+    post_id: int,
+    cursor: str | None = Query(None, description="이전 페이지 응답의 next_cursor"),
+    size: int | None = Query(None, ge=1, le=settings.COMMENT_TREE_MAX_PAGE_SIZE),
+    max_depth: int | None = Query(None, ge=0, le=settings.COMMENT_MAX_DEPTH),
+    db=Depends(get_session),
+):
+    """게시글의 댓글 트리 전체(대댓글 포함)를 한 번에 조회"""
+    items, next_cursor = await run_db(
+        db, comment_crud.get_comment_tree,
+        post_id, cursor, size or settings.COMMENT_TREE_PAGE_SIZE, max_depth,
+    )
+    return {"items": items, "next_cursor": next_cursor}
 
 @router.post("/posts/{post_id}/comments", response_model=CommentOut, status_code=status.HTTP_201_CREATED)
-def create_comment(
+async def create_comment(
     post_id: int,
     payload: CommentCreate,
-    db: Session = Depends(get_db),
+    db=Depends(get_session),
     current_user=Depends(get_current_user)
 ):
-    return comment_crud.create_comment(db, post_id, payload, current_user.id)
+    return await run_db(db, lambda s: _to_out(comment_crud.create_comment(s, post_id, payload, current_user.id)))
 
 @router.put("/comments/{comment_id}", response_model=CommentOut)
-def update_comment(
+async def update_comment(
     comment_id: int,
     payload: CommentUpdate,
-    db: Session = Depends(get_db),
+    db=Depends(get_session),
     current_user=Depends(get_current_user)
 ):
-    return comment_crud.update_comment(db, comment_id, payload, current_user.id)
+    return await run_db(db, lambda s: _to_out(comment_crud.update_comment(s, comment_id, payload, current_user.id)))
 
 @router.delete("/comments/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_comment(
+async def delete_comment(
     comment_id: int,
-    db: Session = Depends(get_db),
+    db=Depends(get_session),
     current_user=Depends(get_current_user)
 ):
-    comment_crud.delete_comment(db, comment_id, current_user.id)
+    await run_db(db, comment_crud.delete_comment, comment_id, current_user.id)
 
 # ~~ 댓글
 
 # 대댓글 ~~
-# TODO: Nested의 레벨 몇까지 제한할지??
+# Nested 최대 레벨은 settings.COMMENT_MAX_DEPTH
 
 @router.get("/comments/{comment_id}/replies", response_model=List[CommentOut])
-def list_replies(comment_id: int, db: Session = Depends(get_db)):
-    return comment_crud.get_replies(db, comment_id)
+async def list_replies(comment_id: int, db=Depends(get_session)):
+    return await run_db(db, lambda s: _to_outs(comment_crud.get_replies(s, comment_id)))
 
 @router.post("/comments/{comment_id}/replies", response_model=CommentOut, status_code=status.HTTP_201_CREATED)
-def create_reply(
+async def create_reply(
     comment_id: int,
     payload: CommentCreate,
-    db: Session = Depends(get_db),
+    db=Depends(get_session),
     current_user=Depends(get_current_user)
 ):
-    return comment_crud.create_reply(db, comment_id, payload, current_user.id)
+    return await run_db(db, lambda s: _to_out(comment_crud.create_reply(s, comment_id, payload, current_user.id)))
+
+# ~~ 대댓글
+
+
+# 내부 헬퍼 (run_db 안에서 ORM 객체 -> 응답 스키마 변환) ~~
+def _to_out(comment) -> CommentOut:
+    return CommentOut.model_validate(comment, from_attributes=True)
+
 
-# ~~ 대댓글
\ No newline at end of file
+def _to_outs(comments: Sequence) -> List[CommentOut]:
+    return [_to_out(c) for c in comments]
+# ~~ 내부 헬퍼
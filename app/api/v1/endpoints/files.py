@@ -1,36 +1,137 @@
 # app/api/v1/endpoints/files.py
-from fastapi import APIRouter, Depends, UploadFile, File as FastAPIFile, status
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from app.api.deps import get_db, get_current_user
-from app.services.storage import save_file, get_file_stream, delete_file
-from app.schemas.file import FileOut
+from typing import Literal, Optional
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, Query, Request, UploadFile, File as FastAPIFile, status
+from fastapi.responses import RedirectResponse, StreamingResponse
+from app.api.deps import get_session, get_current_user
+from app.services.storage import (
+    save_file, get_download, iter_file_chunks, delete_file,
+    create_upload_session, get_upload_session, write_upload_chunk,
+    finalize_upload_session, abort_upload_session,
+)
+from app.schemas.file import FileOut, UploadSessionCreate, UploadSessionOut
+from app.services import image_variants, post_cache
+from app.utils.file_response import ConditionalFileResponse
 
 router = APIRouter()
 
 
 @router.post("/posts/{post_id}/files", response_model=FileOut, status_code=status.HTTP_201_CREATED)
-def upload_file(
+async def upload_file(
     post_id: int,
     file: UploadFile = FastAPIFile(...),
-    db: Session = Depends(get_db),
+    db=Depends(get_session),
     current_user=Depends(get_current_user),
 ):
-    return save_file(db, file, post_id, current_user.id)
+    saved = await save_file(db, file, post_id, current_user.id)
+    await post_cache.invalidate(post_id)  # PostOut.files 갱신
+    image_variants.schedule(saved.id, saved.content_type)  # 썸네일/미리보기는 백그라운드로
+    return saved
 
 @router.get("/files/{file_id}/download")
-def download_file(file_id: int, db: Session = Depends(get_db)):
-    file_path, file_meta = get_file_stream(db, file_id)
-    return FileResponse(
-        path=file_path,
-        filename=file_meta.filename,
-        media_type=file_meta.content_type
+async def download_file(
+    file_id: int,
+    variant: Optional[Literal["thumb", "preview"]] = Query(
+        None, description="이미지 파생본 (생성 전이면 원본)"
+    ),
+    db=Depends(get_session),
+):
+    """
+    - S3 등 presigned URL을 지원하는 저장소: 307로 저장소에 직접 받으러 보냄
+    - 로컬 저장소: Range(이어받기·동영상 탐색), If-None-Match/If-Modified-Since(304) 지원
+      ETag는 저장 시 계산한 sha256
+    - 그 외: 저장소에서 읽어 스트리밍
+    """
+    target = await get_download(db, file_id, variant)
+    if target.url is not None:
+        return RedirectResponse(target.url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+    if target.path is not None:
+        return ConditionalFileResponse(
+            path=target.path,
+            checksum=target.checksum,
+            filename=target.filename,
+            media_type=target.content_type
+        )
+    headers = {"Content-Disposition": f"attachment; filename*=utf-8''{quote(target.filename)}"}
+    if target.checksum:
+        headers["ETag"] = f'"{target.checksum}"'
+    return StreamingResponse(
+        iter_file_chunks(target.object_key),
+        media_type=target.content_type,
+        headers=headers,
     )
 
 @router.delete("/files/{file_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_uploaded_file(
+async def delete_uploaded_file(
     file_id: int,
-    db: Session = Depends(get_db),
+    db=Depends(get_session),
+    current_user=Depends(get_current_user),
+):
+    post_id = await delete_file(db, file_id)
+    await post_cache.invalidate(post_id)  # PostOut.files 갱신
+
+
+# 청크(이어 올리기) 업로드 ~~
+# 1) POST /posts/{post_id}/uploads           세션 생성 (파일명, 전체 크기)
+# 2) PUT  /uploads/{upload_id}?offset=N       바디(raw bytes)를 offset N부터 이어 씀
+#    끊기면 GET /uploads/{upload_id} 로 offset 확인 후 그 지점부터 다시 PUT
+# 3) POST /uploads/{upload_id}/complete       파일 확정 → FileOut
+@router.post(
+    "/posts/{post_id}/uploads",
+    response_model=UploadSessionOut,
+    status_code=status.HTTP_201_CREATED,
+)
+async def start_upload(
+    post_id: int,
+    payload: UploadSessionCreate,
+    db=Depends(get_session),
+    current_user=Depends(get_current_user),
+):
+    return await create_upload_session(db, post_id, current_user.id, payload)
+
+
+@router.get("/uploads/{upload_id}", response_model=UploadSessionOut)
+async def upload_status(
+    upload_id: str,
+    db=Depends(get_session),
+    current_user=Depends(get_current_user),
+):
+    return await get_upload_session(db, upload_id, current_user.id)
+
+
+@router.put("/uploads/{upload_id}", response_model=UploadSessionOut)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    db=Depends(get_session),
+    current_user=Depends(get_current_user),
+):
+    return await write_upload_chunk(db, upload_id, current_user.id, offset, request.stream())
+
+
+@router.post(
+    "/uploads/{upload_id}/complete",
+    response_model=FileOut,
+    status_code=status.HTTP_201_CREATED,
+)
+async def complete_upload(
+    upload_id: str,
+    db=Depends(get_session),
+    current_user=Depends(get_current_user),
+):
+    saved, post_id = await finalize_upload_session(db, upload_id, current_user.id)
+    await post_cache.invalidate(post_id)  # PostOut.files 갱신
+    image_variants.schedule(saved.id, saved.content_type)
+    return saved
+
+
+@router.delete("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def cancel_upload(
+    upload_id: str,
+    db=Depends(get_session),
     current_user=Depends(get_current_user),
 ):
-    delete_file(db, file_id)
+    await abort_upload_session(db, upload_id, current_user.id)
+# ~~ 청크(이어 올리기) 업로드
@@ -1,76 +1,120 @@
 # app/api/v1/endpoints/posts.py
-from typing import List, Any
+from typing import List, Any, Union
 from fastapi import APIRouter, Depends, Path, Query, UploadFile, File, status, HTTPException
 from sqlalchemy.orm import Session
 
-from app.schemas.post import PostCreate, PostUpdate, PostOut, PostListOut
-from app.api.deps import get_db, get_current_user, get_current_admin
+from app.schemas.post import PostCreate, PostUpdate, PostOut, PostListOut, PostCursorPage
+from app.api.deps import get_session, get_current_user, get_current_admin
 from app.crud import post as post_crud
+from app.db.session import run_db
+from app.services import post_cache, storage
 
 router = APIRouter()
 
+# cursor 파라미터가 주어지면(빈 문자열 = 첫 페이지) OFFSET 대신 keyset 페이지네이션으로 동작
+CURSOR_DESCRIPTION = "커서 모드: 빈 값이면 첫 페이지, 이후에는 응답의 next_cursor를 그대로 전달"
 
-@router.get("/all_posts", response_model=List[PostListOut])
-def list_posts_all(
+
+@router.get("/all_posts", response_model=Union[List[PostListOut], PostCursorPage])
+async def list_posts_all(
     page: int = Query(1, ge=1),
-    size: int = Query(10, le=100),
-    db: Session = Depends(get_db),
+    size: int = Query(10, ge=1, le=100),
+    cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
+    db=Depends(get_session),
     _: Any = Depends(get_current_admin),   # 관리자 권한 체크용 dependency (전체 게시글은 관리자만 확인 가능하도록)
 ):
-    return post_crud.get_posts(db, page, size)
+    if cursor is not None:
+        items, next_cursor = await run_db(db, post_crud.get_posts_keyset, cursor, size)
+        return {"items": items, "next_cursor": next_cursor}
+    return await run_db(db, post_crud.get_posts, page, size)
 
-@router.get("/boards/{board_id}/posts", response_model=List[PostListOut])
-def list_posts_by_board(
+@router.get("/boards/{board_id}/posts", response_model=Union[List[PostListOut], PostCursorPage])
+async def list_posts_by_board(
     board_id: int = Path(..., gt=0),
     page: int = Query(1, ge=1),
-    size: int = Query(10, le=100),
-    db: Session = Depends(get_db)
+    size: int = Query(10, ge=1, le=100),
+    cursor: str | None = Query(None, description=CURSOR_DESCRIPTION),
+    db=Depends(get_session)
 ):
-    return post_crud.get_posts_by_board(db, board_id, page, size)
+    if cursor is not None:
+        items, next_cursor = await run_db(db, post_crud.get_posts_by_board_keyset, board_id, cursor, size)
+        return {"items": items, "next_cursor": next_cursor}
+    return await run_db(db, post_crud.get_posts_by_board, board_id, page, size)
 
 @router.get("/boards/{board_id}/posts/{post_id}", response_model=PostOut)
-def read_post(
+async def read_post(
     board_id: int = Path(..., gt=0),
     post_id: int = Path(..., gt=0),
-    db: Session = Depends(get_db),
+    db=Depends(get_session),
 ):
-    post = post_crud.get_post(db, post_id)
+    post = await post_cache.get_post(
+        post_id, lambda: run_db(db, _load_post_out, post_id)
+    )
     if post.board_id != board_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found in this board")
     return post
 
 @router.post("/boards/{board_id}/posts", response_model=PostOut, status_code=status.HTTP_201_CREATED)
-def create_post(
+async def create_post(
     payload: PostCreate,
     board_id: int = Path(..., gt=0),
-    db: Session = Depends(get_db),
+    db=Depends(get_session),
     current_user=Depends(get_current_user)
 ):
     if payload.board_id != board_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Board ID mismatch")
-    return post_crud.create_post(db, payload, current_user.id)
+    return await run_db(db, _create_post_out, payload, current_user.id)
 
 @router.put("/boards/{board_id}/posts/{post_id}", response_model=PostOut)
-def update_post(
+async def update_post(
     post_id: int,
     payload: PostUpdate,
     board_id: int = Path(..., gt=0),
-    db: Session = Depends(get_db),
+    db=Depends(get_session),
     current_user=Depends(get_current_user)
 ):
-    post = post_crud.get_post(db, post_id)
-    if post.board_id != board_id:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found in this board")
-    return post_crud.update_post(db, post_id, payload, current_user.id)
+    post = await run_db(db, _update_post_out, board_id, post_id, payload, current_user.id)
+    await post_cache.invalidate(post_id)
+    return post
 
 @router.delete("/boards/{board_id}/posts/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_post(
+async def delete_post(
     post_id: int,
     board_id: int = Path(..., gt=0),
-    db: Session = Depends(get_db),
+    db=Depends(get_session),
     current_user=Depends(get_current_user)
 ):
+    stale_keys = await run_db(db, _delete_post, board_id, post_id, current_user.id)
+    await post_cache.invalidate(post_id)
+    await storage.delete_objects(stale_keys)  # 커밋 이후 - 첨부 파일의 파생본 등
+
+
+# 내부 헬퍼 (run_db로 실행되는 동기 DB 작업 - ORM 객체는 여기서 응답 스키마로 변환) ~~
+def _to_post_out(post) -> PostOut:
+    return PostOut.model_validate(post, from_attributes=True)
+
+
+def _load_post_out(db: Session, post_id: int) -> PostOut:
+    return _to_post_out(post_crud.get_post(db, post_id))
+
+
+def _create_post_out(db: Session, payload: PostCreate, author_id: int) -> PostOut:
+    return _to_post_out(post_crud.create_post(db, payload, author_id))
+
+
+def _get_post_in_board(db: Session, board_id: int, post_id: int):
     post = post_crud.get_post(db, post_id)
     if post.board_id != board_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found in this board")
-    post_crud.delete_post(db, post_id, current_user.id)
+    return post
+
+
+def _update_post_out(db: Session, board_id: int, post_id: int, payload: PostUpdate, requester_id: int) -> PostOut:
+    _get_post_in_board(db, board_id, post_id)
+    return _to_post_out(post_crud.update_post(db, post_id, payload, requester_id))
+
+
+def _delete_post(db: Session, board_id: int, post_id: int, requester_id: int) -> list[str]:
+    _get_post_in_board(db, board_id, post_id)
+    return post_crud.delete_post(db, post_id, requester_id)
+# ~~ 내부 헬퍼
@@ -1,13 +1,27 @@
 # app/api/v1/endpoints/users.py
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
 
-from app.schemas.user import UserOut
-from app.api.deps import get_current_user
+from app.schemas.user import UserOut, UserPrincipal
+from app.api.deps import get_session, get_current_user
+from app.crud.user import get_user_by_id
+from app.db.session import run_db
 
 router = APIRouter()
 
 
 @router.get("/me", response_model=UserOut)
-def read_current_user(current_user: UserOut = Depends(get_current_user)):
+async def read_current_user(
+    current_user: UserPrincipal = Depends(get_current_user),
+    db=Depends(get_session),
+):
     """내 정보 조회"""
-    return current_user
+    user = await run_db(db, _load_user_out, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return user
+
+
+def _load_user_out(db: Session, user_id: int) -> UserOut | None:
+    user = get_user_by_id(db, user_id)
+    return UserOut.model_validate(user, from_attributes=True) if user is not None else None
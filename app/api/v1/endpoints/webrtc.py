@@ -1,15 +1,17 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 import json
 
-from app.services.webrtc import CallManager
+from app.services.webrtc import call_manager as manager
 
 router = APIRouter()
-manager = CallManager()
 
 
 @router.websocket("/ws/webrtc/{room_id}")
 async def webrtc_endpoint(websocket: WebSocket, room_id: str, username: str):
-    """WebRTC signaling endpoint."""
+    """
+    WebRTC signaling endpoint.
+    offer / answer / candidate 에 "to"(상대 username)를 넣으면 그 피어에게만 전달
+    """
     await manager.connect(websocket, room_id, username)
     try:
         while True:
@@ -18,6 +20,11 @@ async def webrtc_endpoint(websocket: WebSocket, room_id: str, username: str):
                 data = json.loads(text)
             except json.JSONDecodeError:
                 data = {"type": "message", "payload": text}
-            await manager.broadcast(room_id, data, sender=username)
+            if not isinstance(data, dict):
+                data = {"type": "message", "payload": data}
+            await manager.relay(room_id, data, sender=username)
     except WebSocketDisconnect:
-        await manager.disconnect(room_id, username)
+        pass
+    finally:
+        # 예외로 빠져나가도 로컬 연결과 Redis 레지스트리에서 빠지도록
+        await manager.disconnect(room_id, username, websocket)
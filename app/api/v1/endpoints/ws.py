@@ -1,3 +1,6 @@
+import json
+from typing import Optional
+
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from app.services.websocket import ConnectionManager
@@ -7,12 +10,41 @@ manager = ConnectionManager()
 
 
 @router.websocket("/ws/chat/{room_id}")
-async def websocket_endpoint(websocket: WebSocket, room_id: str, username: str):
-    """WebSocket endpoint for chat rooms."""
-    await manager.connect(websocket, room_id, username)
+async def websocket_endpoint(
+    websocket: WebSocket, room_id: str, username: str, last_id: Optional[str] = None
+):
+    """
+    WebSocket endpoint for chat rooms.
+    일반 텍스트는 채팅 메시지, {"type": "load_older", "before": "<id>", "limit": n} 는 이전 기록 요청
+    재접속 시 마지막으로 받은 메시지 id를 last_id로 넘기면 그 뒤 메시지만 받음
+    """
+    await manager.connect(websocket, room_id, username, last_id)
     try:
         while True:
             data = await websocket.receive_text()
+            command = _parse_command(data)
+            if command is not None and command.get("type") == "load_older":
+                limit = command.get("limit")
+                await manager.send_history(
+                    websocket,
+                    room_id,
+                    before=str(command.get("before") or "") or None,
+                    limit=limit if isinstance(limit, int) else None,
+                )
+                continue
             await manager.send_message(room_id, f"{username}: {data}")
     except WebSocketDisconnect:
+        pass
+    finally:
+        # 예외로 빠져나가도(바이너리 프레임 등) 송신 큐·방 멤버십·백플레인 구독이 남지 않도록
         await manager.disconnect(websocket, room_id, username)
+
+
+def _parse_command(data: str) -> dict | None:
+    if not data.startswith("{"):
+        return None
+    try:
+        command = json.loads(data)
+    except json.JSONDecodeError:
+        return None
+    return command if isinstance(command, dict) else None
@@ -1,8 +1,9 @@
 # app/api/v1/router.py
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from .endpoints  import auth, users, posts, comments, files, ws, board, webrtc
+from app.api.deps import get_current_admin
+from .endpoints  import auth, users, posts, comments, files, ws, board, webrtc, admin
 
 api_router = APIRouter()
 
@@ -36,6 +37,7 @@ api_router.include_router(
 
 # Comment & Reply routes
 # - GET/POST    /api/v1/posts/{post_id}/comments
+# - GET         /api/v1/posts/{post_id}/comments/tree
 # - PUT/DELETE /api/v1/comments/{comment_id}
 # - GET/POST    /api/v1/comments/{comment_id}/replies
 api_router.include_router(
@@ -47,6 +49,9 @@ api_router.include_router(
 # - POST /api/v1/posts/{post_id}/files
 # - GET  /api/v1/files/{file_id}/download
 # - DELETE /api/v1/files/{file_id}
+# - POST /api/v1/posts/{post_id}/uploads          (청크 업로드 세션 생성)
+# - GET/PUT/DELETE /api/v1/uploads/{upload_id}
+# - POST /api/v1/uploads/{upload_id}/complete
 api_router.include_router(
     files.router,
     tags=["Files"],
@@ -63,3 +68,13 @@ api_router.include_router(
     webrtc.router,
     tags=["WebRTC"],
 )
+
+# Admin routes (/api/v1/admin) - 관리자만
+# - GET /api/v1/admin/metrics/db-pool
+# - GET/DELETE /api/v1/admin/metrics/sql
+api_router.include_router(
+    admin.router,
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(get_current_admin)],
+)
@@ -0,0 +1,72 @@
+# app/core/body_limit.py
+
+"""
+요청 바디 크기 제한 ASGI 미들웨어
+
+multipart 업로드는 엔드포인트가 호출되기 전에 Starlette가 바디 전체를 임시 파일로 받아 두므로,
+엔드포인트에서 크기를 검사하면 이미 늦음. 바디가 들어오는 도중에 잘라내기 위해:
+- Content-Length가 한도를 넘으면 바디를 읽지 않고 바로 413
+- Content-Length가 없거나(chunked) 거짓이면, 받은 바이트를 세다가 한도를 넘는 순간 413
+  (receive()에서 HTTPException을 던지면 FastAPI가 400으로 바꾸지 않고 그대로 처리함)
+"""
+
+from fastapi import HTTPException, status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Request body exceeds {max_bytes} bytes",
+    )
+
+
+class BodySizeLimitMiddleware:
+    def __init__(self, app: ASGIApp, max_bytes: int) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self.max_bytes:
+                    await self._reject(scope, receive, send)
+                    return
+                break
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise _too_large(self.max_bytes)
+            return message
+
+        async def tracked_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracked_send)
+        except HTTPException as exc:
+            # 보통은 FastAPI 예외 핸들러가 413 응답으로 바꿔 주지만,
+            # 핸들러 밖에서 바디를 읽은 경우를 대비해 여기서도 응답
+            if exc.status_code != status.HTTP_413_REQUEST_ENTITY_TOO_LARGE or response_started:
+                raise
+            await self._reject(scope, receive, send)
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send) -> None:
+        exc = _too_large(self.max_bytes)
+        response = JSONResponse({"detail": exc.detail}, status_code=exc.status_code)
+        await response(scope, receive, send)
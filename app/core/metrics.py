@@ -0,0 +1,207 @@
+# app/core/metrics.py
+
+"""
+HTTP 요청 메트릭 (Prometheus 텍스트 형식)
+
+- MetricsMiddleware: 라우트 템플릿(예: /api/v1/posts/{post_id}) 단위로
+    요청 수(상태 코드별) / 처리 시간 히스토그램 / 처리 중인 요청 수(gauge) 집계
+  라우트는 FastAPI가 매칭 후 scope["route"]에 넣어 주는 APIRoute.path를 사용 (실제 경로 X → 라벨 수 폭증 방지)
+  매칭되지 않은 요청(404 등)은 route="<unmatched>"로 묶음
+- 오버헤드: 요청당 dict 조회 몇 번 + bisect 한 번 (이벤트 루프 단일 스레드라 락 없음)
+- 여러 워커 집계: METRICS_MULTIPROC_DIR를 지정하면 워커마다 자기 스냅샷을
+  <dir>/metrics-<pid>.json 에 주기적으로(METRICS_FLUSH_SECONDS) 기록하고,
+  /metrics 요청을 받은 워커가 전체 파일을 합산해서 응답
+  - 카운터/히스토그램은 종료된 워커 것까지 합산 (재시작해도 값이 줄지 않도록)
+  - 처리 중 요청 수(gauge)는 살아 있는 워커 것만
+  - 서버(전체 워커)를 새로 띄우기 전에 디렉터리를 비울 것
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# 처리 시간 히스토그램 구간 (단위: 초)
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestMetrics:
+    """
+    워커(프로세스) 하나의 요청 메트릭
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.in_progress = 0
+        # (method, route, status) -> 요청 수
+        self.requests: dict[tuple[str, str, str], int] = {}
+        # (method, route) -> [구간별 개수(누적 아님) ..., +Inf 구간 개수, 합계(초), 전체 개수]
+        self.latency: dict[tuple[str, str], list[float]] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route, str(status))
+        self.requests[key] = self.requests.get(key, 0) + 1
+        series = self.latency.get((method, route))
+        if series is None:
+            series = self.latency[(method, route)] = [0] * (len(self.buckets) + 3)
+        series[bisect.bisect_left(self.buckets, seconds)] += 1
+        series[-2] += seconds
+        series[-1] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "in_progress": self.in_progress,
+            "requests": [[*key, count] for key, count in self.requests.items()],
+            "latency": [[*key, list(series)] for key, series in self.latency.items()],
+        }
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, metrics: Optional["RequestMetrics"] = None) -> None:
+        self.app = app
+        self.metrics = metrics or request_metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500  # 응답 시작 전에 예외가 나면 500으로 기록
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.metrics.in_progress += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.metrics.in_progress -= 1
+            route = scope.get("route")
+            self.metrics.observe(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status_code,
+                time.perf_counter() - started,
+            )
+
+
+# 여러 워커 집계 ~~
+def write_snapshot(directory: Path, metrics: Optional[RequestMetrics] = None) -> None:
+    """
+    이 워커의 스냅샷을 <directory>/metrics-<pid>.json 으로 원자적으로 교체
+    """
+    metrics = metrics or request_metrics
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"metrics-{os.getpid()}.json"
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(metrics.snapshot()))
+    os.replace(tmp_path, path)
+
+
+def read_snapshots(directory: Path) -> list[dict[str, Any]]:
+    snapshots = []
+    for path in sorted(directory.glob("metrics-*.json")):
+        try:
+            snapshots.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            logger.warning("skipping unreadable metrics file %s", path)
+    return snapshots
+
+
+async def run_flush_loop(directory: Path, interval_seconds: float) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await run_in_threadpool(write_snapshot, directory)
+        except OSError:
+            logger.exception("metrics flush failed")
+# ~~ 여러 워커 집계
+
+
+# Prometheus 텍스트 형식 ~~
+def render_prometheus(snapshots: Iterable[dict[str, Any]], buckets: tuple[float, ...] = LATENCY_BUCKETS) -> str:
+    requests: dict[tuple[str, ...], int] = {}
+    latency: dict[tuple[str, ...], list[float]] = {}
+    in_progress = 0
+    for snapshot in snapshots:
+        if _pid_alive(snapshot.get("pid")):
+            in_progress += snapshot["in_progress"]
+        for *key, count in snapshot["requests"]:
+            requests[tuple(key)] = requests.get(tuple(key), 0) + count
+        for method, route, series in snapshot["latency"]:
+            merged = latency.setdefault((method, route), [0] * len(series))
+            for index, value in enumerate(series):
+                merged[index] += value
+
+    lines = [
+        "# HELP http_requests_total Total HTTP requests by route template and status code.",
+        "# TYPE http_requests_total counter",
+    ]
+    for (method, route, status), count in sorted(requests.items()):
+        lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+    lines += [
+        "# HELP http_request_duration_seconds HTTP request latency by route template.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (method, route), series in sorted(latency.items()):
+        cumulative = 0
+        for bound, count in zip((*buckets, "+Inf"), series[:-2]):
+            cumulative += count
+            le = bound if isinstance(bound, str) else repr(bound)
+            lines.append(
+                f"http_request_duration_seconds_bucket{_labels(method=method, route=route, le=le)} {int(cumulative)}"
+            )
+        labels = _labels(method=method, route=route)
+        lines.append(f"http_request_duration_seconds_sum{labels} {series[-2]:.6f}")
+        lines.append(f"http_request_duration_seconds_count{labels} {int(series[-1])}")
+
+    lines += [
+        "# HELP http_requests_in_progress HTTP requests currently being processed.",
+        "# TYPE http_requests_in_progress gauge",
+        f"http_requests_in_progress {in_progress}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if pid is None or pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+# ~~ Prometheus 텍스트 형식
+
+
+# 워커(프로세스)당 하나
+request_metrics = RequestMetrics()
@@ -30,7 +30,14 @@ ALGORITHM: str = settings.ALGORITHM
 
 
 # Password hashing / verification ~~
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min/max를 BCRYPT_ROUNDS로 고정 → cost가 다른 기존 해시는 needs_update로 잡혀서 로그인 때 재해싱됨
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -39,6 +46,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    verify_password + 재해싱 필요 여부 확인
+    (일치 여부, 저장된 해시의 cost가 BCRYPT_ROUNDS와 다르면 새 해시 / 아니면 None)
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     """
     평문 패스워드를 bcrypt 알고리즘으로 해싱하여 반환
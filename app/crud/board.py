@@ -0,0 +1,28 @@
+# app/crud/board.py
+
+"""
+게시판(Board) CRUD 레이어
+"""
+
+from typing import List
+
+from sqlalchemy.orm import Session
+
+from app.db.models.board import Board
+
+
+# 조회
+def get_boards(db: Session) -> List[Board]:
+    """
+    게시판 전체 목록 (게시글 수는 비정규화 컬럼 post_count)
+    """
+    return db.query(Board).order_by(Board.id).all()
+
+
+# 생성
+def create_board(db: Session, payload) -> Board:
+    board = Board(**payload.dict())
+    db.add(board)
+    db.commit()
+    db.refresh(board)
+    return board
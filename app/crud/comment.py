@@ -4,16 +4,17 @@
 댓글(Comment) & 대댓글(Reply) CRUD 레이어
 
 - 게시글(Post) 1:N
-- 자기 참조(parent/children) 트리
+- 자기 참조(parent/children) 트리 + materialized path(전체 트리 단일 쿼리 조회)
 - 작성자 본인 또는 관리자 권한 확인
 """
 
-from typing import Sequence
+from typing import List, Sequence, Tuple
 
 from fastapi import HTTPException, status
 from sqlalchemy import asc
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.db.models.comment import Comment
 from app.db.models.post import Post
 from app.db.models.user import User
@@ -44,6 +45,44 @@ def get_replies(db: Session, parent_id: int) -> Sequence[Comment]:
     )
 
 
+def get_comment_tree(
+    db: Session,
+    post_id: int,
+    cursor: str | None = None,
+    size: int = 200,
+    max_depth: int | None = None,
+) -> Tuple[List[dict], str | None]:
+    """
+    게시글의 댓글 트리를 (post_id, path) 인덱스 범위 쿼리 한 번으로 조회.
+    path 순(전위 순회)으로 size개씩 잘라서, 부모가 앞 페이지에 있는 노드는
+    최상위에 두고(parent_id로 클라이언트가 이어 붙임) (트리, next_cursor)를 반환
+    """
+    # 컬럼 프로젝션 + 작성자 JOIN: Comment.author(joined) → User의 selectin 관계(posts/comments/files)까지
+    # 딸려 오지 않도록 엔티티 대신 트리에 필요한 컬럼만 조회
+    query = db.query(
+        Comment.id,
+        Comment.content,
+        Comment.depth,
+        Comment.parent_id,
+        Comment.path,
+        Comment.created_at,
+        User.id.label("author_id"),
+        User.username.label("author_username"),
+    ).join(User, User.id == Comment.author_id).filter(Comment.post_id == post_id)
+    if cursor:
+        query = query.filter(Comment.path > cursor)
+    if max_depth is not None:
+        query = query.filter(Comment.depth <= max_depth)
+
+    rows = query.order_by(asc(Comment.path)).limit(size + 1).all()
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = rows[-1].path
+
+    return _assemble_tree(rows), next_cursor
+
+
 def _get_comment_or_404(db: Session, comment_id: int) -> Comment:
     """
     내부 헬퍼: 댓글 없으면 404
@@ -76,6 +115,8 @@ def create_comment(db: Session, post_id: int, payload, author_id: int) -> Commen
         depth=0,
     )
     db.add(comment)
+    db.flush()  # id 발급 후 path 계산
+    comment.path = _path_segment(comment.id)
     db.commit()
     db.refresh(comment)
     return comment
@@ -86,6 +127,11 @@ def create_reply(db: Session, parent_id: int, payload, author_id: int) -> Commen
     **대댓글** 생성
     """
     parent = _get_comment_or_404(db, parent_id)
+    if parent.depth + 1 > settings.COMMENT_MAX_DEPTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Replies cannot be nested deeper than {settings.COMMENT_MAX_DEPTH}",
+        )
 
     reply = Comment(
         content=payload.content,
@@ -95,6 +141,8 @@ def create_reply(db: Session, parent_id: int, payload, author_id: int) -> Commen
         depth=parent.depth + 1,
     )
     db.add(reply)
+    db.flush()  # id 발급 후 path 계산
+    reply.path = parent.path + _path_segment(reply.id)
     db.commit()
     db.refresh(reply)
     return reply
@@ -128,6 +176,38 @@ def delete_comment(db: Session, comment_id: int, requester_id: int) -> None:
     db.commit()
 
 
+# 내부 트리 헬퍼 ~~
+def _path_segment(comment_id: int) -> str:
+    """
+    materialized path 세그먼트: 고정 폭(10자리) 0-패딩으로 문자열 정렬 = 숫자 정렬
+    """
+    return f"{comment_id:010d}"
+
+
+def _assemble_tree(rows: Sequence) -> List[dict]:
+    """
+    path 순으로 정렬된 댓글 행(get_comment_tree의 프로젝션)을 O(n)으로 트리(dict)로 조립.
+    전위 순회 순서이므로 부모는 항상 자식보다 먼저 나옴
+    """
+    nodes: dict[int, dict] = {}
+    roots: List[dict] = []
+    for comment in rows:
+        node = {
+            "id": comment.id,
+            "content": comment.content,
+            "depth": comment.depth,
+            "parent_id": comment.parent_id,
+            "author": {"id": comment.author_id, "username": comment.author_username},
+            "created_at": comment.created_at,
+            "replies": [],
+        }
+        nodes[comment.id] = node
+        parent = nodes.get(comment.parent_id) if comment.parent_id is not None else None
+        (parent["replies"] if parent is not None else roots).append(node)
+    return roots
+# ~~ 내부 트리 헬퍼
+
+
 # 내부 권한 헬퍼 ~~
 def _authorize(comment: Comment, requester_id: int) -> None:
     """
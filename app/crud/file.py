@@ -1,8 +1,14 @@
 # app/crud/file.py
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.db.models.file import File
+from app.db.models.file_blob import FileBlob
+from app.db.models.file_variant import FileVariant
+from app.db.models.upload_session import UploadSession
 
 # 생성 
 def create_file_meta(
@@ -12,6 +18,8 @@ def create_file_meta(
     object_key: str,
     content_type: str,
     size: int,
+    checksum: str | None = None,
+    blob_id: int | None = None,
     post_id: int,
     uploader_id: int | None,
 ) -> File:
@@ -20,6 +28,8 @@ def create_file_meta(
         object_key=object_key,
         content_type=content_type,
         size=size,
+        checksum=checksum,
+        blob_id=blob_id,
         post_id=post_id,
         uploader_id=uploader_id,
     )
@@ -38,3 +48,319 @@ def get_file_meta(db: Session, file_id: int) -> Optional[File]:
 def delete_file_meta(db: Session, file: File) -> None:
     db.delete(file)
     db.commit()
+
+
+def remove_file_meta(db: Session, file: File) -> list[str]:
+    """
+    File 행(+ 파생본 행) 삭제 + blob 참조 해제 (커밋하지 않음)
+    스토리지에서 지워야 할 object_key 목록을 반환 - 원본은 blob이면 마지막 참조였을 때만
+    """
+    blob_id, object_key = file.blob_id, file.object_key
+    stale_keys = [key for (key,) in db.query(FileVariant.object_key).filter(FileVariant.file_id == file.id)]
+    db.query(FileVariant).filter(FileVariant.file_id == file.id).delete(synchronize_session=False)
+    db.delete(file)
+    db.flush()  # FK(files.blob_id) 때문에 File 행을 먼저 지움
+    if blob_id is None:
+        stale_keys.append(object_key)
+    elif (blob_key := release_blob(db, blob_id)) is not None:
+        stale_keys.append(blob_key)
+    return stale_keys
+
+
+# blob (중복 제거 저장) ~~
+# 아래 함수들은 커밋하지 않음 - File 행 생성/삭제와 같은 트랜잭션에서 호출할 것
+def acquire_blob(db: Session, sha256: str) -> Optional[FileBlob]:
+    """
+    같은 내용의 blob이 있으면 ref_count를 원자적으로 1 올리고 반환, 없으면 None
+    """
+    bumped = (
+        db.query(FileBlob)
+        .filter(FileBlob.sha256 == sha256)
+        .update({FileBlob.ref_count: FileBlob.ref_count + 1}, synchronize_session=False)
+    )
+    if not bumped:
+        return None
+    return db.query(FileBlob).filter(FileBlob.sha256 == sha256).one()
+
+
+def create_blob(db: Session, *, sha256: str, object_key: str, size: int) -> FileBlob:
+    """
+    새 blob 행 생성 (ref_count=1). 동시에 같은 sha256이 들어오면 flush에서 IntegrityError
+    """
+    blob = FileBlob(sha256=sha256, object_key=object_key, size=size, ref_count=1)
+    db.add(blob)
+    db.flush()
+    return blob
+
+
+def release_blob(db: Session, blob_id: int) -> Optional[str]:
+    """
+    ref_count를 1 내리고, 0이 되면 blob 행을 삭제
+    행이 삭제됐으면 디스크에서 지워야 할 object_key를, 아니면 None을 반환
+    """
+    db.query(FileBlob).filter(FileBlob.id == blob_id).update(
+        {FileBlob.ref_count: FileBlob.ref_count - 1}, synchronize_session=False
+    )
+    return delete_blob_if_unreferenced(db, blob_id)
+
+
+def release_blobs_for_post(db: Session, post_id: int) -> None:
+    """
+    게시글 삭제 시(첨부 File 행이 CASCADE로 지워짐) 참조하던 blob들의 ref_count를 내림
+    0이 된 blob은 주기 작업(collect_unreferenced_blobs)이 디스크까지 정리
+    """
+    rows = (
+        db.query(File.blob_id, func.count(File.id))
+        .filter(File.post_id == post_id, File.blob_id.isnot(None))
+        .group_by(File.blob_id)
+        .all()
+    )
+    for blob_id, refs in rows:
+        db.query(FileBlob).filter(FileBlob.id == blob_id).update(
+            {FileBlob.ref_count: FileBlob.ref_count - refs}, synchronize_session=False
+        )
+
+
+def remove_variants_for_post(db: Session, post_id: int) -> list[str]:
+    """
+    게시글 삭제 시 첨부 File들의 파생본 행 삭제 (커밋하지 않음)
+    remove_file_meta와 같이 스토리지에서 지워야 할 object_key 목록을 반환 - 파생본 + blob 없이 저장된 원본
+    """
+    file_ids = db.query(File.id).filter(File.post_id == post_id).scalar_subquery()
+    stale_keys = [key for (key,) in db.query(FileVariant.object_key).filter(FileVariant.file_id.in_(file_ids))]
+    stale_keys += [
+        key for (key,) in db.query(File.object_key).filter(File.post_id == post_id, File.blob_id.is_(None))
+    ]
+    db.query(FileVariant).filter(FileVariant.file_id.in_(file_ids)).delete(synchronize_session=False)
+    return stale_keys
+
+
+def get_unreferenced_blobs(db: Session, limit: int = 100) -> list[FileBlob]:
+    return (
+        db.query(FileBlob)
+        .filter(FileBlob.ref_count <= 0)
+        .order_by(FileBlob.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def delete_blob_if_unreferenced(db: Session, blob_id: int) -> Optional[str]:
+    blob = db.query(FileBlob).filter(FileBlob.id == blob_id).first()
+    if blob is None:
+        return None
+    object_key = blob.object_key
+    # 조건부 DELETE - 그 사이 다른 업로드가 ref_count를 올렸으면 지우지 않음
+    deleted = (
+        db.query(FileBlob)
+        .filter(FileBlob.id == blob_id, FileBlob.ref_count <= 0)
+        .delete(synchronize_session=False)
+    )
+    return object_key if deleted else None
+# ~~ blob (중복 제거 저장)
+
+
+# 청크 업로드 세션 ~~
+def create_upload_session(
+    db: Session,
+    *,
+    upload_id: str,
+    filename: str,
+    content_type: str,
+    total_size: int,
+    post_id: int,
+    uploader_id: int,
+    expires_at: datetime,
+) -> UploadSession:
+    upload = UploadSession(
+        id=upload_id,
+        filename=filename,
+        content_type=content_type,
+        total_size=total_size,
+        received=0,
+        post_id=post_id,
+        uploader_id=uploader_id,
+        expires_at=expires_at,
+    )
+    db.add(upload)
+    db.commit()
+    db.refresh(upload)
+    return upload
+
+
+def get_upload_session(db: Session, upload_id: str) -> Optional[UploadSession]:
+    return db.query(UploadSession).filter(UploadSession.id == upload_id).first()
+
+
+def advance_upload_session(
+    db: Session, upload_id: str, offset: int, written: int, expires_at: datetime
+) -> bool:
+    """
+    received가 아직 offset일 때만 offset + written으로 올리고 만료 시각 연장
+    (동시에 같은 offset으로 들어온 다른 청크가 먼저 반영됐으면 False)
+    """
+    updated = (
+        db.query(UploadSession)
+        .filter(UploadSession.id == upload_id, UploadSession.received == offset)
+        .update(
+            {UploadSession.received: offset + written, UploadSession.expires_at: expires_at},
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return bool(updated)
+
+
+def claim_upload_session(db: Session, upload_id: str) -> bool:
+    """
+    다 받은 세션을 완료 처리용으로 가져감(행 삭제) - 동시에 완료 요청이 와도 한쪽만 True
+    """
+    deleted = (
+        db.query(UploadSession)
+        .filter(UploadSession.id == upload_id, UploadSession.received == UploadSession.total_size)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return bool(deleted)
+
+
+def delete_upload_session(db: Session, upload_id: str) -> bool:
+    deleted = (
+        db.query(UploadSession)
+        .filter(UploadSession.id == upload_id)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return bool(deleted)
+
+
+def delete_expired_upload_sessions(db: Session, now: datetime, limit: int = 100) -> list[str]:
+    """
+    만료된 세션 행을 삭제하고, 삭제된 세션 id 목록을 반환 (스테이징 파일 정리용)
+    """
+    expired = [
+        upload_id
+        for (upload_id,) in db.query(UploadSession.id)
+        .filter(UploadSession.expires_at < now)
+        .limit(limit)
+        .all()
+    ]
+    if not expired:
+        return []
+    # 조회와 삭제 사이에 청크가 들어와 연장된 세션은 제외
+    (
+        db.query(UploadSession)
+        .filter(UploadSession.id.in_(expired), UploadSession.expires_at < now)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    still_there = {
+        upload_id
+        for (upload_id,) in db.query(UploadSession.id).filter(UploadSession.id.in_(expired)).all()
+    }
+    return [upload_id for upload_id in expired if upload_id not in still_there]
+# ~~ 청크 업로드 세션
+
+
+# 저장소 레이아웃 이전 (storage_layout 도구) ~~
+def get_plain_files_after(db: Session, after_id: int, limit: int) -> list[tuple[int, str]]:
+    """
+    blob을 쓰지 않는 File 행의 (id, object_key)를 id 순으로 (keyset)
+    """
+    return [
+        (file_id, object_key)
+        for file_id, object_key in db.query(File.id, File.object_key)
+        .filter(File.id > after_id, File.blob_id.is_(None))
+        .order_by(File.id)
+        .limit(limit)
+        .all()
+    ]
+
+
+def get_blobs_after(db: Session, after_id: int, limit: int) -> list[tuple[int, str]]:
+    return [
+        (blob_id, object_key)
+        for blob_id, object_key in db.query(FileBlob.id, FileBlob.object_key)
+        .filter(FileBlob.id > after_id)
+        .order_by(FileBlob.id)
+        .limit(limit)
+        .all()
+    ]
+
+
+def move_file_key(db: Session, file_id: int, old_key: str, new_key: str) -> bool:
+    """
+    object_key가 아직 old_key일 때만 new_key로 변경 (그 사이 삭제/변경됐으면 False)
+    """
+    moved = (
+        db.query(File)
+        .filter(File.id == file_id, File.object_key == old_key)
+        .update({File.object_key: new_key}, synchronize_session=False)
+    )
+    db.commit()
+    return bool(moved)
+
+
+def move_blob_key(db: Session, blob_id: int, old_key: str, new_key: str) -> bool:
+    """
+    blob과 그 blob을 가리키는 File 행들의 object_key를 한 트랜잭션에서 변경
+    """
+    moved = (
+        db.query(FileBlob)
+        .filter(FileBlob.id == blob_id, FileBlob.object_key == old_key)
+        .update({FileBlob.object_key: new_key}, synchronize_session=False)
+    )
+    if moved:
+        db.query(File).filter(File.blob_id == blob_id, File.object_key == old_key).update(
+            {File.object_key: new_key}, synchronize_session=False
+        )
+    db.commit()
+    return bool(moved)
+# ~~ 저장소 레이아웃 이전
+
+
+# 파생본(썸네일/미리보기) ~~
+def get_file_variant(db: Session, file_id: int, name: str) -> Optional[FileVariant]:
+    return (
+        db.query(FileVariant)
+        .filter(FileVariant.file_id == file_id, FileVariant.name == name)
+        .first()
+    )
+
+
+def create_file_variant(
+    db: Session,
+    *,
+    file_id: int,
+    name: str,
+    object_key: str,
+    content_type: str,
+    size: int,
+    width: int,
+    height: int,
+    checksum: str,
+) -> Optional[FileVariant]:
+    """
+    파생본 행 생성. 원본 File이 그 사이 삭제됐거나 이미 있으면 None (호출한 쪽이 객체 정리)
+    """
+    if db.query(File.id).filter(File.id == file_id).first() is None:
+        return None
+    variant = FileVariant(
+        file_id=file_id,
+        name=name,
+        object_key=object_key,
+        content_type=content_type,
+        size=size,
+        width=width,
+        height=height,
+        checksum=checksum,
+    )
+    db.add(variant)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return None
+    db.refresh(variant)
+    return variant
+# ~~ 파생본(썸네일/미리보기)
@@ -7,42 +7,53 @@
 권한 체크(작성자·관리자 여부)도 이곳에서 수행
 """
 
-from typing import List, Sequence
+import base64
+import json
+from datetime import datetime
+from typing import List, Sequence, Tuple
 
 from fastapi import HTTPException, status
-from sqlalchemy import desc
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, desc, or_
+from sqlalchemy.orm import Query, Session
 
+from app.crud import file as file_crud
+from app.db.models.board import Board
 from app.db.models.post import Post
 from app.db.models.user import User
 from app.db.models.file import File
 
 
 # 조회 ~~
-def get_posts_by_board(db: Session, board_id: int, page: int = 1, size: int = 10):
+# 목록 조회는 PostListOut에 필요한 컬럼 + users.username 만 프로젝션해서 가져옴.
+# (content Text 컬럼, joined-eager User 엔티티 로딩 및 ORM identity 생성 생략)
+def get_posts_by_board(db: Session, board_id: int, page: int = 1, size: int = 10) -> List[dict]:
+    """
+    게시판별 게시글 목록 조회 (기본: 최신순)
+    """
     offset = (page - 1) * size
-    return (
-        db.query(Post)
+    rows = (
+        _list_query(db)
         .filter(Post.board_id == board_id)
         .order_by(desc(Post.created_at))
         .offset(offset)
         .limit(size)
         .all()
     )
+    return _to_list_items(rows)
 
-def get_posts(db: Session, page: int = 1, size: int = 10) -> Sequence[Post]:
+def get_posts(db: Session, page: int = 1, size: int = 10) -> List[dict]:
     """
     게시글 목록 조회 (기본: 최신순)
     """
     offset: int = (page - 1) * size
-    return (
-        db.query(Post)
+    rows = (
+        _list_query(db)
         .order_by(desc(Post.created_at))
         .offset(offset)
         .limit(size)
         .all()
     )
-
+    return _to_list_items(rows)
 
 def get_post(db: Session, post_id: int) -> Post:
     """
@@ -58,6 +69,31 @@ def get_post(db: Session, post_id: int) -> Post:
 # ~~ 조회
 
 
+# 커서(keyset) 페이지네이션 ~~
+# OFFSET 방식은 깊은 페이지일수록 버려지는 행이 늘어나므로,
+# 마지막으로 본 (created_at, id) 다음부터 인덱스 범위 스캔으로 잘라옴.
+# - 게시판별: ix_posts_board_id_created_at_id
+# - 전체:     ix_posts_created_at_id
+def get_posts_by_board_keyset(
+    db: Session, board_id: int, cursor: str | None = None, size: int = 10
+) -> Tuple[List[dict], str | None]:
+    """
+    게시판별 게시글 목록 커서 조회 (최신순). (items, next_cursor) 반환
+    """
+    query = _list_query(db).filter(Post.board_id == board_id)
+    return _keyset_page(query, cursor, size)
+
+
+def get_posts_keyset(
+    db: Session, cursor: str | None = None, size: int = 10
+) -> Tuple[List[dict], str | None]:
+    """
+    전체 게시글 목록 커서 조회 (최신순). (items, next_cursor) 반환
+    """
+    return _keyset_page(_list_query(db), cursor, size)
+# ~~ 커서(keyset) 페이지네이션
+
+
 # 생성 ~~
 def create_post(db: Session, payload, author_id: int) -> Post:
     """
@@ -70,6 +106,7 @@ def create_post(db: Session, payload, author_id: int) -> Post:
         board_id=payload.board_id
     )
     db.add(post)
+    _bump_post_count(db, payload.board_id, 1)
     db.commit()
     db.refresh(post)
     return post
@@ -89,7 +126,10 @@ def update_post(db: Session, post_id: int, payload, requester_id: int) -> Post:
         post.title = payload.title
     if payload.content is not None:
         post.content = payload.content
-    if payload.board_id is not None:
+    if payload.board_id is not None and payload.board_id != post.board_id:
+        # 게시판 이동: 양쪽 게시판 카운터를 같은 트랜잭션에서 조정
+        _bump_post_count(db, post.board_id, -1)
+        _bump_post_count(db, payload.board_id, 1)
         post.board_id = payload.board_id
 
     db.commit()
@@ -99,20 +139,114 @@ def update_post(db: Session, post_id: int, payload, requester_id: int) -> Post:
 
 
 # 삭제 ~~
-def delete_post(db: Session, post_id: int, requester_id: int) -> None:
+def delete_post(db: Session, post_id: int, requester_id: int) -> list[str]:
     """
     게시글 삭제 - 작성자 본인 또는 관리자만 허용
+    커밋 후 스토리지에서 지워야 할 object_key 목록(첨부 파일의 파생본 등)을 반환
     """
     post = get_post(db, post_id)  # 404 처리 내장
 
     _authorize(post, requester_id)
 
+    _bump_post_count(db, post.board_id, -1)
+    file_crud.release_blobs_for_post(db, post.id)  # 첨부 File 행은 CASCADE로 삭제됨
+    stale_keys = file_crud.remove_variants_for_post(db, post.id)
     db.delete(post)
     db.commit()
+    return stale_keys
 # ~~ 삭제
 
 
 # 내부 헬퍼 ~~
+def _bump_post_count(db: Session, board_id: int, delta: int) -> None:
+    """
+    boards.post_count 원자적 증감 (UPDATE ... SET post_count = post_count + delta)
+    커밋은 호출한 쪽 트랜잭션에서
+    """
+    db.query(Board).filter(Board.id == board_id).update(
+        {Board.post_count: Board.post_count + delta},
+        synchronize_session=False,
+    )
+
+
+def _list_query(db: Session) -> Query:
+    """
+    목록 조회용 컬럼 프로젝션 쿼리 (작성자 username은 JOIN으로)
+    """
+    return db.query(
+        Post.id,
+        Post.board_id,
+        Post.title,
+        Post.created_at,
+        Post.author_id,
+        User.username,
+    ).join(User, User.id == Post.author_id)
+
+
+def _to_list_items(rows: Sequence) -> List[dict]:
+    """
+    프로젝션 결과 행 -> PostListOut 형태의 dict
+    """
+    return [
+        {
+            "id": row.id,
+            "board_id": row.board_id,
+            "title": row.title,
+            "author": {"id": row.author_id, "username": row.username},
+            "created_at": row.created_at,
+        }
+        for row in rows
+    ]
+
+
+def _keyset_page(query: Query, cursor: str | None, size: int) -> Tuple[List[dict], str | None]:
+    """
+    (created_at DESC, id DESC) 순으로 cursor 다음 size개를 조회.
+    다음 페이지 존재 여부 확인을 위해 size + 1개를 읽음.
+    """
+    if cursor:
+        created_at, post_id = _decode_cursor(cursor)
+        query = query.filter(
+            or_(
+                Post.created_at < created_at,
+                and_(Post.created_at == created_at, Post.id < post_id),
+            )
+        )
+
+    rows = (
+        query.order_by(desc(Post.created_at), desc(Post.id))
+        .limit(size + 1)
+        .all()
+    )
+    if len(rows) <= size:
+        return _to_list_items(rows), None
+    rows = rows[:size]
+    return _to_list_items(rows), _encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+def _encode_cursor(created_at: datetime, post_id: int) -> str:
+    """
+    (created_at, id) -> 불투명(opaque) 커서 문자열
+    """
+    raw = json.dumps([created_at.isoformat(), post_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    불투명 커서 문자열 -> (created_at, id). 형식이 잘못되면 400
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, post_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(post_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
 def _authorize(post: Post, requester_id: int) -> None:
     """
     작성자 본인 또는 관리자 권한 확인
@@ -1,15 +1,118 @@
 # app/crud/user.py
 
+from itertools import chain
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, event, update
+from sqlalchemy.orm import Session, lazyload
 
+from app.core.config import settings
 from app.db.models.user import User
+from app.schemas.user import UserPrincipal
+from app.utils.ttl_cache import TTLCache
+
+# 인증용 principal 캐시 (프로세스 로컬) - 유저 변경 커밋 시 무효화, 다른 워커는 TTL로 수렴
+principal_cache: TTLCache[int, UserPrincipal] = TTLCache(
+    maxsize=settings.AUTH_PRINCIPAL_CACHE_SIZE,
+    ttl_seconds=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+_PENDING_INVALIDATIONS = "principal_invalidations"
+_ALL_USERS = object()
 
 
 def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
     """
     특정 user_id에 해당하는 유저를 반환
     없으면 None을 반환
+    (posts/comments/files 의 selectin 로딩은 생략 - 필요하면 접근 시 lazy load)
+    """
+    return db.query(User).options(lazyload("*")).filter(User.id == user_id).first()
+
+
+def get_principal(db: Session, user_id: int) -> Optional[UserPrincipal]:
+    """
+    인증용 최소 유저 정보(id, username, is_active, is_admin)를 반환
+    캐시에 없으면 단일 행 컬럼 쿼리로 조회 (관계 로딩 없음)
+    """
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    row = (
+        db.query(User.id, User.username, User.is_active, User.is_admin)
+        .filter(User.id == user_id)
+        .first()
+    )
+    if row is None:
+        return None
+
+    principal = UserPrincipal(
+        id=row.id, username=row.username, is_active=row.is_active, is_admin=row.is_admin
+    )
+    principal_cache.set(user_id, principal)
+    return principal
+
+
+# 인증(로그인/회원 가입)용 ~~
+def get_credentials(db: Session, username: str) -> Optional[Row]:
+    """
+    로그인 검증용 (id, username, hashed_password) - 관계 로딩 없음
     """
-    return db.query(User).filter(User.id == user_id).first()
+    return (
+        db.query(User.id, User.username, User.hashed_password)
+        .filter(User.username == username)
+        .first()
+    )
+
+
+def username_or_email_taken(db: Session, username: str, email: str) -> bool:
+    return db.query(User.id).filter((User.username == username) | (User.email == email)).first() is not None
+
+
+def update_password_hash(db: Session, user_id: int, old_hash: str, new_hash: str) -> bool:
+    """
+    저장된 해시가 아직 old_hash일 때만 교체 (그 사이 비밀번호가 바뀌었으면 건드리지 않음)
+    principal과 무관한 컬럼이라 ORM bulk update 대신 Core update (principal 캐시 전체 무효화 방지)
+    """
+    result = db.execute(
+        update(User.__table__)
+        .where(User.id == user_id, User.hashed_password == old_hash)
+        .values(hashed_password=new_hash)
+    )
+    db.commit()
+    return result.rowcount == 1
+# ~~ 인증(로그인/회원 가입)용
+
+
+# principal 캐시 무효화 ~~
+# flush 시점에 변경/삭제된 User id를 모아 두었다가 커밋이 끝나면 캐시에서 제거
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context) -> None:
+    changed = [
+        obj.id for obj in chain(session.dirty, session.deleted) if isinstance(obj, User)
+    ]
+    if not changed:
+        return
+    pending = session.info.setdefault(_PENDING_INVALIDATIONS, set())
+    if pending is not _ALL_USERS:
+        pending.update(changed)
+
+
+# query(User).update()/delete() 같은 bulk 작업은 대상 id를 알 수 없으므로 전체 무효화
+@event.listens_for(Session, "after_bulk_update")
+@event.listens_for(Session, "after_bulk_delete")
+def _collect_bulk_user_changes(context) -> None:
+    if context.mapper.class_ is User:
+        context.session.info[_PENDING_INVALIDATIONS] = _ALL_USERS
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    pending = session.info.pop(_PENDING_INVALIDATIONS, ())
+    if pending is _ALL_USERS:
+        principal_cache.clear()
+        return
+    for user_id in pending:
+        principal_cache.pop(user_id)
+# ~~ principal 캐시 무효화
@@ -4,4 +4,7 @@ from .board import Board
 from .user import User
 from .post import Post
 from .comment import Comment
-from .file import File
\ No newline at end of file
+from .file import File
+from .file_blob import FileBlob
+from .upload_session import UploadSession
+from .file_variant import FileVariant
@@ -17,6 +17,10 @@ class Board(Base):
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    # 게시글 수 (비정규화) - 게시글 생성/삭제/이동 시 같은 트랜잭션에서 증감,
+    # 주기적으로 app/services/board_counters.py 에서 실제 값과 맞춤
+    post_count: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
+
     created_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False)
 
     # 관계 
@@ -5,6 +5,9 @@ SQLAlchemy ORM 모델: Comment (댓글 & 대댓글)
 
 - 게시글(Post)과 작성자(User) 모두에 FK
 - parent_id 로 자기 참조하여 '대댓글' 트리 구현
+- path(materialized path)로 게시글의 댓글 트리 전체를 한 번의 범위 쿼리로 조회
+    - 각 조상의 id를 10자리 0-패딩 문자열로 이어 붙인 값 (예: "0000000003" + "0000000017")
+    - (post_id, path) 인덱스 순서 = 트리 전위 순회(preorder) 순서
 """
 
 from __future__ import annotations
@@ -12,7 +15,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Text, func
+from sqlalchemy import ForeignKey, Index, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -25,6 +28,9 @@ if TYPE_CHECKING:
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_post_id_path", "post_id", "path"),
+    )
 
     # 컬럼 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
@@ -36,6 +42,8 @@ class Comment(Base):
         nullable=True,
     )
     depth: Mapped[int] = mapped_column(default=0, nullable=False)
+    # materialized path - 세그먼트 10자 x (depth + 1), 255자 제한 때문에 최대 depth는 24
+    path: Mapped[str] = mapped_column(String(255), default="", server_default="", nullable=False)
 
     # FK: Post / User
     post_id: Mapped[int] = mapped_column(
@@ -6,6 +6,7 @@ SQLAlchemy ORM 모델: File (첨부파일 메타데이터)
 - 실제 바이너리는 디스크나 S3 등 스토리지에 저장하고,
   DB에는 경로·키 등 메타만 기록
 - 게시글(Post) 1:N 관계
+- 중복 제거 저장 시 실제 바이너리는 FileBlob(sha256)이 소유하고 File은 blob_id로 참조
 """
 
 from __future__ import annotations
@@ -37,7 +38,8 @@ class File(Base):
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
 
     # 스토리지 상의 객체 키(또는 로컬 경로)
-    object_key: Mapped[str] = mapped_column(String(512), nullable=False, unique=True)
+    # 중복 제거(FileBlob) 사용 시 같은 내용의 File 행들이 같은 키를 공유하므로 unique 아님
+    object_key: Mapped[str] = mapped_column(String(512), nullable=False)
 
     # MIME type (예: image/png)
     content_type: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -45,6 +47,16 @@ class File(Base):
     # 바이트 단위 크기
     size: Mapped[int] = mapped_column(Integer, nullable=False)
 
+    # 내용 sha256 (hex). 업로드 스트리밍 중 계산, 이전 업로드분은 NULL
+    checksum: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+    # FK: FileBlob (중복 제거 저장 시), 이전 업로드분/중복 제거 끔이면 NULL
+    blob_id: Mapped[int | None] = mapped_column(
+        ForeignKey("file_blobs.id"),
+        nullable=True,
+        index=True,
+    )
+
     # FK: Post / User
     post_id: Mapped[int] = mapped_column(
         ForeignKey("posts.id", ondelete="CASCADE"),
@@ -0,0 +1,49 @@
+# app/db/models/file_blob.py
+
+"""
+SQLAlchemy ORM 모델: FileBlob (내용 주소 기반 저장소의 실제 바이너리)
+
+- 같은 내용(sha256)의 첨부파일은 디스크에 한 번만 저장하고,
+  File 행들이 blob_id로 같은 FileBlob을 가리킴
+- ref_count: 이 blob을 가리키는 File 행 수. 0이 되면 행과 디스크 파일을 삭제
+"""
+
+from datetime import datetime
+
+from sqlalchemy import String, Integer, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class FileBlob(Base):
+    """
+    첨부파일 blob 테이블
+    """
+    __tablename__ = "file_blobs"
+    __table_args__ = (UniqueConstraint("sha256", name="uq_file_blobs_sha256"),)
+
+    # 컬럼 
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+
+    # 내용 sha256 (hex) - 저장소 키
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    # 스토리지 상의 객체 키(또는 로컬 경로)
+    object_key: Mapped[str] = mapped_column(String(512), nullable=False)
+
+    # 바이트 단위 크기
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # 참조하는 File 행 수
+    ref_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(), nullable=False
+    )
+
+    # 메타데이터
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<FileBlob id={self.id} sha256={self.sha256[:12]} refs={self.ref_count}>"
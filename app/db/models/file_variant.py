@@ -0,0 +1,52 @@
+# app/db/models/file_variant.py
+
+"""
+SQLAlchemy ORM 모델: FileVariant (이미지 첨부파일의 파생본 - 썸네일/미리보기)
+
+- 업로드 후 백그라운드(프로세스 풀)에서 생성되어, 원본과 같은 위치에 저장
+- File 1:N, (file_id, name) 유일
+"""
+
+from datetime import datetime
+
+from sqlalchemy import String, Integer, ForeignKey, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class FileVariant(Base):
+    """
+    첨부파일 파생본 테이블
+    """
+    __tablename__ = "file_variants"
+    __table_args__ = (UniqueConstraint("file_id", "name", name="uq_file_variants_file_id_name"),)
+
+    # 컬럼 
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+
+    # FK: File
+    file_id: Mapped[int] = mapped_column(
+        ForeignKey("files.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # 파생본 이름 (thumb / preview)
+    name: Mapped[str] = mapped_column(String(20), nullable=False)
+
+    # 스토리지 상의 객체 키(또는 로컬 경로)
+    object_key: Mapped[str] = mapped_column(String(512), nullable=False)
+
+    content_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    width: Mapped[int] = mapped_column(Integer, nullable=False)
+    height: Mapped[int] = mapped_column(Integer, nullable=False)
+    checksum: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(), nullable=False
+    )
+
+    # 메타데이터
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<FileVariant file_id={self.file_id} name={self.name} {self.width}x{self.height}>"
@@ -12,7 +12,7 @@ from typing import TYPE_CHECKING
 
 from datetime import datetime
 
-from sqlalchemy import String, Text, ForeignKey, func
+from sqlalchemy import String, Text, ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base  # declarative_base() 로 생성해둔 공통 Base
@@ -30,6 +30,11 @@ class Post(Base):
     게시글 테이블
     """
     __tablename__ = "posts"
+    __table_args__ = (
+        # 커서(keyset) 페이지네이션용: 게시판별 / 전체 최신순 목록
+        Index("ix_posts_board_id_created_at_id", "board_id", "created_at", "id"),
+        Index("ix_posts_created_at_id", "created_at", "id"),
+    )
 
     # 컬럼 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
@@ -0,0 +1,56 @@
+# app/db/models/upload_session.py
+
+"""
+SQLAlchemy ORM 모델: UploadSession (이어 올리기 가능한 청크 업로드 세션)
+
+- 생성 → 청크 PUT(offset) → 완료(finalize) 순서로 진행
+- 받은 청크는 스테이징 파일(uploads/staging/<id>.part)에 이어 쓰고, received에 다음 offset 기록
+- expires_at이 지난 세션은 주기 작업이 스테이징 파일과 함께 삭제
+"""
+
+from datetime import datetime
+
+from sqlalchemy import String, Integer, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class UploadSession(Base):
+    """
+    청크 업로드 세션 테이블
+    """
+    __tablename__ = "upload_sessions"
+
+    # 컬럼 
+    # 추측하기 어려운 세션 id (uuid4 hex)
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+
+    # 원본 파일명 / MIME type
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    content_type: Mapped[str] = mapped_column(String(100), nullable=False)
+
+    # 전체 크기 / 지금까지 받은 바이트 수(= 다음 청크 offset)
+    total_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    received: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+
+    # FK: Post / User
+    post_id: Mapped[int] = mapped_column(
+        ForeignKey("posts.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    uploader_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        server_default=func.now(), nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(nullable=False, index=True)
+
+    # 메타데이터
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<UploadSession id={self.id} {self.received}/{self.total_size}>"
@@ -0,0 +1,152 @@
+# app/db/pool_metrics.py
+
+"""
+DB 커넥션 풀 메트릭
+
+- 풀 이벤트(connect / checkout / checkin / invalidate)로 카운터 집계
+- 체크아웃 소요 시간(빈 커넥션 대기 + 신규 연결 + pre-ping)은 풀 이벤트에 "시작" 시점이 없어서
+  Pool.connect()를 감싼 풀 클래스(TimedQueuePool / TimedAsyncAdaptedQueuePool)로 측정
+- 풀은 engine.dispose() 시 재생성되므로, 메트릭 객체는 풀 logging_name 으로 찾음
+  (create_engine(..., pool_logging_name=<이름>))
+
+워커(프로세스)별 값이므로 워커당 풀 크기 산정에 그대로 쓰면 됨.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+_RECENT_WAITS = 1024  # 백분위 계산용 최근 체크아웃 소요 시간 샘플 수
+
+
+class PoolMetrics:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.engine: Engine | None = None
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.checkout_timeouts = 0
+        self.wait_count = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self._recent_waits: deque[float] = deque(maxlen=_RECENT_WAITS)
+
+    def attach(self, engine: Engine) -> None:
+        """
+        엔진(비동기 엔진이면 engine.sync_engine)의 풀 이벤트 구독
+        """
+        self.engine = engine
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def record_wait(self, elapsed_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total_ms += elapsed_ms
+            self.wait_max_ms = max(self.wait_max_ms, elapsed_ms)
+            self._recent_waits.append(elapsed_ms)
+            if timed_out:
+                self.checkout_timeouts += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        pool = self.engine.pool if self.engine is not None else None
+        with self._lock:
+            recent = sorted(self._recent_waits)
+            return {
+                "pool": {
+                    "size": pool.size() if pool is not None else 0,
+                    "checked_out": pool.checkedout() if pool is not None else 0,
+                    "idle": pool.checkedin() if pool is not None else 0,
+                    "overflow": max(pool.overflow(), 0) if pool is not None else 0,
+                    "max_overflow": getattr(pool, "_max_overflow", 0),
+                },
+                "counters": {
+                    "connects": self.connects,
+                    "checkouts": self.checkouts,
+                    "checkins": self.checkins,
+                    "invalidations": self.invalidations,
+                    "checkout_timeouts": self.checkout_timeouts,
+                },
+                "checkout_wait_ms": {
+                    "avg": round(self.wait_total_ms / self.wait_count, 3) if self.wait_count else 0.0,
+                    "max": round(self.wait_max_ms, 3),
+                    "p50": _percentile(recent, 0.50),
+                    "p95": _percentile(recent, 0.95),
+                    "p99": _percentile(recent, 0.99),
+                    "samples": len(recent),
+                },
+            }
+
+    # 풀 이벤트 핸들러 ~~
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+    # ~~ 풀 이벤트 핸들러
+
+
+# 풀 이름(logging_name) -> 메트릭
+pool_metrics: dict[str, PoolMetrics] = {}
+
+
+def register(name: str, engine: Engine) -> PoolMetrics:
+    metrics = PoolMetrics(name)
+    metrics.attach(engine)
+    pool_metrics[name] = metrics
+    return metrics
+
+
+class _TimedCheckoutMixin:
+    """
+    Pool.connect() 소요 시간을 pool_metrics[logging_name]에 기록
+    """
+
+    def connect(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            metrics = pool_metrics.get(self._orig_logging_name)  # recreate() 후에도 유지되는 이름
+            if metrics is not None:
+                metrics.record_wait((time.perf_counter() - started) * 1000, timed_out)
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return round(sorted_values[index], 3)
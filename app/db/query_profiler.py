@@ -0,0 +1,223 @@
+# app/db/query_profiler.py
+
+"""
+요청 단위 SQL 쿼리 프로파일러 (디버그/프로파일링용, SQL_PROFILER_ENABLED)
+
+- 엔진의 before_cursor_execute / after_cursor_execute 이벤트로 쿼리 수와 DB 시간을 잼
+- 현재 요청의 집계(QueryProfile)는 contextvar로 전달
+  - run_in_threadpool(동기 Session)과 run_sync(AsyncSession)는 contextvar를 그대로 이어받으므로
+    같은 QueryProfile 객체에 쌓임
+  - 요청 밖(백그라운드 루프 등)의 쿼리는 세지 않음
+- N+1 감지: 한 요청에서 같은 SQL 문(파라미터 제외)이 SQL_PROFILER_REPEAT_THRESHOLD 번 이상 실행되면 표시
+  (예: 목록을 돌면서 post.files / post.author 를 lazy load)
+- 결과
+  - 응답 헤더: Server-Timing: db;dur=<ms>;desc="<n> queries" (+ N+1이면 db-repeat;desc="<n>x same statement")
+  - 관리자 리포트: 라우트 템플릿별 누적값 (GET /api/v1/admin/metrics/sql)
+
+이벤트 훅 자체가 쿼리마다 비용이 드므로 운영에서는 끄고, 원인 추적할 때만 켤 것.
+워커(프로세스)별 값임.
+"""
+
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+_MAX_STATEMENTS_PER_ENDPOINT = 20  # 라우트별로 보관하는 반복 SQL 문 수
+_STATEMENT_PREVIEW = 300           # 리포트/로그에 남기는 SQL 문 길이
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class QueryProfile:
+    """
+    요청 하나의 쿼리 집계
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        # SQL 문 -> 실행 횟수
+        self.statements: dict[str, int] = {}
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """
+        threshold 번 이상 실행된 SQL 문 (N+1 의심)
+        """
+        return {sql: count for sql, count in self.statements.items() if count >= threshold}
+
+
+_current: ContextVar[Optional[QueryProfile]] = ContextVar("sql_query_profile", default=None)
+
+
+# 엔진 이벤트 ~~
+def attach(engine: Engine) -> None:
+    """
+    엔진(비동기 엔진이면 engine.sync_engine)의 커서 실행 이벤트 구독
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def detach(engine: Engine) -> None:
+    event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+    event.remove(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("query_profiler_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    profile = _current.get()
+    started = conn.info.get("query_profiler_started")
+    if profile is None or not started:
+        return
+    profile.record(statement, (time.perf_counter() - started.pop()) * 1000)
+# ~~ 엔진 이벤트
+
+
+class EndpointProfile:
+    """
+    라우트 하나의 누적 집계
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.queries_total = 0
+        self.queries_max = 0
+        self.db_ms_total = 0.0
+        self.db_ms_max = 0.0
+        self.n_plus_one_requests = 0
+        # SQL 문 -> 한 요청 안에서의 최대 반복 횟수
+        self.repeated: dict[str, int] = {}
+
+    def add(self, profile: QueryProfile, repeated: dict[str, int]) -> None:
+        self.requests += 1
+        self.queries_total += profile.count
+        self.queries_max = max(self.queries_max, profile.count)
+        self.db_ms_total += profile.total_ms
+        self.db_ms_max = max(self.db_ms_max, profile.total_ms)
+        if not repeated:
+            return
+        self.n_plus_one_requests += 1
+        for statement, count in repeated.items():
+            self.repeated[statement] = max(self.repeated.get(statement, 0), count)
+        if len(self.repeated) > _MAX_STATEMENTS_PER_ENDPOINT:
+            worst = sorted(self.repeated.items(), key=lambda item: item[1], reverse=True)
+            self.repeated = dict(worst[:_MAX_STATEMENTS_PER_ENDPOINT])
+
+    def to_dict(self, method: str, route: str) -> dict[str, Any]:
+        return {
+            "method": method,
+            "route": route,
+            "requests": self.requests,
+            "queries_avg": round(self.queries_total / self.requests, 2),
+            "queries_max": self.queries_max,
+            "db_ms_avg": round(self.db_ms_total / self.requests, 3),
+            "db_ms_max": round(self.db_ms_max, 3),
+            "n_plus_one_requests": self.n_plus_one_requests,
+            "repeated_statements": [
+                {"statement": statement[:_STATEMENT_PREVIEW], "max_repeats": count}
+                for statement, count in sorted(self.repeated.items(), key=lambda item: item[1], reverse=True)
+            ],
+        }
+
+
+class QueryReport:
+    """
+    워커(프로세스) 하나의 라우트별 쿼리 리포트
+    (미들웨어에서 이벤트 루프 스레드로만 갱신하므로 락 없음)
+    """
+
+    def __init__(self) -> None:
+        # (method, route) -> 누적 집계
+        self.endpoints: dict[tuple[str, str], EndpointProfile] = {}
+
+    def add(self, method: str, route: str, profile: QueryProfile, repeated: dict[str, int]) -> None:
+        endpoint = self.endpoints.get((method, route))
+        if endpoint is None:
+            endpoint = self.endpoints[(method, route)] = EndpointProfile()
+        endpoint.add(profile, repeated)
+
+    def worst(self, sort: str = "queries", limit: int = 20) -> list[dict[str, Any]]:
+        """
+        sort: queries(요청당 평균 쿼리 수) / db_ms(요청당 평균 DB 시간) / n_plus_one(N+1 감지 요청 수)
+        """
+        rows = [endpoint.to_dict(*key) for key, endpoint in self.endpoints.items()]
+        sort_key = {
+            "queries": lambda row: (row["queries_avg"], row["db_ms_avg"]),
+            "db_ms": lambda row: (row["db_ms_avg"], row["queries_avg"]),
+            "n_plus_one": lambda row: (row["n_plus_one_requests"], row["queries_avg"]),
+        }[sort]
+        rows.sort(key=sort_key, reverse=True)
+        return rows[:limit]
+
+    def reset(self) -> None:
+        self.endpoints.clear()
+
+
+class QueryProfilerMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        repeat_threshold: int = 5,
+        report: Optional[QueryReport] = None,
+    ) -> None:
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+        self.report = report or query_report
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = _current.set(profile)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # 응답 헤더를 보내는 시점까지의 쿼리 (스트리밍 본문 중의 쿼리는 리포트에만 반영)
+                headers = MutableHeaders(scope=message)
+                for value in self._server_timing(profile):
+                    headers.append("Server-Timing", value)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            repeated = profile.repeated(self.repeat_threshold)
+            if repeated:
+                statement, count = max(repeated.items(), key=lambda item: item[1])
+                logger.warning(
+                    "possible N+1 on %s %s: %d queries, %dx %s",
+                    scope["method"], route, profile.count, count, statement[:_STATEMENT_PREVIEW],
+                )
+            self.report.add(scope["method"], route, profile, repeated)
+
+    def _server_timing(self, profile: QueryProfile) -> list[str]:
+        values = [f'db;dur={profile.total_ms:.3f};desc="{profile.count} queries"']
+        repeated = profile.repeated(self.repeat_threshold)
+        if repeated:
+            values.append(f'db-repeat;desc="{max(repeated.values())}x same statement"')
+        return values
+
+
+# 워커(프로세스)당 하나
+query_report = QueryReport()
@@ -1,9 +1,84 @@
 # app/db/session.py
 
+from typing import Any, Callable, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.db import pool_metrics, query_profiler
+from app.db.pool_metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool
+
+T = TypeVar("T")
+
+
+def _pool_options(name: str) -> dict[str, Any]:
+    """
+    AppSettings의 커넥션 풀 설정 (워커 프로세스당 값)
+    pre-ping을 끄면 체크아웃마다의 왕복이 없어지는 대신, 끊긴 커넥션은 pool_recycle과 재시도에 의존
+    """
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_logging_name": name,
+    }
 
-engine = create_engine(settings.DB_URL, pool_pre_ping=True)
+
+engine = create_engine(settings.DB_URL, poolclass=TimedQueuePool, **_pool_options("sync"))
+pool_metrics.register("sync", engine)
+if settings.SQL_PROFILER_ENABLED:
+    query_profiler.attach(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+# 비동기 엔진 ~~
+# 동기 드라이버 URL을 같은 DB의 비동기 드라이버 URL로 변환 (DB_ASYNC_URL 미지정 시)
+_ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    drivername = _ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+# DB_ASYNC=False 일 때는 비동기 드라이버(aiomysql 등)를 import하지 않도록 생성하지 않음
+async_engine = (
+    create_async_engine(
+        settings.DB_ASYNC_URL or to_async_url(settings.DB_URL),
+        poolclass=TimedAsyncAdaptedQueuePool,
+        **_pool_options("async"),
+    )
+    if settings.DB_ASYNC
+    else None
+)
+if async_engine is not None:
+    pool_metrics.register("async", async_engine.sync_engine)
+    if settings.SQL_PROFILER_ENABLED:
+        query_profiler.attach(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False)
+# ~~ 비동기 엔진
+
+
+async def run_db(db: Session | AsyncSession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    동기 CRUD 함수 fn(session, *args, **kwargs)를 이벤트 루프를 막지 않고 실행
+
+    - AsyncSession: run_sync로 실행 - greenlet 위에서 돌면서 I/O는 비동기 드라이버로 처리 (threadpool 안 씀)
+    - Session: 기존처럼 threadpool에서 실행 (DB_ASYNC=False 인 동기 경로)
+
+    fn 밖에서 lazy loading이 일어나면 비동기 경로에서 실패하므로,
+    ORM 객체는 fn 안에서 응답 스키마로 변환해서 반환할 것.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
@@ -16,15 +16,27 @@ Note:
 - The lifespan handler is the preferred way to manage application startup and shutdown in FastAPI 0.110+.
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.responses import RedirectResponse
+from starlette.responses import PlainTextResponse, RedirectResponse
 
 from app.api.v1.router import api_router
+from app.core.body_limit import BodySizeLimitMiddleware
 from app.core.config import settings 
+from app.core import metrics
 from app.db.base import Base
+from app.db.query_profiler import QueryProfilerMiddleware
 from app.db.session import engine
+from app.services import image_variants
+from app.services.backplane import backplane
+from app.services.board_counters import run_reconcile_loop
+from app.services.chat_history_migration import run_startup_migration
+from app.services.password_hasher import password_hasher
+from app.services.storage import run_blob_gc_loop, run_upload_session_gc_loop
+from app.services.webrtc import call_manager
 
 
 # Lifespan 핸들러
@@ -49,12 +61,51 @@ async def lifespan(app: FastAPI):
     # ↑ 위는 DDL을 실행함!!!!!!! 한 번만 실행하고 다음에는 반드시 주석 처리!!! ↑ #
     ##################################################################
 
+    # 백그라운드 주기 작업
+    background_tasks: list[asyncio.Task] = []
+    if settings.BOARD_COUNT_RECONCILE_SECONDS > 0:
+        background_tasks.append(
+            asyncio.create_task(run_reconcile_loop(settings.BOARD_COUNT_RECONCILE_SECONDS))
+        )
+    if settings.FILE_DEDUP_ENABLED and settings.FILE_BLOB_GC_SECONDS > 0:
+        background_tasks.append(
+            asyncio.create_task(run_blob_gc_loop(settings.FILE_BLOB_GC_SECONDS))
+        )
+    if settings.UPLOAD_SESSION_GC_SECONDS > 0:
+        background_tasks.append(
+            asyncio.create_task(run_upload_session_gc_loop(settings.UPLOAD_SESSION_GC_SECONDS))
+        )
+
+    if settings.CHAT_HISTORY_MIGRATE_ON_STARTUP:
+        background_tasks.append(asyncio.create_task(run_startup_migration()))  # 한 번만 실행
+
+    if settings.WEBRTC_HEARTBEAT_SECONDS > 0:
+        background_tasks.append(
+            asyncio.create_task(call_manager.run_heartbeat_loop(settings.WEBRTC_HEARTBEAT_SECONDS))
+        )
+    if settings.METRICS_ENABLED and settings.METRICS_MULTIPROC_DIR:
+        background_tasks.append(
+            asyncio.create_task(
+                metrics.run_flush_loop(settings.METRICS_MULTIPROC_DIR, settings.METRICS_FLUSH_SECONDS)
+            )
+        )
+    if settings.IMAGE_VARIANTS_ENABLED:
+        await image_variants.pipeline.start()
+
     print("🚀 Hello! Startup completed.")
 
     yield
     # ───── shutdown ────
     # 예: 커넥션 풀 정리, 임시 파일 제거
     # await cache.close()
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await image_variants.pipeline.stop()
+    await backplane.close()
+    password_hasher.shutdown()
+    if settings.METRICS_ENABLED and settings.METRICS_MULTIPROC_DIR:
+        metrics.write_snapshot(settings.METRICS_MULTIPROC_DIR)  # 종료된 워커의 카운터도 계속 합산되도록
     print("😴 Bye! Now shutting down...")
 
 main_description = """
@@ -90,6 +141,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청 바디 크기 제한: 업로드 한도 + multipart 헤더/경계 여유분(64KB)
+# 한도를 넘는 업로드는 임시 파일로 다 받기 전에 413으로 끊음
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.MAX_UPLOAD_MB * 1024 * 1024 + 64 * 1024,
+)
+
+# 요청별 SQL 쿼리 프로파일링 (디버그용 - Server-Timing 헤더 + /api/v1/admin/metrics/sql)
+if settings.SQL_PROFILER_ENABLED:
+    app.add_middleware(
+        QueryProfilerMiddleware,
+        repeat_threshold=settings.SQL_PROFILER_REPEAT_THRESHOLD,
+    )
+
+# 요청 메트릭 (가장 바깥 미들웨어 - 413 등 미들웨어 응답과 전체 처리 시간까지 포함)
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
 # API v1 라우터 등록
 app.include_router(api_router, prefix="/api/v1")
 
@@ -98,6 +167,18 @@ app.include_router(api_router, prefix="/api/v1")
 async def root():
     return RedirectResponse(url="/docs")
 
+# Prometheus 수집용 (METRICS_MULTIPROC_DIR가 있으면 전체 워커 합산)
+@app.get("/metrics", include_in_schema=False)
+async def read_metrics():
+    if settings.METRICS_MULTIPROC_DIR:
+        await run_in_threadpool(metrics.write_snapshot, settings.METRICS_MULTIPROC_DIR)
+        snapshots = await run_in_threadpool(metrics.read_snapshots, settings.METRICS_MULTIPROC_DIR)
+    else:
+        snapshots = [metrics.request_metrics.snapshot()]
+    return PlainTextResponse(
+        metrics.render_prometheus(snapshots), media_type="text/plain; version=0.0.4"
+    )
+
 
 # 아래는 deprecated.
 
@@ -5,6 +5,7 @@
 - CommentUpdate : 댓글/대댓글 수정 요청 DTO. content 필드는 선택적(Optional)이며, 부분 수정(Patch) 요청에 사용
 - CommentOut    : 댓글/대댓글 응답 DTO (작성자·계층 포함).  
     댓글의 id, 내용(content), 계층(depth), 부모 댓글 id(parent_id), 작성자(author), 생성일시(created_at), 그리고 대댓글 리스트(replies)를 포함합니다. replies 필드는 자기 자신(CommentOut)의 리스트로, 대댓글 트리 구조를 표현합니다.
+- CommentTreePage : 게시글 댓글 트리 페이지 응답 DTO. items는 조립된 트리, next_cursor가 None이면 마지막 페이지
 
 기타:
 - UserBrief: 댓글 작성자 정보를 요약해서 담는 타입으로, 게시글 스키마에서 import하여 재사용.
@@ -51,6 +52,12 @@ class CommentOut(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class CommentTreePage(BaseModel):
+    """게시글 댓글 트리 페이지 응답"""
+    items: List[CommentOut]
+    next_cursor: Optional[str] = None
 # ~~ 응답(Response) 
 
 
@@ -2,10 +2,14 @@
 """
 파일(File) 관련 Pydantic 스키마 정의
 - FileOut : 파일 조회 응답 DTO
+- UploadSessionCreate : 청크(이어 올리기) 업로드 세션 생성 요청 DTO
+- UploadSessionOut    : 청크 업로드 세션 상태 응답 DTO
 """
 
 from datetime import datetime
-from pydantic import BaseModel
+from typing import Optional
+
+from pydantic import BaseModel, Field
 
 class FileOut(BaseModel):
     id: int
@@ -17,3 +21,17 @@ class FileOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class UploadSessionCreate(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    content_type: Optional[str] = Field(None, max_length=100)
+    size: int = Field(..., gt=0, description="전체 파일 크기 (바이트)")
+
+
+class UploadSessionOut(BaseModel):
+    id: str
+    filename: str
+    size: int
+    offset: int = Field(..., description="지금까지 받은 바이트 수 = 다음 청크의 offset")
+    expires_at: datetime
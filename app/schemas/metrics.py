@@ -0,0 +1,65 @@
+# app/schemas/metrics.py
+"""
+운영 메트릭 관련 Pydantic 스키마 정의
+- PoolMetricsOut : DB 커넥션 풀 상태/카운터/체크아웃 대기 시간 응답 DTO
+- SqlProfileReportOut : 라우트별 SQL 쿼리 수/DB 시간/N+1 리포트 응답 DTO
+"""
+
+from pydantic import BaseModel
+
+
+class PoolStatus(BaseModel):
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    max_overflow: int
+
+
+class PoolCounters(BaseModel):
+    connects: int
+    checkouts: int
+    checkins: int
+    invalidations: int
+    checkout_timeouts: int
+
+
+class CheckoutWait(BaseModel):
+    """체크아웃 소요 시간 (단위: ms, 백분위는 최근 샘플 기준)"""
+    avg: float
+    max: float
+    p50: float
+    p95: float
+    p99: float
+    samples: int
+
+
+class PoolMetricsOut(BaseModel):
+    pool: PoolStatus
+    counters: PoolCounters
+    checkout_wait_ms: CheckoutWait
+
+
+class RepeatedStatement(BaseModel):
+    """한 요청 안에서 반복 실행된 SQL 문 (N+1 의심)"""
+    statement: str
+    max_repeats: int
+
+
+class SqlEndpointProfile(BaseModel):
+    """라우트 템플릿별 누적값 (DB 시간 단위: ms)"""
+    method: str
+    route: str
+    requests: int
+    queries_avg: float
+    queries_max: int
+    db_ms_avg: float
+    db_ms_max: float
+    n_plus_one_requests: int
+    repeated_statements: list[RepeatedStatement]
+
+
+class SqlProfileReportOut(BaseModel):
+    enabled: bool
+    repeat_threshold: int
+    endpoints: list[SqlEndpointProfile]
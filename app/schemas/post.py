@@ -5,6 +5,7 @@
 - PostUpdate   : 게시글 수정 요청 DTO (부분 수정 허용)
 - PostOut      : 게시글 단건 조회 응답 DTO
 - PostListOut  : 게시글 목록 조회 응답 DTO (요약형)
+- PostCursorPage : 게시글 목록 커서(keyset) 페이지 응답 DTO
 """
 
 from __future__ import annotations
@@ -81,3 +82,9 @@ class PostListOut(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class PostCursorPage(BaseModel):
+    """게시글 목록 커서 페이지 응답 (next_cursor가 None이면 마지막 페이지)"""
+    items: List[PostListOut]
+    next_cursor: Optional[str] = None
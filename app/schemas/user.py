@@ -2,6 +2,7 @@
 """
 유저(User) 관련 Pydantic 스키마 정의
 - UserOut : 유저 정보 조회 응답 DTO
+- UserPrincipal : 인증된 요청의 현재 유저 (인증/권한 체크에 필요한 최소 필드만)
 """
 
 from pydantic import BaseModel, EmailStr
@@ -18,3 +19,17 @@ class UserOut(BaseModel):
 
     class Config:
         orm_mode = True  # SQLAlchemy 객체에서 바로 변환 가능
+
+
+class UserPrincipal(BaseModel):
+    """
+    get_current_user가 반환하는 인증 주체.
+    프로세스 캐시에 공유되므로 불변(frozen)
+    """
+    id: int
+    username: str
+    is_active: bool
+    is_admin: bool
+
+    class Config:
+        frozen = True
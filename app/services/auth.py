@@ -1,52 +1,47 @@
 # app/services/auth.py
 
 from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import cast
 
 from app.schemas.auth import SignUpRequest, LoginRequest, SignUpResponse, TokenPair
 from app.db.models.user import User 
-from app.core.security import verify_password, get_password_hash, create_access_token, verify_refresh_token, create_refresh_token
+from app.core.security import create_access_token, verify_refresh_token, create_refresh_token
+from app.crud import user as user_crud
+from app.db.session import run_db
+from app.services.password_hasher import password_hasher
 from jose import jwt
 
-def register_user(db: Session, payload: SignUpRequest) -> SignUpResponse:
+# bcrypt는 전용 실행기(password_hasher)에서 돌리고, 그동안에는 DB 커넥션을 잡고 있지 않도록
+# 조회 직후 rollback()으로 커넥션을 풀에 돌려줌 (로그인 폭주 때 커넥션 풀까지 고갈되지 않게)
+
+async def register_user(db: Session | AsyncSession, payload: SignUpRequest) -> SignUpResponse:
     """
     회원가입 서비스: 중복 ID/이메일 체크, 해시 비밀번호 저장
     """
-    # username 또는 email 중복 체크
-    if db.query(User).filter((User.username == payload.username) | (User.email == payload.email)).first():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username or email already registered."
-        )
-    user = User(
-        username=payload.username,
-        lastname=payload.lastname,
-        firstname=payload.firstname,
-        email=payload.email,
-        hashed_password=get_password_hash(payload.password)
-    )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    # username 또는 email 중복 체크 (중복이면 해싱 전에 바로 거절)
+    if await run_db(db, _is_taken, payload.username, payload.email):
+        raise _already_registered()
+    hashed_password = await password_hasher.hash(payload.password)
+    return await run_db(db, _create_user, payload, hashed_password)
 
-    return SignUpResponse(
-        userId=cast(int, user.id),   # type: ignore[arg-type]  ← cast로 int타입임을 명시
-        username=str(user.username)
-    )
-
-def authenticate_user(db: Session, payload: LoginRequest) -> TokenPair:
+async def authenticate_user(db: Session | AsyncSession, payload: LoginRequest) -> TokenPair:
     """
     로그인 시, access + refresh 쌍으로 발급
+    BCRYPT_ROUNDS가 바뀌어 저장된 해시의 cost가 다르면 새 cost로 재해싱해서 저장
     """
-    user = db.query(User).filter(User.username == payload.username).first()
-    if not user or not verify_password(payload.password, str(user.hashed_password)):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username or password."
-        )
+    credentials = await run_db(db, _load_credentials, payload.username)
+    if credentials is None:
+        raise _invalid_credentials()
+    valid, new_hash = await password_hasher.verify_and_update(payload.password, str(credentials.hashed_password))
+    if not valid:
+        raise _invalid_credentials()
+    if new_hash is not None:
+        await run_db(db, user_crud.update_password_hash, credentials.id, credentials.hashed_password, new_hash)
 
-    new_claims = {"sub": str(user.id), "username": user.username}
+    new_claims = {"sub": str(credentials.id), "username": credentials.username}
 
     return TokenPair(
         access_token=create_access_token(new_claims),
@@ -74,3 +69,50 @@ def refresh_access_token(refresh_token: str) -> TokenPair:
         access_token=create_access_token(new_claims),
         refresh_token=create_refresh_token(new_claims),
     )
+
+
+# 내부 헬퍼 (run_db로 실행) ~~
+def _is_taken(db: Session, username: str, email: str) -> bool:
+    taken = user_crud.username_or_email_taken(db, username, email)
+    db.rollback()  # 해싱하는 동안 커넥션 반납
+    return taken
+
+def _load_credentials(db: Session, username: str):
+    credentials = user_crud.get_credentials(db, username)
+    db.rollback()  # 검증하는 동안 커넥션 반납
+    return credentials
+
+def _create_user(db: Session, payload: SignUpRequest, hashed_password: str) -> SignUpResponse:
+    user = User(
+        username=payload.username,
+        lastname=payload.lastname,
+        firstname=payload.firstname,
+        email=payload.email,
+        hashed_password=hashed_password,
+    )
+    db.add(user)
+    try:
+        db.commit()
+    except IntegrityError:
+        # 중복 체크 뒤 해싱하는 사이에 같은 username/email로 가입됨
+        db.rollback()
+        raise _already_registered()
+    db.refresh(user)
+
+    return SignUpResponse(
+        userId=cast(int, user.id),   # type: ignore[arg-type]  ← cast로 int타입임을 명시
+        username=str(user.username)
+    )
+
+def _already_registered() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Username or email already registered."
+    )
+
+def _invalid_credentials() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Incorrect username or password."
+    )
+# ~~ 내부 헬퍼
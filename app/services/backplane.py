@@ -0,0 +1,155 @@
+# app/services/backplane.py
+
+"""
+Redis pub/sub 백플레인 - 여러 워커/노드 사이 실시간 메시지 전달
+
+- publish(channel, payload): Redis에 한 번만 PUBLISH. 각 워커의 수신 태스크가 받아서 자기 소켓에만 전달
+- 워커당 PubSub 연결 하나 + 수신 태스크 하나로 모든 채널(방)을 다중화
+  로컬 접속자가 있는 채널만 구독 (채널별 핸들러 목록이 비면 구독 해제)
+- Redis 장애 시 fail-open: 발행은 같은 워커의 로컬 핸들러에 직접 전달(단일 워커처럼 동작)하고,
+  수신 태스크는 잠시 뒤 재연결해서 구독 중이던 채널을 다시 구독
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+from redis.exceptions import RedisError
+
+from app.core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str, str], Awaitable[None]]  # (channel, payload)
+
+_POLL_SECONDS = 1.0  # 수신 대기 타임아웃 (연결 상태 확인 주기)
+
+
+class Backplane:
+    def __init__(self, redis: Redis, *, retry_seconds: float = 5.0) -> None:
+        self._redis = redis
+        self._retry_seconds = retry_seconds
+        self._handlers: dict[str, list[Handler]] = {}
+        self._pubsub: Optional[PubSub] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._retry_at = 0.0
+
+    @property
+    def channels(self) -> set[str]:
+        return set(self._handlers)
+
+    # 구독 ~~
+    async def subscribe(self, channel: str, handler: Handler) -> None:
+        handlers = self._handlers.setdefault(channel, [])
+        if handler in handlers:
+            return
+        handlers.append(handler)
+        self._ensure_listener()
+        if len(handlers) == 1 and self._pubsub is not None:
+            try:
+                await self._pubsub.subscribe(channel)
+            except RedisError as exc:
+                await self._drop_connection(exc)  # 재연결 시 전체 채널을 다시 구독
+
+    async def unsubscribe(self, channel: str, handler: Handler) -> None:
+        handlers = self._handlers.get(channel)
+        if not handlers or handler not in handlers:
+            return
+        handlers.remove(handler)
+        if handlers:
+            return
+        del self._handlers[channel]
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.unsubscribe(channel)
+            except RedisError as exc:
+                await self._drop_connection(exc)
+    # ~~ 구독
+
+    # 발행 ~~
+    async def publish(self, channel: str, payload: str) -> None:
+        if self._redis_available():
+            try:
+                await self._redis.publish(channel, payload)
+            except RedisError as exc:
+                self._mark_redis_down(exc)
+            else:
+                if self._pubsub is not None or channel not in self._handlers:
+                    return
+                # 발행은 됐지만 이 워커의 구독이 끊겨 있음 → 로컬 소켓에는 직접 전달
+        await self._dispatch(channel, payload)
+    # ~~ 발행
+
+    async def close(self) -> None:
+        """
+        lifespan 종료 시 호출: 수신 태스크 정리
+        """
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        self._wakeup = None
+        await self._drop_connection()
+
+    # 수신 태스크 ~~
+    def _ensure_listener(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._wakeup = asyncio.Event()
+            self._listener = asyncio.create_task(self._listen())
+        self._wakeup.set()
+
+    async def _listen(self) -> None:
+        while True:
+            if not self._handlers:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            try:
+                if self._pubsub is None:
+                    self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                    await self._pubsub.subscribe(*self._handlers)
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=_POLL_SECONDS
+                )
+            except (RedisError, OSError) as exc:
+                await self._drop_connection(exc)
+                await asyncio.sleep(self._retry_seconds)
+                continue
+            if message is not None and message["type"] == "message":
+                await self._dispatch(message["channel"], message["data"])
+
+    async def _dispatch(self, channel: str, payload: str) -> None:
+        for handler in list(self._handlers.get(channel, ())):
+            try:
+                await handler(channel, payload)
+            except Exception:
+                logger.exception("backplane handler failed for %s", channel)
+    # ~~ 수신 태스크
+
+    # 내부 헬퍼 ~~
+    async def _drop_connection(self, exc: Exception | None = None) -> None:
+        if exc is not None:
+            self._mark_redis_down(exc)
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            try:
+                await pubsub.aclose()
+            except (RedisError, OSError):
+                pass
+
+    def _redis_available(self) -> bool:
+        return time.monotonic() >= self._retry_at
+
+    def _mark_redis_down(self, exc: Exception) -> None:
+        if self._redis_available():
+            logger.warning("backplane: Redis unavailable for %.0fs, delivering locally: %s", self._retry_seconds, exc)
+        self._retry_at = time.monotonic() + self._retry_seconds
+    # ~~ 내부 헬퍼
+
+
+# 워커(프로세스)당 하나 - 채팅/시그널링이 같은 PubSub 연결을 공유
+backplane = Backplane(redis_client)
@@ -0,0 +1,59 @@
+# app/services/board_counters.py
+
+"""
+boards.post_count(비정규화 게시글 수) 정합성 보정 작업
+
+평소에는 게시글 생성/삭제/이동 시 CRUD 레이어에서 같은 트랜잭션으로 증감하지만,
+DB 레벨 CASCADE(유저/게시판 삭제)나 수동 데이터 수정처럼 ORM을 거치지 않는 변경은
+카운터에 반영되지 않으므로, 주기적으로 실제 COUNT와 비교해 어긋난 행만 고침.
+"""
+
+import asyncio
+import logging
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.models.board import Board
+from app.db.models.post import Post
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def reconcile_post_counts(db: Session) -> int:
+    """
+    post_count가 실제 게시글 수와 다른 게시판을 보정하고, 보정된 행 수를 반환
+    """
+    actual = (
+        select(func.count(Post.id))
+        .where(Post.board_id == Board.id)
+        .scalar_subquery()
+    )
+    fixed = (
+        db.query(Board)
+        .filter(Board.post_count != actual)
+        .update({Board.post_count: actual}, synchronize_session=False)
+    )
+    db.commit()
+    return fixed
+
+
+async def run_reconcile_loop(interval_seconds: int) -> None:
+    """
+    lifespan에서 백그라운드 태스크로 실행 - interval_seconds 간격으로 보정
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            fixed = await run_in_threadpool(_reconcile_once)
+            if fixed:
+                logger.info("board post_count reconciled: %d board(s) fixed", fixed)
+        except Exception:
+            logger.exception("board post_count reconciliation failed")
+
+
+def _reconcile_once() -> int:
+    with SessionLocal() as db:
+        return reconcile_post_counts(db)
@@ -0,0 +1,95 @@
+# app/services/chat_history_migration.py
+
+"""
+채팅 기록 이전 도구 (방별 Redis List room:{id}:messages → Redis Stream room:{id}:stream)
+
+기록 저장소가 List에서 Stream으로 바뀌면서 기존 List는 더 이상 읽히지 않으므로, 방마다:
+1) List의 최근 CHAT_HISTORY_MAX_MESSAGES개를 0-1, 0-2, ... id로 Stream 앞쪽에 넣고
+   (시각 정보가 없으므로 배포 후 쌓인 실제 메시지 id보다 항상 앞에 오도록)
+2) 배포 후 이미 Stream에 쌓인 메시지는 원래 id 그대로 그 뒤에 다시 넣고
+3) List를 삭제
+방 하나를 Lua 스크립트 한 번으로 처리하므로 옮기는 도중 들어온 메시지가 유실되지 않음.
+List가 지워지면 다음 실행에서는 건너뛰므로 여러 워커가 동시에/여러 번 실행해도 안전함.
+
+앱 시작 시 백그라운드로 한 번 실행됨 (CHAT_HISTORY_MIGRATE_ON_STARTUP). 직접 실행하려면:
+    python -m app.services.chat_history_migration --batch-size 100
+"""
+
+import argparse
+import asyncio
+import logging
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+LIST_KEY_PATTERN = "room:*:messages"
+
+# KEYS[1] = List, KEYS[2] = Stream, ARGV[1] = 옮길 최대 개수 → 옮긴 메시지 수
+_MIGRATE_SCRIPT = """
+local items = redis.call("LRANGE", KEYS[1], -tonumber(ARGV[1]), -1)
+if #items > 0 then
+    local existing = redis.call("XRANGE", KEYS[2], "-", "+")
+    redis.call("DEL", KEYS[2])
+    for i, text in ipairs(items) do
+        redis.call("XADD", KEYS[2], "0-" .. i, "text", text)
+    end
+    for _, entry in ipairs(existing) do
+        redis.call("XADD", KEYS[2], entry[1], unpack(entry[2]))
+    end
+    redis.call("XTRIM", KEYS[2], "MAXLEN", "~", ARGV[1])
+end
+redis.call("DEL", KEYS[1])
+return #items
+"""
+
+
+async def migrate_room_lists(redis: Redis, *, batch_size: int = 100, max_messages: int | None = None) -> int:
+    """
+    남아 있는 room:{id}:messages List를 모두 Stream으로 옮기고, 옮긴 방 수를 반환
+    """
+    max_messages = settings.CHAT_HISTORY_MAX_MESSAGES if max_messages is None else max_messages
+    rooms = 0
+    async for list_key in redis.scan_iter(match=LIST_KEY_PATTERN, count=batch_size):
+        moved = await redis.eval(_MIGRATE_SCRIPT, 2, list_key, _stream_key_for(list_key), max_messages)
+        rooms += 1
+        logger.info("chat history: moved %d message(s) from %s", moved, list_key)
+    return rooms
+
+
+async def run_startup_migration() -> None:
+    """
+    lifespan에서 백그라운드 태스크로 한 번 실행 (Redis 장애 시 다음 시작 때 다시 시도)
+    """
+    try:
+        rooms = await migrate_room_lists(redis_client)
+        if rooms:
+            logger.info("chat history: migrated %d room(s) to streams", rooms)
+    except RedisError as exc:
+        logger.warning("chat history migration skipped: %s", exc)
+    except Exception:
+        logger.exception("chat history migration failed")
+
+
+def _stream_key_for(list_key: str) -> str:
+    # app.services.websocket._stream_key 와 같은 형식
+    return list_key[: -len(":messages")] + ":stream"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Move chat history lists into Redis streams")
+    parser.add_argument("--batch-size", type=int, default=100, help="SCAN 한 번에 훑을 키 수")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    rooms = asyncio.run(migrate_room_lists(redis_client, batch_size=args.batch_size))
+    logger.info("done: %d room(s) migrated", rooms)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,187 @@
+# app/services/image_variants.py
+
+"""
+이미지 첨부파일 파생본(썸네일/미리보기) 백그라운드 생성 파이프라인
+
+- 업로드 응답은 기다리지 않음: 업로드 완료 후 schedule(file_id, content_type)로 큐에 넣기만 함
+- 큐는 크기 제한(IMAGE_VARIANT_QUEUE_SIZE)이 있어서 가득 차면 버리고 경고만 남김
+  (파생본이 없으면 다운로드는 원본으로 대체되므로 유실돼도 기능은 유지됨)
+- 디코딩/리사이즈(CPU)는 별도 프로세스 풀(IMAGE_VARIANT_WORKERS)에서 실행 → 이벤트 루프·GIL과 분리
+- DB/저장소 I/O는 threadpool
+- 파생본 키: <원본 object_key>.<file_id>.<이름><확장자> (원본 옆에 저장, blob을 공유해도 File 행마다 따로)
+- Pillow(requirements.txt)가 없으면 파이프라인이 시작되지 않고 schedule()은 아무것도 하지 않음
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.crud import file as file_crud
+from app.db.session import SessionLocal
+from app.services.storage import STAGING_DIR
+from app.services.storage_backends import StorageBackend, get_backend
+from app.utils import image_render
+
+logger = logging.getLogger(__name__)
+
+# 이름 -> 최대 (가로, 세로). 비율은 유지
+VARIANT_SIZES: dict[str, tuple[int, int]] = {
+    "thumb": (320, 320),
+    "preview": (1280, 1280),
+}
+
+# Pillow가 디코딩하지 못하거나(벡터) 파생본이 의미 없는 형식
+_SKIP_CONTENT_TYPES = {"image/svg+xml", "image/x-icon", "image/vnd.microsoft.icon"}
+
+
+class ImageVariantPipeline:
+    def __init__(self, workers: int, queue_size: int) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self._queue: Optional[asyncio.Queue[int]] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return self._queue is not None
+
+    # 시작/종료 (lifespan) ~~
+    async def start(self) -> None:
+        if self.running:
+            return
+        if not image_render.AVAILABLE:
+            logger.warning("Pillow is not installed - image variants disabled")
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        # fork는 이벤트 루프/DB 커넥션까지 복제하므로 spawn으로 깨끗한 워커를 띄움
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._tasks = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._queue = None
+    # ~~ 시작/종료 (lifespan)
+
+    def schedule(self, file_id: int, content_type: str) -> bool:
+        """
+        파생본 생성 예약. 큐에 넣었으면 True
+        (파이프라인이 꺼져 있거나, 이미지가 아니거나, 큐가 가득 찼으면 False)
+        """
+        if self._queue is None:
+            return False
+        if not content_type.startswith("image/") or content_type in _SKIP_CONTENT_TYPES:
+            return False
+        try:
+            self._queue.put_nowait(file_id)
+        except asyncio.QueueFull:
+            logger.warning("image variant queue full - skipped file id=%s", file_id)
+            return False
+        return True
+
+    # 소비자 ~~
+    async def _consume(self) -> None:
+        assert self._queue is not None
+        while True:
+            file_id = await self._queue.get()
+            try:
+                await self._generate(file_id)
+            except Exception:
+                logger.exception("image variant generation failed for file id=%s", file_id)
+            finally:
+                self._queue.task_done()
+
+    async def _generate(self, file_id: int) -> None:
+        object_key = await run_in_threadpool(_load_object_key, file_id)
+        if object_key is None:
+            return  # 그 사이 삭제됐거나 이미 생성됨
+
+        backend = get_backend()
+        source = backend.local_path(object_key)
+        downloaded: Optional[Path] = None
+        if source is None:
+            # 원격 저장소면 스테이징에 내려받아서 렌더링
+            downloaded = STAGING_DIR / f"{uuid.uuid4().hex}.src"
+            await run_in_threadpool(_download, backend, object_key, downloaded)
+            source = downloaded
+
+        try:
+            rendered = await asyncio.get_running_loop().run_in_executor(
+                self._pool, image_render.render_variants, str(source), str(STAGING_DIR), VARIANT_SIZES
+            )
+        finally:
+            if downloaded is not None:
+                downloaded.unlink(missing_ok=True)
+
+        for item in rendered:
+            await run_in_threadpool(_store_variant, backend, file_id, object_key, item)
+    # ~~ 소비자
+
+
+# 내부 헬퍼 (threadpool) ~~
+def _load_object_key(file_id: int) -> Optional[str]:
+    with SessionLocal() as db:
+        meta = file_crud.get_file_meta(db, file_id)
+        if meta is None:
+            return None
+        if all(file_crud.get_file_variant(db, file_id, name) for name in VARIANT_SIZES):
+            return None
+        return meta.object_key
+
+
+def _download(backend: StorageBackend, object_key: str, dest: Path) -> None:
+    with backend.open(object_key) as stream, dest.open("wb") as out:
+        while chunk := stream.read(1024 * 1024):
+            out.write(chunk)
+
+
+def _store_variant(backend: StorageBackend, file_id: int, object_key: str, item: dict) -> None:
+    tmp_path = Path(item["path"])
+    variant_key = f"{object_key}.{file_id}.{item['name']}{item['ext']}"
+    try:
+        backend.put_file(tmp_path, variant_key, item["content_type"])
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    with SessionLocal() as db:
+        created = file_crud.create_file_variant(
+            db,
+            file_id=file_id,
+            name=item["name"],
+            object_key=variant_key,
+            content_type=item["content_type"],
+            size=item["size"],
+            width=item["width"],
+            height=item["height"],
+            checksum=item["checksum"],
+        )
+    if created is None:
+        # 원본이 그 사이 삭제됐거나 다른 워커가 먼저 만듦
+        backend.delete(variant_key)
+# ~~ 내부 헬퍼 (threadpool)
+
+
+# 프로세스 단일 인스턴스 ~~
+pipeline = ImageVariantPipeline(
+    workers=settings.IMAGE_VARIANT_WORKERS, queue_size=settings.IMAGE_VARIANT_QUEUE_SIZE
+)
+
+
+def schedule(file_id: int, content_type: str) -> bool:
+    return pipeline.schedule(file_id, content_type)
+# ~~ 프로세스 단일 인스턴스
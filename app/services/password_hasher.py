@@ -0,0 +1,80 @@
+# app/services/password_hasher.py
+
+"""
+bcrypt 해싱/검증 전용 실행기
+
+- bcrypt는 요청 하나에 수백 ms의 CPU를 씀. 요청 처리용 공용 threadpool(run_in_threadpool)에서 돌리면
+  로그인 폭주 때 threadpool이 bcrypt로 가득 차서 다른 모든 엔드포인트가 같이 멈춤
+  → PASSWORD_HASH_WORKERS개짜리 전용 스레드 풀에서만 실행 (bcrypt는 해싱 중 GIL을 놓으므로 스레드로 충분)
+- 실행 중 + 대기 중 작업이 PASSWORD_HASH_MAX_PENDING개를 넘으면 큐에 쌓지 않고
+  바로 503(Retry-After)으로 거절 → 폭주해도 대기 시간이 무한히 늘지 않고, 나머지 API는 정상 응답
+- 전용 풀은 처음 쓸 때 만들고 lifespan 종료 시 shutdown()
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_and_update_password
+
+T = TypeVar("T")
+
+RETRY_AFTER_SECONDS = 1
+
+
+class PasswordHasher:
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None) -> None:
+        self.workers = settings.PASSWORD_HASH_WORKERS if workers is None else workers
+        self.max_pending = settings.PASSWORD_HASH_MAX_PENDING if max_pending is None else max_pending
+        self.pending = 0
+        self._lock = threading.Lock()  # 완료 콜백은 워커 스레드에서 호출됨
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(get_password_hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+        """
+        (일치 여부, cost가 바뀌었으면 재해싱한 새 해시 / 아니면 None)
+        """
+        return await self._submit(verify_and_update_password, password, hashed_password)
+
+    def shutdown(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _submit(self, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many authentication requests in progress. Please retry shortly.",
+                    headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+                )
+            self.pending += 1
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        # 클라이언트가 끊겨 await가 취소돼도, 이미 실행 중인 작업은 끝날 때까지 pending에 남음
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future: Optional[Future] = None) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+
+# 워커(프로세스)당 하나
+password_hasher = PasswordHasher()
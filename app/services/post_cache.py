@@ -0,0 +1,202 @@
+# app/services/post_cache.py
+
+"""
+게시글 단건(PostOut) Redis 캐시 레이어 (read-through)
+
+- 키: post:v{CACHE_SCHEMA_VERSION}:{post_id} → 직렬화된 PostOut JSON (TTL)
+  PostOut 스키마가 바뀌면 CACHE_SCHEMA_VERSION을 올려서 이전 캐시를 자연 소멸시킬 것.
+- 게시글 수정/삭제, 첨부파일 업로드/삭제 시 invalidate() 호출
+    - invalidate()는 게시글별 세대(generation) 키를 INCR 한 뒤 캐시를 삭제
+    - 채우는 쪽은 DB 조회 전에 세대를 읽어 두고, 저장 시점에 세대가 그대로일 때만 SET (Lua)
+      → 조회와 커밋이 엇갈려도 무효화 이전의 옛 값이 다시 캐시되지 않음
+- single-flight: 캐시 miss 시 DB 조회는 한 번만
+    - 같은 프로세스 안: 진행 중인 조회(Future)를 공유 (조회하던 요청이 취소되면 대기자 중 하나가 이어서 조회)
+    - 워커 간: Redis SET NX 락을 잡은 쪽만 DB 조회, 나머지는 캐시가 채워질 때까지 잠깐 대기
+- Redis 장애 시 fail-open: 캐시 없이 DB를 바로 조회하고, 잠시 동안 Redis 호출을 건너뜀
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Awaitable, Callable
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis_client import redis_client
+from app.schemas.post import PostOut
+
+logger = logging.getLogger(__name__)
+
+CACHE_SCHEMA_VERSION = 1
+
+_LOCK_POLL_SECONDS = 0.05      # 락 대기 중 캐시 재확인 간격
+_REDIS_BACKOFF_SECONDS = 5.0   # Redis 오류 후 호출을 건너뛸 시간
+_GENERATION_TTL_SECONDS = 24 * 3600  # 세대 키 보관 시간 (조회 한 번보다 충분히 길면 됨)
+
+# 락 소유자(token)일 때만 삭제
+_UNLOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# 세대(KEYS[2])가 DB 조회 전에 읽은 값(ARGV[1])과 같을 때만 캐시 저장
+_SET_IF_GENERATION_SCRIPT = """
+if (redis.call("get", KEYS[2]) or "0") == ARGV[1] then
+    return redis.call("set", KEYS[1], ARGV[2], "EX", ARGV[3])
+end
+return 0
+"""
+
+_inflight: dict[int, asyncio.Future] = {}
+_redis_retry_at: float = 0.0
+
+
+# 조회 ~~
+async def get_post(post_id: int, loader: Callable[[], Awaitable[PostOut]]) -> PostOut:
+    """
+    캐시에서 게시글을 반환. miss면 loader()로 DB에서 읽어 캐시에 채움
+    loader에서 발생한 예외(404 등)는 그대로 전파되며 캐시되지 않음
+    """
+    if not settings.POST_CACHE_ENABLED:
+        return await loader()
+
+    while True:
+        cached = await _get(post_id)
+        if cached is not None:
+            return PostOut.model_validate_json(cached)
+
+        # 같은 프로세스에서 이미 채우는 중이면 그 결과를 같이 기다림
+        inflight = _inflight.get(post_id)
+        if inflight is None:
+            break
+        try:
+            return await asyncio.shield(inflight)
+        except asyncio.CancelledError:
+            task = asyncio.current_task()
+            if not inflight.cancelled() or (task is not None and task.cancelling()):
+                raise  # 이 요청 자체가 취소됨
+            # 채우던 요청(leader)이 취소됨 - 대기자는 취소된 게 아니므로 다시 시도 (다음 leader가 채움)
+
+    future: asyncio.Future = asyncio.get_running_loop().create_future()
+    _inflight[post_id] = future
+    try:
+        post = await _fill(post_id, loader)
+    except BaseException as exc:
+        if isinstance(exc, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(exc)
+            future.exception()  # 대기자가 없을 때의 "never retrieved" 경고 방지
+        raise
+    else:
+        future.set_result(post)
+        return post
+    finally:
+        _inflight.pop(post_id, None)
+# ~~ 조회
+
+
+# 무효화 ~~
+async def invalidate(post_id: int) -> None:
+    """
+    게시글 캐시 삭제 (커밋 이후에 호출할 것)
+    세대를 먼저 올려서, 이미 옛 값을 읽어 가는 중인 조회가 삭제 뒤에 다시 저장하지 못하게 함
+    """
+    if not settings.POST_CACHE_ENABLED or not _redis_available():
+        return
+    try:
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.incr(_generation_key(post_id))
+        pipe.expire(_generation_key(post_id), _GENERATION_TTL_SECONDS)
+        pipe.delete(_key(post_id))
+        await pipe.execute()
+    except RedisError as exc:
+        _mark_redis_down(exc)
+# ~~ 무효화
+
+
+# 내부 헬퍼 ~~
+def _key(post_id: int) -> str:
+    return f"post:v{CACHE_SCHEMA_VERSION}:{post_id}"
+
+
+def _lock_key(post_id: int) -> str:
+    return f"{_key(post_id)}:lock"
+
+
+def _generation_key(post_id: int) -> str:
+    return f"{_key(post_id)}:gen"
+
+
+def _redis_available() -> bool:
+    return time.monotonic() >= _redis_retry_at
+
+
+def _mark_redis_down(exc: Exception) -> None:
+    global _redis_retry_at
+    _redis_retry_at = time.monotonic() + _REDIS_BACKOFF_SECONDS
+    logger.warning("post cache disabled for %.0fs: %s", _REDIS_BACKOFF_SECONDS, exc)
+
+
+async def _get(post_id: int) -> str | None:
+    if not _redis_available():
+        return None
+    try:
+        return await redis_client.get(_key(post_id))
+    except RedisError as exc:
+        _mark_redis_down(exc)
+        return None
+
+
+async def _fill(post_id: int, loader: Callable[[], Awaitable[PostOut]]) -> PostOut:
+    """
+    워커 간 single-flight: 락을 잡으면 DB 조회 후 캐시 저장,
+    못 잡으면 락 만료 시간까지 캐시가 채워지길 기다렸다가 그래도 없으면 DB 직접 조회
+    """
+    if not _redis_available():
+        return await loader()
+
+    token = uuid.uuid4().hex
+    lock_ms = settings.POST_CACHE_LOCK_MS
+    try:
+        locked = await redis_client.set(_lock_key(post_id), token, nx=True, px=lock_ms)
+    except RedisError as exc:
+        _mark_redis_down(exc)
+        return await loader()
+
+    if not locked:
+        deadline = time.monotonic() + lock_ms / 1000
+        while time.monotonic() < deadline:
+            await asyncio.sleep(_LOCK_POLL_SECONDS)
+            cached = await _get(post_id)
+            if cached is not None:
+                return PostOut.model_validate_json(cached)
+            if not _redis_available():
+                break
+        return await loader()
+
+    try:
+        try:
+            generation = await redis_client.get(_generation_key(post_id)) or "0"
+        except RedisError as exc:
+            _mark_redis_down(exc)
+            return await loader()
+        post = await loader()
+        try:
+            await redis_client.eval(
+                _SET_IF_GENERATION_SCRIPT, 2, _key(post_id), _generation_key(post_id),
+                generation, post.model_dump_json(), settings.POST_CACHE_TTL_SECONDS,
+            )
+        except RedisError as exc:
+            _mark_redis_down(exc)
+        return post
+    finally:
+        try:
+            await redis_client.eval(_UNLOCK_SCRIPT, 1, _lock_key(post_id), token)
+        except RedisError:
+            pass  # 락은 PX 만료로 정리됨
+# ~~ 내부 헬퍼
@@ -1,43 +1,548 @@
 # app/services/storage.py
-import os, shutil, uuid
+import asyncio, hashlib, logging, uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import cast, Tuple
+from typing import AsyncIterator, BinaryIO, Callable, Iterator, Optional, cast, Tuple
 
 from fastapi import UploadFile, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from app.schemas.file import FileOut
+from app.core.config import settings
+from app.schemas.file import FileOut, UploadSessionCreate, UploadSessionOut
 from app.crud import file as file_crud
+from app.crud import post as post_crud
 from app.db.models.file import File
+from app.db.models.file_blob import FileBlob
+from app.db.models.upload_session import UploadSession
+from app.db.session import SessionLocal, run_db
+from app.services.storage_backends import StorageBackend, get_backend
 
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = Path(settings.FILE_STORAGE_DIR)
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+STAGING_DIR = UPLOAD_DIR / "staging"  # 업로드 중인 임시 파일 (backend와 무관하게 항상 로컬)
+STAGING_DIR.mkdir(exist_ok=True)
+
+_CHUNK_SIZE = 1024 * 1024  # 업로드 스트리밍 청크 크기 (1MB)
+
+# 디스크/스토리지 I/O는 threadpool, DB 작업은 run_db(동기/비동기 세션 공통)로 분리
+# 최종 저장 위치는 storage backend(STORAGE_BACKEND: local / s3)가 결정
 
 # 업로드 
-def save_file(db: Session, file: UploadFile, post_id: int, uploader_id: int) -> FileOut:
+async def save_file(db, file: UploadFile, post_id: int, uploader_id: int) -> FileOut:
+    """
+    업로드를 고정 크기 청크로 스트리밍 저장
+    - 청크 읽기/쓰기는 이벤트 루프 밖(threadpool)에서, 크기·sha256은 같은 패스에서 계산
+    - MAX_UPLOAD_MB 초과 시 즉시 중단(413)하고 임시 파일 삭제
+    - 임시 파일(.part)에 다 쓴 뒤 backend로 옮김(로컬은 원자적 rename) → 반쯤 쓴 파일이 노출되지 않음
+    - FILE_DEDUP_ENABLED면 sha256 기준 blob으로 저장: 이미 있는 내용이면 임시 파일만 버리고 참조 수만 올림
+    """
+    max_bytes = settings.MAX_UPLOAD_MB * 1024 * 1024
+    if file.size is not None and file.size > max_bytes:
+        raise _too_large()
+
     original_name: str = cast(str, file.filename)
     file_ext = Path(original_name).suffix
     unique_name = f"{uuid.uuid4().hex}{file_ext}"
-    file_path = UPLOAD_DIR / unique_name
+    tmp_path = STAGING_DIR / f"{unique_name}.part"
+    content_type = file.content_type or "application/octet-stream"
 
-    # 디스크에 저장
+    # 임시 파일에 스트리밍 저장
+    hasher = hashlib.sha256()
+    size = 0
     try:
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        buffer = await run_in_threadpool(tmp_path.open, "wb")
+        try:
+            while chunk := await file.read(_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large()
+                await run_in_threadpool(_write_chunk, buffer, hasher, chunk)
+        finally:
+            await run_in_threadpool(buffer.close)
+    except HTTPException:
+        await run_in_threadpool(tmp_path.unlink, missing_ok=True)
+        raise
     except Exception as e:
+        await run_in_threadpool(tmp_path.unlink, missing_ok=True)
         raise HTTPException(status_code=500, detail=f"File upload failed: {e}")
+    checksum = hasher.hexdigest()
+
+    return await _register_upload(
+        db, tmp_path, original_name, content_type, size, checksum, post_id, uploader_id
+    )
+
+
+# 다운로드 
+@dataclass
+class Download:
+    """
+    다운로드 대상 (원본 또는 파생본)
+    - url: presigned URL → 바이트가 API 워커를 거치지 않음
+    - path: 로컬 파일 → Range/조건부 GET/sendfile 응답
+    - 둘 다 None: iter_file_chunks(object_key)로 프록시 스트리밍
+    """
+    object_key: str
+    filename: str
+    content_type: str
+    checksum: Optional[str]
+    path: Optional[Path] = None
+    url: Optional[str] = None
+
+
+async def get_download(db, file_id: int, variant: Optional[str] = None) -> Download:
+    """
+    variant(thumb/preview)를 요청했는데 아직 생성 전이면 원본을 내려줌 (이미지가 아니면 404)
+    """
+    def _load(s: Session) -> Download:
+        meta = file_crud.get_file_meta(s, file_id)
+        if not meta:
+            raise HTTPException(status_code=404, detail="File not found")
+        if variant is not None:
+            if not meta.content_type.startswith("image/"):
+                raise HTTPException(status_code=404, detail="No variants for non-image files")
+            found = file_crud.get_file_variant(s, file_id, variant)
+            if found is not None:
+                return Download(
+                    object_key=found.object_key,
+                    filename=f"{Path(meta.filename).stem}_{variant}{Path(found.object_key).suffix}",
+                    content_type=found.content_type,
+                    checksum=found.checksum,
+                )
+        return Download(
+            object_key=meta.object_key,
+            filename=meta.filename,
+            content_type=meta.content_type,
+            checksum=meta.checksum,
+        )
+
+    target = await run_db(db, _load)
+    backend = get_backend()
+    if settings.STORAGE_PRESIGNED_DOWNLOADS:
+        target.url = await run_in_threadpool(
+            backend.presigned_url,
+            target.object_key,
+            filename=target.filename,
+            content_type=target.content_type,
+            expires_in=settings.STORAGE_PRESIGNED_TTL_SECONDS,
+        )
+        if target.url is not None:
+            return target
+
+    target.path = backend.local_path(target.object_key)
+    if target.path is not None and not await run_in_threadpool(target.path.is_file):
+        raise HTTPException(status_code=404, detail="File missing on disk")
+    return target
+
+
+def iter_file_chunks(object_key: str) -> Iterator[bytes]:
+    """
+    backend에서 직접 읽어 스트리밍 (동기 이터레이터 - StreamingResponse가 threadpool에서 순회)
+    """
+    return get_backend().iter_chunks(object_key)
+
+
+# 삭제 
+async def delete_file(db, file_id: int) -> int:
+    """
+    파일 삭제 후, 해당 파일이 붙어 있던 게시글 id를 반환 (게시글 캐시 무효화용)
+    blob을 공유하는 경우 마지막 참조가 사라질 때만 저장소에서 삭제
+    """
+    def _delete_meta(s: Session) -> Tuple[int, list[str]]:
+        meta = file_crud.get_file_meta(s, file_id)
+        if not meta:
+            raise HTTPException(status_code=404, detail="File not found")
+        post_id = meta.post_id
+        stale_keys = file_crud.remove_file_meta(s, meta)
+        s.commit()
+        return post_id, stale_keys
+
+    post_id, stale_keys = await run_db(db, _delete_meta)
+
+    # 저장소 삭제 (커밋 이후) - 원본(마지막 참조일 때) + 파생본
+    await delete_objects(stale_keys)
+    return post_id
+
+
+async def delete_objects(object_keys: list[str]) -> None:
+    """
+    메타데이터 커밋 이후 저장소에서 object 삭제
+    """
+    for object_key in object_keys:
+        await run_in_threadpool(get_backend().delete, object_key)
+
+
+# 청크(이어 올리기) 업로드 ~~
+# 생성 → PUT 청크(offset) → 완료. 받은 청크는 STAGING_DIR/<id>.part 에 이어 쓰고
+# 진행 상황(received)은 upload_sessions 테이블에 기록하므로 어느 워커로 요청이 가도 이어서 받을 수 있음
+async def create_upload_session(
+    db, post_id: int, uploader_id: int, payload: UploadSessionCreate
+) -> UploadSessionOut:
+    if payload.size > settings.MAX_UPLOAD_MB * 1024 * 1024:
+        raise _too_large()
+
+    upload_id = uuid.uuid4().hex
+    await run_in_threadpool(_staging_path(upload_id).touch)
+
+    def _create(s: Session) -> UploadSessionOut:
+        post_crud.get_post(s, post_id)  # 404 처리 내장
+        upload = file_crud.create_upload_session(
+            s,
+            upload_id=upload_id,
+            filename=payload.filename,
+            content_type=payload.content_type or "application/octet-stream",
+            total_size=payload.size,
+            post_id=post_id,
+            uploader_id=uploader_id,
+            expires_at=_upload_expires_at(),
+        )
+        return _to_upload_out(upload)
+
+    try:
+        return await run_db(db, _create)
+    except Exception:
+        await run_in_threadpool(_staging_path(upload_id).unlink, missing_ok=True)
+        raise
+
+
+async def get_upload_session(db, upload_id: str, user_id: int) -> UploadSessionOut:
+    return await run_db(db, _load_upload_session, upload_id, user_id)
+
+
+async def write_upload_chunk(
+    db, upload_id: str, user_id: int, offset: int, stream: AsyncIterator[bytes]
+) -> UploadSessionOut:
+    """
+    offset 위치부터 스트림을 스테이징 파일에 이어 씀 (메모리에 모으지 않음)
+    - offset이 서버가 받은 바이트 수와 다르면 409 (클라이언트는 GET으로 offset을 다시 확인)
+    - 도중에 연결이 끊겨도 그때까지 쓴 바이트는 반영 → 그 지점부터 재개 가능
+    """
+    upload = await run_db(db, _load_upload_session, upload_id, user_id)
+    if offset != upload.offset:
+        raise _offset_mismatch(upload.offset)
+
+    try:
+        buffer = await run_in_threadpool(_staging_path(upload_id).open, "r+b")
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+
+    written = 0
+    try:
+        await run_in_threadpool(buffer.seek, offset)
+        async for chunk in stream:
+            if offset + written + len(chunk) > upload.size:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail="Chunk exceeds declared upload size",
+                )
+            await run_in_threadpool(buffer.write, chunk)
+            written += len(chunk)
+    finally:
+        await run_in_threadpool(buffer.close)
+        if written:
+            advanced = await run_db(
+                db, file_crud.advance_upload_session,
+                upload_id, offset, written, _upload_expires_at(),
+            )
+            if not advanced:
+                raise _offset_mismatch(None)
+
+    return await run_db(db, _load_upload_session, upload_id, user_id)
+
+
+async def finalize_upload_session(db, upload_id: str, user_id: int) -> Tuple[FileOut, int]:
+    """
+    다 받은 스테이징 파일을 청크 단위로 읽어 sha256만 계산한 뒤(메모리에 올리지 않음),
+    단일 요청 업로드와 같은 경로로 최종 위치에 옮기고 메타데이터 기록
+    저장된 파일과 게시글 id를 반환 (게시글 캐시 무효화용)
+    """
+    def _load(s: Session) -> Tuple[UploadSessionOut, int, str]:
+        upload = _load_upload_session(s, upload_id, user_id)
+        if upload.offset != upload.size:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload incomplete: {upload.offset}/{upload.size} bytes received",
+                headers={"Upload-Offset": str(upload.offset)},
+            )
+        meta = file_crud.get_upload_session(s, upload_id)
+        return upload, meta.post_id, meta.content_type
+
+    upload, post_id, content_type = await run_db(db, _load)
+    staging = _staging_path(upload_id)
+    checksum = await run_in_threadpool(_hash_file, staging, upload.size)
+
+    if not await run_db(db, file_crud.claim_upload_session, upload_id):
+        raise HTTPException(status_code=404, detail="Upload session not found")
+
+    saved = await _register_upload(
+        db, staging, upload.filename, content_type, upload.size, checksum, post_id, user_id
+    )
+    return saved, post_id
+
+
+async def abort_upload_session(db, upload_id: str, user_id: int) -> None:
+    await run_db(db, _load_upload_session, upload_id, user_id)
+    await run_db(db, file_crud.delete_upload_session, upload_id)
+    await run_in_threadpool(_staging_path(upload_id).unlink, missing_ok=True)
+
+
+def collect_expired_upload_sessions(db: Session) -> int:
+    """
+    만료된 업로드 세션 행과 스테이징 파일을 삭제하고, 삭제 수를 반환
+    """
+    expired = file_crud.delete_expired_upload_sessions(db, _utcnow())
+    for upload_id in expired:
+        _staging_path(upload_id).unlink(missing_ok=True)
+    return len(expired)
+# ~~ 청크(이어 올리기) 업로드
+
+
+# 참조가 끊긴 blob 정리 ~~
+def collect_unreferenced_blobs(db: Session, batch_size: int = 100) -> int:
+    """
+    ref_count가 0 이하인 blob(게시글 삭제 등으로 참조가 끊긴 것)을 행·디스크에서 삭제하고, 삭제 수를 반환
+    """
+    removed = 0
+    backend = get_backend()
+    for blob in file_crud.get_unreferenced_blobs(db, limit=batch_size):
+        try:
+            stale_key = file_crud.delete_blob_if_unreferenced(db, blob.id)
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            logger.exception("failed to remove unreferenced blob id=%s", blob.id)
+            continue
+        if stale_key is not None:
+            backend.delete(stale_key)
+            removed += 1
+    return removed
+
+
+async def run_blob_gc_loop(interval_seconds: int) -> None:
+    """
+    lifespan에서 백그라운드 태스크로 실행 - interval_seconds 간격으로 정리
+    """
+    await _run_periodic(interval_seconds, collect_unreferenced_blobs, "file blobs")
+
+
+async def run_upload_session_gc_loop(interval_seconds: int) -> None:
+    """
+    lifespan에서 백그라운드 태스크로 실행 - interval_seconds 간격으로 만료 세션 정리
+    """
+    await _run_periodic(interval_seconds, collect_expired_upload_sessions, "upload sessions")
+
+
+async def _run_periodic(interval_seconds: int, collect: Callable[[Session], int], label: str) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            removed = await run_in_threadpool(_collect_once, collect)
+            if removed:
+                logger.info("%s collected: %d removed", label, removed)
+        except Exception:
+            logger.exception("%s collection failed", label)
+
+
+def _collect_once(collect: Callable[[Session], int]) -> int:
+    with SessionLocal() as db:
+        return collect(db)
+# ~~ 참조가 끊긴 blob 정리
+
+
+# 내부 헬퍼 ~~
+async def _register_upload(
+    db,
+    tmp_path: Path,
+    original_name: str,
+    content_type: str,
+    size: int,
+    checksum: str,
+    post_id: int,
+    uploader_id: int,
+) -> FileOut:
+    """
+    다 받은 임시 파일을 최종 위치로 옮기고 메타데이터 기록 (단일 요청 업로드 / 청크 업로드 완료 공통)
+    실패하면 임시 파일을 지움 - 청크 업로드는 이미 세션 행을 claim(삭제)했으므로 만료 정리 대상도 아님
+    """
+    save = _save_deduplicated if settings.FILE_DEDUP_ENABLED else _save_plain
+    try:
+        return await save(db, tmp_path, original_name, content_type, size, checksum, post_id, uploader_id)
+    except BaseException:
+        await run_in_threadpool(tmp_path.unlink, missing_ok=True)
+        raise
+
+
+async def _save_plain(
+    db,
+    tmp_path: Path,
+    original_name: str,
+    content_type: str,
+    size: int,
+    checksum: str,
+    post_id: int,
+    uploader_id: int,
+) -> FileOut:
+    backend = get_backend()
+    object_key = backend.key_for(f"{uuid.uuid4().hex}{Path(original_name).suffix}")
+    await _put_file(backend, tmp_path, object_key, content_type)
 
     # 메타데이터 DB 기록 (CRUD 레이어로)
-    file_meta = file_crud.create_file_meta(
-        db,
-        filename=original_name,
-        object_key=str(file_path),
-        content_type=file.content_type or "application/octet-stream",
-        size=os.path.getsize(file_path),
-        post_id=post_id,
-        uploader_id=uploader_id,
+    def _create_meta(s: Session) -> FileOut:
+        file_meta = file_crud.create_file_meta(
+            s,
+            filename=original_name,
+            object_key=object_key,
+            content_type=content_type,
+            size=size,
+            checksum=checksum,
+            post_id=post_id,
+            uploader_id=uploader_id,
+        )
+        return _to_file_out(file_meta)
+
+    try:
+        return await run_db(db, _create_meta)
+    except Exception:
+        # 메타데이터 기록 실패 시 고아 파일을 남기지 않음
+        await run_in_threadpool(backend.delete, object_key)
+        raise
+
+
+async def _save_deduplicated(
+    db,
+    tmp_path: Path,
+    original_name: str,
+    content_type: str,
+    size: int,
+    checksum: str,
+    post_id: int,
+    uploader_id: int,
+) -> FileOut:
+    """
+    1) 같은 내용의 blob이 있으면 참조 수만 올리고 File 행 기록 (저장소 쓰기 없음)
+    2) 없으면 저장소에 올린 뒤(DB 커넥션을 잡지 않은 채) blob + File 행 기록
+       blob 키에는 무작위 접미사를 붙여서, 마지막 참조 삭제와 같은 내용의 재업로드가
+       겹쳐도 서로의 객체를 지우지 않음
+    """
+    def _create_meta(s: Session, blob: FileBlob) -> FileOut:
+        file_meta = file_crud.create_file_meta(
+            s,
+            filename=original_name,
+            object_key=blob.object_key,
+            content_type=content_type,
+            size=size,
+            checksum=checksum,
+            blob_id=blob.id,
+            post_id=post_id,
+            uploader_id=uploader_id,
+        )
+        return _to_file_out(file_meta)
+
+    def _attach_existing(s: Session) -> Optional[FileOut]:
+        blob = file_crud.acquire_blob(s, checksum)
+        if blob is None:
+            s.rollback()
+            return None
+        return _create_meta(s, blob)
+
+    saved = await run_db(db, _attach_existing)
+    if saved is not None:
+        await run_in_threadpool(tmp_path.unlink, missing_ok=True)
+        return saved
+
+    # 새 내용
+    backend = get_backend()
+    object_key = backend.key_for(f"blobs/{checksum}-{uuid.uuid4().hex[:12]}")
+    await _put_file(backend, tmp_path, object_key, content_type)
+
+    def _attach_new(s: Session) -> Tuple[FileOut, bool]:
+        try:
+            blob = file_crud.create_blob(s, sha256=checksum, object_key=object_key, size=size)
+            return _create_meta(s, blob), True
+        except IntegrityError:
+            # 같은 내용이 동시에 먼저 등록됨 → 그 blob을 참조하고 방금 올린 객체는 버림
+            s.rollback()
+            blob = file_crud.acquire_blob(s, checksum)
+            if blob is None:
+                raise
+            return _create_meta(s, blob), False
+
+    try:
+        saved, used = await run_db(db, _attach_new)
+    except Exception as e:
+        await run_in_threadpool(backend.delete, object_key)
+        if isinstance(e, HTTPException):
+            raise
+        raise HTTPException(status_code=500, detail=f"File upload failed: {e}")
+    if not used:
+        await run_in_threadpool(backend.delete, object_key)
+    return saved
+
+
+async def _put_file(backend: StorageBackend, tmp_path: Path, object_key: str, content_type: str) -> None:
+    try:
+        await run_in_threadpool(backend.put_file, tmp_path, object_key, content_type)
+    except Exception as e:
+        await run_in_threadpool(tmp_path.unlink, missing_ok=True)
+        raise HTTPException(status_code=500, detail=f"File upload failed: {e}")
+
+
+def _load_upload_session(s: Session, upload_id: str, user_id: int) -> UploadSessionOut:
+    upload = file_crud.get_upload_session(s, upload_id)
+    if upload is None or upload.expires_at < _utcnow():
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    if upload.uploader_id != user_id:
+        raise HTTPException(status_code=403, detail="Not your upload session")
+    return _to_upload_out(upload)
+
+
+def _to_upload_out(upload: UploadSession) -> UploadSessionOut:
+    return UploadSessionOut(
+        id=upload.id,
+        filename=upload.filename,
+        size=upload.total_size,
+        offset=upload.received,
+        expires_at=upload.expires_at,
     )
 
+
+def _staging_path(upload_id: str) -> Path:
+    return STAGING_DIR / f"{upload_id}.part"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _upload_expires_at() -> datetime:
+    return _utcnow() + timedelta(seconds=settings.UPLOAD_SESSION_TTL_SECONDS)
+
+
+def _offset_mismatch(current: Optional[int]) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Upload offset mismatch",
+        headers={"Upload-Offset": str(current)} if current is not None else None,
+    )
+
+
+def _hash_file(path: Path, size: int) -> str:
+    """
+    청크 단위로 읽으며 sha256 계산. 재시도 등으로 size 뒤에 남은 바이트는 잘라냄
+    """
+    hasher = hashlib.sha256()
+    with path.open("r+b") as f:
+        f.truncate(size)
+        while chunk := f.read(_CHUNK_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _to_file_out(file_meta: File) -> FileOut:
     return FileOut(
         id=file_meta.id,
         filename=file_meta.filename,
@@ -48,29 +553,14 @@ def save_file(db: Session, file: UploadFile, post_id: int, uploader_id: int) ->
     )
 
 
-# 스트림 반환 
-def get_file_stream(db: Session, file_id: int) -> Tuple[Path, File]:
-    meta = file_crud.get_file_meta(db, file_id)
-    if not meta:
-        raise HTTPException(status_code=404, detail="File not found")
-
-    path = Path(meta.object_key)
-    if not path.exists():
-        raise HTTPException(status_code=404, detail="File missing on disk")
-
-    return path, meta
+def _write_chunk(buffer: BinaryIO, hasher: "hashlib._Hash", chunk: bytes) -> None:
+    hasher.update(chunk)
+    buffer.write(chunk)
 
 
-# 삭제 
-def delete_file(db: Session, file_id: int) -> None:
-    meta = file_crud.get_file_meta(db, file_id)
-    if not meta:
-        raise HTTPException(status_code=404, detail="File not found")
-
-    # 디스크 삭제
-    path = Path(meta.object_key)
-    if path.exists():
-        path.unlink()
-
-    # 메타데이터 삭제 (CRUD 레이어로)
-    file_crud.delete_file_meta(db, meta)
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File exceeds {settings.MAX_UPLOAD_MB} MB limit",
+    )
+# ~~ 내부 헬퍼
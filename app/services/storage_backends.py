@@ -0,0 +1,231 @@
+# app/services/storage_backends.py
+
+"""
+첨부파일 바이너리 저장소(backend) 추상화
+
+- LocalStorageBackend : 로컬 디스크 (FILE_STORAGE_DIR). object_key = 로컬 경로 문자열 (기존 데이터와 동일)
+- S3StorageBackend    : S3 호환 스토리지 (AWS S3, MinIO 등). object_key = 버킷 내 키
+  boto3는 STORAGE_BACKEND=s3 일 때만 필요 (선택 의존성)
+
+모든 메서드는 동기(blocking) I/O이므로 이벤트 루프에서는 run_in_threadpool로 호출할 것.
+업로드 중인 임시 파일(.part)과 청크 업로드 스테이징 파일은 backend와 무관하게 항상 로컬 디스크에 둠.
+"""
+
+import hashlib
+import os
+import string
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional
+from urllib.parse import quote
+
+from app.core.config import settings
+
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class StorageBackend(ABC):
+    """
+    저장소 인터페이스
+    """
+    name: str
+
+    @abstractmethod
+    def key_for(self, name: str) -> str:
+        """
+        저장소 내 상대 이름(예: "blobs/<sha256>.<suffix>")을 object_key로 변환
+        """
+
+    @abstractmethod
+    def put_file(self, src: Path, key: str, content_type: str) -> None:
+        """
+        로컬 임시 파일을 key 위치로 옮김(업로드). 성공하면 src는 더 이상 존재하지 않음
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        key 삭제 (없으면 무시)
+        """
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def open(self, key: str) -> BinaryIO:
+        """
+        읽기용 바이너리 스트림
+        """
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """
+        로컬 파일이면 경로 (FileResponse로 Range/sendfile 전송), 아니면 None
+        """
+        return None
+
+    def presigned_url(
+        self, key: str, *, filename: str, content_type: str, expires_in: int
+    ) -> Optional[str]:
+        """
+        클라이언트가 저장소에서 직접 받아 갈 수 있는 임시 URL, 지원하지 않으면 None
+        """
+        return None
+
+    def iter_chunks(self, key: str, chunk_size: int = _STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        API 서버를 거쳐 스트리밍할 때 사용 (StreamingResponse가 threadpool에서 순회)
+        """
+        with self.open(key) as stream:
+            while chunk := stream.read(chunk_size):
+                yield chunk
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    fanout_levels > 0 이면 파일명 앞 hex 글자로 하위 디렉터리를 나눔
+    (예: 2단계 → <root>/blobs/ab/cd/abcd...-x). 한 디렉터리에 수백만 개가 쌓이지 않도록.
+    이전(평면) 레이아웃으로 저장된 키도 그대로 읽을 수 있음 - 옮기는 건 storage_layout 도구
+    """
+    name = "local"
+
+    def __init__(self, root: Path, fanout_levels: int = 0) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.fanout_levels = fanout_levels
+
+    def key_for(self, name: str) -> str:
+        relative = Path(name)
+        shards = _shard_dirs(relative.name, self.fanout_levels)
+        return str(self.root / relative.parent / Path(*shards, relative.name))
+
+    def is_sharded(self, key: str) -> bool:
+        """
+        key가 이미 현재 fan-out 레이아웃 위치인지
+        """
+        path = Path(key)
+        shards = _shard_dirs(path.name, self.fanout_levels)
+        return not shards or list(path.parent.parts[-len(shards):]) == shards
+
+    def put_file(self, src: Path, key: str, content_type: str) -> None:
+        dest = Path(key)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(src, dest)  # 같은 파일시스템 안에서 원자적 rename
+
+    def delete(self, key: str) -> None:
+        Path(key).unlink(missing_ok=True)
+
+    def exists(self, key: str) -> bool:
+        return Path(key).is_file()
+
+    def open(self, key: str) -> BinaryIO:
+        return Path(key).open("rb")
+
+    def local_path(self, key: str) -> Optional[Path]:
+        return Path(key)
+
+
+class S3StorageBackend(StorageBackend):
+    """
+    client를 넘기지 않으면 boto3로 생성 (테스트에서는 moto/가짜 클라이언트 주입)
+    """
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        prefix: str = "",
+        client=None,
+        endpoint_url: Optional[str] = None,
+        region_name: Optional[str] = None,
+    ) -> None:
+        if client is None:
+            try:
+                import boto3
+            except ImportError as exc:  # pragma: no cover - 선택 의존성
+                raise RuntimeError("STORAGE_BACKEND=s3 requires boto3 (pip install boto3)") from exc
+            client = boto3.client(
+                "s3",
+                endpoint_url=endpoint_url,
+                region_name=region_name,
+                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            )
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+
+    def key_for(self, name: str) -> str:
+        return f"{self.prefix}{name}"
+
+    def put_file(self, src: Path, key: str, content_type: str) -> None:
+        # upload_file은 큰 파일을 멀티파트로 나눠 올림 (메모리에 전부 올리지 않음)
+        self.client.upload_file(
+            str(src), self.bucket, key, ExtraArgs={"ContentType": content_type}
+        )
+        src.unlink(missing_ok=True)
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def exists(self, key: str) -> bool:
+        listed = self.client.list_objects_v2(Bucket=self.bucket, Prefix=key, MaxKeys=1)
+        return any(obj["Key"] == key for obj in listed.get("Contents", []))
+
+    def open(self, key: str) -> BinaryIO:
+        return self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+
+    def presigned_url(
+        self, key: str, *, filename: str, content_type: str, expires_in: int
+    ) -> Optional[str]:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ResponseContentType": content_type,
+                "ResponseContentDisposition": f"attachment; filename*=utf-8''{quote(filename)}",
+            },
+            ExpiresIn=expires_in,
+        )
+
+
+def _shard_dirs(filename: str, levels: int) -> list[str]:
+    """
+    파일명 앞 2*levels 글자가 hex면(uuid/sha256 기반 이름) 그대로, 아니면 파일명 md5로 디렉터리 이름을 만듦
+    """
+    if levels <= 0:
+        return []
+    width = 2 * levels
+    prefix = filename[:width].lower()
+    if len(prefix) < width or any(c not in string.hexdigits for c in prefix):
+        prefix = hashlib.md5(filename.encode(), usedforsecurity=False).hexdigest()[:width]
+    return [prefix[i:i + 2] for i in range(0, width, 2)]
+
+
+# 설정(STORAGE_BACKEND)에 따른 프로세스 단일 인스턴스 ~~
+_backend: Optional[StorageBackend] = None
+
+
+def get_backend() -> StorageBackend:
+    global _backend
+    if _backend is None:
+        _backend = build_backend()
+    return _backend
+
+
+def build_backend() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorageBackend(settings.FILE_STORAGE_DIR, settings.FILE_STORAGE_FANOUT_LEVELS)
+    if settings.STORAGE_BACKEND == "s3":
+        if not settings.S3_BUCKET:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires S3_BUCKET")
+        return S3StorageBackend(
+            settings.S3_BUCKET,
+            prefix=settings.S3_KEY_PREFIX,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region_name=settings.S3_REGION,
+        )
+    raise RuntimeError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND!r}")
+# ~~ 설정(STORAGE_BACKEND)에 따른 프로세스 단일 인스턴스
@@ -0,0 +1,196 @@
+# app/services/storage_layout.py
+
+"""
+로컬 저장소 레이아웃 이전 도구 (평면 uploads/ → 하위 디렉터리 분산(fan-out) 레이아웃)
+
+서비스를 내리지 않고 배치 단위로 옮김. 파일 하나당:
+1) 새 위치에 하드 링크 (같은 inode - 복사 없음, 다른 파일시스템이면 복사)
+2) DB의 object_key를 조건부 UPDATE로 새 키로 변경 후 커밋
+   (blob이면 그 blob을 가리키는 File 행들까지 같은 트랜잭션에서)
+3) 이전 경로는 grace 시간이 지난 뒤 삭제
+   - 변경 직전에 이전 키를 읽어 간 다운로드 요청도 그동안은 파일을 열 수 있음
+   - 이미 열린 파일은 삭제 후에도 끝까지 읽힘
+그 사이 행이 삭제/변경됐으면(조건부 UPDATE 실패) 새로 만든 링크만 지움.
+여러 번 실행해도 안전함 (이미 새 레이아웃인 키는 건너뜀).
+
+사용법:
+    python -m app.services.storage_layout --batch-size 500 --pause 0.2 --grace 30
+    python -m app.services.storage_layout --dry-run
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from app.crud import file as file_crud
+from app.db.session import SessionLocal
+from app.services.storage_backends import LocalStorageBackend, get_backend
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MigrationStats:
+    moved: int = 0
+    skipped: int = 0   # 이미 새 레이아웃
+    missing: int = 0   # DB에는 있는데 파일이 없음
+    conflicts: int = 0 # 옮기는 사이 행이 삭제/변경됨
+    pending_unlink: list[tuple[float, Path]] = field(default_factory=list)  # (이전 키 교체 시각, 이전 경로)
+
+
+def migrate_layout(
+    db: Session,
+    backend: LocalStorageBackend,
+    *,
+    batch_size: int = 500,
+    pause_seconds: float = 0.0,
+    grace_seconds: float = 30.0,
+    dry_run: bool = False,
+) -> MigrationStats:
+    """
+    blob과 (blob을 쓰지 않는) File 행의 파일을 backend.key_for() 레이아웃으로 옮김
+    """
+    stats = MigrationStats()
+    _migrate_rows(
+        db, backend, stats,
+        fetch=file_crud.get_blobs_after,
+        move=file_crud.move_blob_key,
+        batch_size=batch_size, pause_seconds=pause_seconds,
+        grace_seconds=grace_seconds, dry_run=dry_run,
+    )
+    _migrate_rows(
+        db, backend, stats,
+        fetch=file_crud.get_plain_files_after,
+        move=file_crud.move_file_key,
+        batch_size=batch_size, pause_seconds=pause_seconds,
+        grace_seconds=grace_seconds, dry_run=dry_run,
+    )
+    _unlink_after_grace(stats, grace_seconds)
+    return stats
+
+
+def _migrate_rows(
+    db: Session,
+    backend: LocalStorageBackend,
+    stats: MigrationStats,
+    *,
+    fetch: Callable[[Session, int, int], list[tuple[int, str]]],
+    move: Callable[[Session, int, str, str], bool],
+    batch_size: int,
+    pause_seconds: float,
+    grace_seconds: float,
+    dry_run: bool,
+) -> None:
+    after_id = 0
+    while rows := fetch(db, after_id, batch_size):
+        after_id = rows[-1][0]
+        for row_id, old_key in rows:
+            new_key = _target_key(backend, old_key)
+            if new_key == old_key:
+                stats.skipped += 1
+                continue
+            old_path, new_path = Path(old_key), Path(new_key)
+            if not old_path.is_file():
+                stats.missing += 1
+                logger.warning("missing file for id=%s: %s", row_id, old_key)
+                continue
+            if dry_run:
+                stats.moved += 1
+                continue
+
+            new_path.parent.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(old_path, new_path)
+            if move(db, row_id, old_key, new_key):
+                stats.moved += 1
+                stats.pending_unlink.append((time.monotonic(), old_path))
+            else:
+                stats.conflicts += 1
+                new_path.unlink(missing_ok=True)
+
+        logger.info("storage layout: moved=%d skipped=%d (last id=%d)", stats.moved, stats.skipped, after_id)
+        # 오래된 이전 경로는 배치마다 정리 (grace 시간이 지난 것만)
+        _unlink_after_grace(stats, grace_seconds, only_expired=True)
+        if pause_seconds:
+            time.sleep(pause_seconds)  # 운영 중 I/O 부하 완화
+
+
+def _target_key(backend: LocalStorageBackend, old_key: str) -> str:
+    """
+    새 레이아웃 키 (root 기준 상대 경로를 그대로 두고 파일명 앞에 분산 디렉터리만 추가)
+    이미 새 레이아웃이거나 root 밖의 키(다른 FILE_STORAGE_DIR 시절 등)는 그대로
+    """
+    if backend.is_sharded(old_key):
+        return old_key
+    try:
+        relative = Path(old_key).relative_to(backend.root)
+    except ValueError:
+        return old_key
+    return backend.key_for(str(relative))
+
+
+def _link_or_copy(src: Path, dest: Path) -> None:
+    try:
+        os.link(src, dest)
+    except FileExistsError:
+        pass  # 이전 실행이 링크만 만들고 중단된 경우
+    except OSError:
+        shutil.copy2(src, dest)  # 다른 파일시스템 등 하드 링크 불가
+
+
+def _unlink_after_grace(stats: MigrationStats, grace_seconds: float, only_expired: bool = False) -> None:
+    """
+    교체 후 grace_seconds가 지난 이전 경로 삭제
+    only_expired=False(마지막 정리)면 남은 것들의 유예 시간이 끝날 때까지 기다렸다가 모두 삭제
+    """
+    remaining = []
+    for queued_at, path in stats.pending_unlink:
+        wait = grace_seconds - (time.monotonic() - queued_at)
+        if wait > 0:
+            if only_expired:
+                remaining.append((queued_at, path))
+                continue
+            time.sleep(wait)
+        path.unlink(missing_ok=True)
+    stats.pending_unlink = remaining
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Move local attachments into the fan-out directory layout")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=0.2, help="배치 사이 쉬는 시간 (초)")
+    parser.add_argument("--grace", type=float, default=30.0, help="이전 경로 삭제까지 유예 시간 (초)")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    backend = get_backend()
+    if not isinstance(backend, LocalStorageBackend):
+        parser.error("storage layout migration only applies to STORAGE_BACKEND=local")
+    if backend.fanout_levels <= 0:
+        parser.error("FILE_STORAGE_FANOUT_LEVELS is 0 - nothing to migrate")
+
+    with SessionLocal() as db:
+        stats = migrate_layout(
+            db, backend,
+            batch_size=args.batch_size,
+            pause_seconds=args.pause,
+            grace_seconds=args.grace,
+            dry_run=args.dry_run,
+        )
+    logger.info(
+        "done: moved=%d skipped=%d missing=%d conflicts=%d%s",
+        stats.moved, stats.skipped, stats.missing, stats.conflicts,
+        " (dry run)" if args.dry_run else "",
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,23 +1,288 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import uuid
 from collections import defaultdict
+from typing import Optional
+
 from fastapi import WebSocket
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from ..core.config import settings
+from ..core.redis_client import redis_client
+from .backplane import Backplane, backplane as default_backplane
+from .ws_outbox import Outbox
+
+logger = logging.getLogger(__name__)
+
+# 워커(프로세스) 식별자 - 레지스트리에 "이 피어는 어느 워커에 붙어 있는지"로 기록
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+ROOM_CHANNEL_PREFIX = "webrtc:room:"      # 방 전체 이벤트 (join/leave, "to" 없는 메시지)
+WORKER_CHANNEL_PREFIX = "webrtc:worker:"  # 특정 워커로 보내는 메시지 ("to" 대상이 그 워커에 있을 때)
+
 
 class CallManager:
-    """Manage WebRTC signaling connections per room."""
+    """
+    Manage WebRTC signaling connections per room.
+    소켓 전송은 연결별 송신 큐(Outbox)를 거치므로 느린 피어가 다른 피어의 시그널링을 막지 않음.
+
+    시그널링 프로토콜 (모두 JSON):
+    - 서버가 중계하는 메시지에는 보낸 사람 "from"을 붙임 (클라이언트가 보낸 "from"은 덮어씀)
+    - "to"가 있으면 그 피어에게만 (offer / answer / candidate), 없으면 방 전체
+      대상이 방에 없으면 보낸 사람에게 {"type": "error", "detail": "peer not found", "to": ...}
+    - 입장 시 본인에게 {"type": "peers", "peers": [...]}, 다른 피어에게 {"type": "join", "user": ...}
+    - 퇴장 시 {"type": "leave", "user": ...}
+
+    여러 워커/노드:
+    - 레지스트리(Redis): webrtc:room:{id}:peers (username 집합)
+                        webrtc:room:{id}:peer:{username} = 워커 id (PX WEBRTC_PEER_TTL_SECONDS)
+      워커가 WEBRTC_HEARTBEAT_SECONDS마다 자기 피어의 TTL을 갱신하므로,
+      죽은 워커의 피어는 만료되고 다음 정리 때 leave가 한 번 발행됨
+    - 방 이벤트는 방 채널에 한 번 발행 → 각 워커가 자기 소켓에만 전달
+    - "to" 메시지는 로컬에 있으면 바로, 아니면 대상 워커 채널로 (워커당 구독 하나)
+    - Redis 장애 시 로컬(같은 워커) 피어끼리만 동작
+    """
 
-    def __init__(self) -> None:
-        # room_id -> {username: WebSocket}
-        self.active_connections: dict[str, dict[str, WebSocket]] = defaultdict(dict)
+    def __init__(
+        self,
+        backplane: Backplane = default_backplane,
+        redis: Redis = redis_client,
+        worker_id: str = WORKER_ID,
+    ) -> None:
+        # room_id -> {username: Outbox} (이 워커에 붙은 피어만)
+        self.active_connections: dict[str, dict[str, Outbox]] = defaultdict(dict)
+        self.backplane = backplane
+        self.redis = redis
+        self.worker_id = worker_id
+        self._pending: set[asyncio.Task] = set()
 
     async def connect(self, websocket: WebSocket, room_id: str, username: str) -> None:
         await websocket.accept()
-        self.active_connections[room_id][username] = websocket
+        outbox = Outbox(websocket, on_evict=lambda evicted: self._evicted(room_id, username, evicted)).start()
+        room = self.active_connections[room_id]
+        previous = room.get(username)
+        room[username] = outbox
+        if previous is not None:
+            previous.evict("replaced by a new connection")
+        await self.backplane.subscribe(_worker_channel(self.worker_id), self._on_direct)
+        await self.backplane.subscribe(_room_channel(room_id), self._on_room_event)
+
+        previous_worker = await self._register(room_id, username)
+        if previous_worker is not None and previous_worker != self.worker_id:
+            # 같은 이름이 다른 워커에 접속해 있으면 그쪽 연결을 끊음 (마지막 접속 우선)
+            await self._publish_direct(previous_worker, {"kind": "kick", "room": room_id, "user": username})
+
+        # 먼저 있던 피어 목록은 본인에게, 입장 알림은 나머지에게
+        peers = [user for user in await self._peers(room_id) if user != username]
+        outbox.send(json.dumps({"type": "peers", "peers": peers}))
+        await self._publish_room(room_id, {"type": "join", "user": username}, exclude=username)
 
-    async def disconnect(self, room_id: str, username: str) -> None:
-        self.active_connections[room_id].pop(username, None)
-        if not self.active_connections[room_id]:
-            self.active_connections.pop(room_id, None)
+    async def disconnect(self, room_id: str, username: str, websocket: WebSocket | None = None) -> None:
+        outbox = self.active_connections.get(room_id, {}).get(username)
+        if outbox is None or (websocket is not None and outbox.websocket is not websocket):
+            return  # 이미 빠졌거나 같은 이름으로 새로 접속한 연결
+        await outbox.aclose()
+        if self._leave(room_id, username, outbox):
+            await self._departed(room_id, username)
+
+    async def relay(self, room_id: str, message: dict, sender: str) -> None:
+        """
+        클라이언트 메시지 중계: "to"가 있으면 해당 피어에게만, 없으면 방 전체
+        """
+        message = {**message, "from": sender}
+        target = message.get("to")
+        if target is None:
+            await self._publish_room(room_id, message, exclude=sender)
+            return
+        if not isinstance(target, str):
+            await self.send_to(room_id, sender, {"type": "error", "detail": "\"to\" must be a username string"})
+            return
+        if await self.send_to(room_id, target, message):
+            return
+        worker = await self._locate(room_id, target)
+        if worker is not None and worker != self.worker_id:
+            await self._publish_direct(
+                worker, {"kind": "message", "room": room_id, "to": target, "message": message}
+            )
+            return
+        await self.send_to(room_id, sender, {"type": "error", "detail": "peer not found", "to": target})
+
+    async def send_to(self, room_id: str, username: str, message: dict) -> bool:
+        """
+        이 워커에 붙은 피어에게 전송
+        """
+        outbox = self.active_connections.get(room_id, {}).get(username)
+        if outbox is None:
+            return False
+        return outbox.send(json.dumps(message))
 
     async def broadcast(self, room_id: str, message: dict, sender: str) -> None:
-        for user, ws in self.active_connections[room_id].items():
-            if user != sender:
-                await ws.send_json(message)
+        await self._publish_room(room_id, message, exclude=sender)
+
+    # heartbeat ~~
+    async def run_heartbeat_loop(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.heartbeat()
+            except RedisError as exc:
+                logger.warning("webrtc registry heartbeat failed: %s", exc)
+            except Exception:
+                logger.exception("webrtc registry heartbeat failed")
+
+    async def heartbeat(self) -> None:
+        """
+        이 워커의 피어 TTL 갱신 후, 로컬 피어가 있는 방의 만료된(유령) 피어 정리
+        """
+        rooms = {room_id: list(room) for room_id, room in self.active_connections.items() if room}
+        if not rooms:
+            return
+        ttl_ms = int(settings.WEBRTC_PEER_TTL_SECONDS * 1000)
+        pipe = self.redis.pipeline(transaction=False)
+        for room_id, users in rooms.items():
+            for user in users:
+                pipe.set(_peer_key(room_id, user), self.worker_id, px=ttl_ms)
+            pipe.sadd(_peers_key(room_id), *users)
+            pipe.pexpire(_peers_key(room_id), ttl_ms)
+        await pipe.execute()
+        for room_id in rooms:
+            await self._peers(room_id)
+    # ~~ heartbeat
+
+    # 백플레인 수신 핸들러 (이 워커의 소켓에만 전달) ~~
+    async def _on_room_event(self, channel: str, payload: str) -> None:
+        room_id = channel[len(ROOM_CHANNEL_PREFIX):]
+        event = json.loads(payload)
+        frame = json.dumps(event["message"])  # 한 번만 직렬화
+        for user, outbox in list(self.active_connections.get(room_id, {}).items()):
+            if user != event.get("exclude"):
+                outbox.send(frame)
+
+    async def _on_direct(self, channel: str, payload: str) -> None:
+        event = json.loads(payload)
+        if event["kind"] == "kick":
+            outbox = self.active_connections.get(event["room"], {}).get(event["user"])
+            if outbox is not None:
+                outbox.evict("replaced by a connection on another worker")
+            return
+        await self.send_to(event["room"], event["to"], event["message"])
+    # ~~ 백플레인 수신 핸들러
+
+    # 레지스트리 ~~
+    async def _register(self, room_id: str, username: str) -> Optional[str]:
+        """
+        레지스트리에 등록하고, 같은 이름으로 등록돼 있던 워커 id를 반환
+        """
+        ttl_ms = int(settings.WEBRTC_PEER_TTL_SECONDS * 1000)
+        try:
+            previous = await self.redis.set(
+                _peer_key(room_id, username), self.worker_id, px=ttl_ms, get=True
+            )
+            await self.redis.sadd(_peers_key(room_id), username)
+            await self.redis.pexpire(_peers_key(room_id), ttl_ms)
+        except RedisError as exc:
+            logger.warning("webrtc registry unavailable: %s", exc)
+            return None
+        return previous
+
+    async def _unregister(self, room_id: str, username: str) -> bool:
+        """
+        이 워커 소유의 등록만 삭제. 실제로 방에서 빠졌으면 True (leave 발행 여부)
+        """
+        key = _peer_key(room_id, username)
+        try:
+            owner = await self.redis.get(key)
+            if owner not in (None, self.worker_id):
+                return False  # 다른 워커에 다시 접속함
+            # GET과 DEL 사이에 다른 워커가 같은 이름으로 등록하는 경우는 그 워커의 다음 heartbeat에서 복구됨
+            await self.redis.delete(key)
+            return bool(await self.redis.srem(_peers_key(room_id), username))
+        except RedisError:
+            return True  # 레지스트리 없이 로컬로만 동작 중
+
+    async def _peers(self, room_id: str) -> list[str]:
+        """
+        방의 살아 있는 피어 목록. TTL이 끝난 유령 피어는 집합에서 빼고 leave를 발행
+        (SREM이 1을 돌려준 워커만 발행하므로 한 번만)
+        """
+        try:
+            members = sorted(await self.redis.smembers(_peers_key(room_id)))
+            owners = await self.redis.mget([_peer_key(room_id, user) for user in members]) if members else []
+            alive = [user for user, owner in zip(members, owners) if owner is not None]
+            for ghost in (user for user, owner in zip(members, owners) if owner is None):
+                if await self.redis.srem(_peers_key(room_id), ghost):
+                    await self._publish_room(room_id, {"type": "leave", "user": ghost})
+        except RedisError:
+            return list(self.active_connections.get(room_id, {}))
+        return alive
+
+    async def _locate(self, room_id: str, username: str) -> Optional[str]:
+        try:
+            return await self.redis.get(_peer_key(room_id, username))
+        except RedisError:
+            return None
+    # ~~ 레지스트리
+
+    # 내부 헬퍼 ~~
+    async def _publish_room(self, room_id: str, message: dict, exclude: Optional[str] = None) -> None:
+        await self.backplane.publish(
+            _room_channel(room_id), json.dumps({"exclude": exclude, "message": message})
+        )
+
+    async def _publish_direct(self, worker_id: str, event: dict) -> None:
+        await self.backplane.publish(_worker_channel(worker_id), json.dumps(event))
+
+    def _leave(self, room_id: str, username: str, outbox: Outbox) -> bool:
+        """
+        로컬 맵에서 제거. 현재 연결이 맞으면 True
+        """
+        room = self.active_connections.get(room_id)
+        if room is None or room.get(username) is not outbox:
+            return False
+        del room[username]
+        if not room:
+            del self.active_connections[room_id]
+            self._spawn(self._unsubscribe_if_empty(room_id))
+        return True
+
+    async def _departed(self, room_id: str, username: str) -> None:
+        if await self._unregister(room_id, username):
+            await self._publish_room(room_id, {"type": "leave", "user": username})
+
+    async def _unsubscribe_if_empty(self, room_id: str) -> None:
+        if room_id not in self.active_connections:  # 그 사이 다시 입장했으면 구독 유지
+            await self.backplane.unsubscribe(_room_channel(room_id), self._on_room_event)
+
+    def _evicted(self, room_id: str, username: str, outbox: Outbox) -> None:
+        if self._leave(room_id, username, outbox):
+            self._spawn(self._departed(room_id, username))
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+    # ~~ 내부 헬퍼
+
+
+def _room_channel(room_id: str) -> str:
+    return f"{ROOM_CHANNEL_PREFIX}{room_id}"
+
+
+def _worker_channel(worker_id: str) -> str:
+    return f"{WORKER_CHANNEL_PREFIX}{worker_id}"
+
+
+def _peers_key(room_id: str) -> str:
+    return f"webrtc:room:{room_id}:peers"
+
+
+def _peer_key(room_id: str, username: str) -> str:
+    return f"webrtc:room:{room_id}:peer:{username}"
+
+
+# 워커(프로세스)당 하나 - 엔드포인트와 lifespan(heartbeat)이 공유
+call_manager = CallManager()
@@ -3,34 +3,194 @@
 # 이게 과연 app/services에 두는 게 적합한가?
 # TODO: 실시간 서비스가 많아지면 나중에 app/realtime 같은 데다가 빼든지 해야 할 듯.
 
-from fastapi import WebSocket
+import json
+import re
 from collections import defaultdict
+from typing import Any, Optional
+
+from fastapi import WebSocket
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
 
+from ..core.config import settings
 from ..core.redis_client import redis_client
+from .backplane import Backplane, backplane as default_backplane
+from .ws_outbox import Outbox
+
+CHANNEL_PREFIX = "chat:room:"  # 방별 pub/sub 채널 (워커 간 전달)
+
+_STREAM_ID = re.compile(r"^\d+-\d+$")
 
 
 class ConnectionManager:
     """
     Manage WebSocket connections per room.
+    메시지는 백플레인에 한 번만 발행하고, 각 워커는 자기에게 붙은 소켓에만 전달함.
+    소켓 전송은 연결별 송신 큐(Outbox)에 넣기만 하므로 느린 클라이언트가 방 전체를 막지 않음.
+
+    기록은 방별 Redis Stream(room:{id}:stream)에 MAXLEN ~ CHAT_HISTORY_MAX_MESSAGES 로 보관.
+    모든 프레임은 JSON:
+    - {"type": "message", "id": "<stream id>", "text": "..."}
+    - {"type": "history", "messages": [...오래된 순...], "has_more": bool}  (입장 시 / load_older 응답)
+    - {"type": "history", "after": "<last_id>", "messages": [...], "truncated": bool}
+      (last_id로 재접속 시 그 뒤 메시지만. truncated면 보관 한도를 넘겨 일부가 이미 삭제됨)
+    구독 후 기록을 읽으므로 기록과 실시간 메시지가 겹칠 수 있음 → 클라이언트는 id로 중복 제거
     """
 
-    def __init__(self) -> None:
-        self.active_connections: dict[str, list[WebSocket]] = defaultdict(list)
+    def __init__(self, backplane: Backplane = default_backplane, redis: Redis = redis_client) -> None:
+        self.active_connections: dict[str, set[Outbox]] = defaultdict(set)
+        self.outboxes: dict[WebSocket, Outbox] = {}
+        self.backplane = backplane
+        self.redis = redis
 
-    async def connect(self, websocket: WebSocket, room_id: str, username: str) -> None:
+    async def connect(
+        self, websocket: WebSocket, room_id: str, username: str, last_id: Optional[str] = None
+    ) -> None:
         await websocket.accept()
-        self.active_connections[room_id].append(websocket)
-        # 과거 메시지 전송
-        history = await redis_client.lrange(f"room:{room_id}:messages", 0, -1)
-        for message in history:
-            await websocket.send_text(message)
+        outbox = Outbox(websocket, on_evict=lambda evicted: self._leave(room_id, evicted)).start()
+        self.outboxes[websocket] = outbox
+        self.active_connections[room_id].add(outbox)
+        if len(self.active_connections[room_id]) == 1:
+            # 이 워커에서 방의 첫 접속자일 때만 구독
+            await self.backplane.subscribe(_channel(room_id), self._deliver)
+        if last_id and _STREAM_ID.match(last_id):
+            # 재접속: 마지막으로 받은 메시지 이후만
+            await self.send_missed(websocket, room_id, last_id)
+        else:
+            # 최근 기록을 한 프레임으로 전송
+            await self.send_history(websocket, room_id)
         await self.send_message(room_id, f"{username} joined!")
 
     async def disconnect(self, websocket: WebSocket, room_id: str, username: str) -> None:
-        self.active_connections[room_id].remove(websocket)
+        outbox = self.outboxes.pop(websocket, None)
+        if outbox is not None:
+            await outbox.aclose()
+            self._leave(room_id, outbox)  # 이미 강제 종료(evict)로 빠졌으면 무시됨
+        if room_id not in self.active_connections:
+            await self.backplane.unsubscribe(_channel(room_id), self._deliver)
         await self.send_message(room_id, f"{username} left!")
 
     async def send_message(self, room_id: str, message: str) -> None:
-        await redis_client.rpush(f"room:{room_id}:messages", message)
-        for connection in self.active_connections[room_id]:
-            await connection.send_text(message)
+        try:
+            message_id = await self.redis.xadd(
+                _stream_key(room_id),
+                {"text": message},
+                maxlen=settings.CHAT_HISTORY_MAX_MESSAGES,
+                approximate=True,  # 노드 단위로 잘라서 XADD 비용을 일정하게
+            )
+        except RedisError:
+            message_id = None  # 기록만 누락, 전달은 계속
+        frame = {"type": "message", "id": message_id, "text": message}
+        await self.backplane.publish(_channel(room_id), json.dumps(frame, ensure_ascii=False))
+
+    # 기록 ~~
+    async def send_history(
+        self,
+        websocket: WebSocket,
+        room_id: str,
+        before: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> None:
+        """
+        before(메시지 id)보다 오래된 메시지를 최대 limit개, 오래된 순으로 한 프레임에 담아 보냄
+        before가 없으면 가장 최근 메시지부터
+        """
+        page_size = settings.CHAT_HISTORY_PAGE_SIZE if limit is None else limit
+        page_size = max(1, min(page_size, settings.CHAT_HISTORY_MAX_PAGE_SIZE))
+        frame: dict[str, Any] = {"type": "history", "messages": [], "has_more": False}
+        if before is not None:
+            frame["before"] = before
+            if not _STREAM_ID.match(before):
+                self._send(websocket, json.dumps({"type": "error", "detail": "invalid before id"}))
+                return
+        try:
+            # 한 개 더 읽어서 더 오래된 기록이 있는지 확인
+            entries = await self.redis.xrevrange(
+                _stream_key(room_id),
+                max=f"({before}" if before else "+",
+                min="-",
+                count=page_size + 1,
+            )
+        except RedisError:
+            entries = []  # Redis 장애 시 기록 없이 입장
+        frame["has_more"] = len(entries) > page_size
+        frame["messages"] = [
+            {"id": entry_id, "text": fields.get("text", "")}
+            for entry_id, fields in reversed(entries[:page_size])
+        ]
+        self._send(websocket, json.dumps(frame, ensure_ascii=False))
+
+    async def send_missed(self, websocket: WebSocket, room_id: str, last_id: str) -> None:
+        """
+        last_id 이후 메시지(보관 중인 것 전부, 최대 CHAT_HISTORY_MAX_MESSAGES 근처)를 한 프레임으로 보냄
+        """
+        key = _stream_key(room_id)
+        try:
+            entries = await self.redis.xrange(
+                key, min=f"({last_id}", max="+", count=settings.CHAT_HISTORY_MAX_MESSAGES
+            )
+            truncated = await self._trimmed_after(key, last_id)
+        except RedisError:
+            entries, truncated = [], False
+        frame = {
+            "type": "history",
+            "after": last_id,
+            "messages": [{"id": entry_id, "text": fields.get("text", "")} for entry_id, fields in entries],
+            "truncated": truncated,
+        }
+        self._send(websocket, json.dumps(frame, ensure_ascii=False))
+
+    async def _trimmed_after(self, key: str, last_id: str) -> bool:
+        """
+        last_id 이후 메시지 중 MAXLEN으로 잘려 나간 게 있는지
+        (last_id 자체만 잘리고 바로 다음 메시지가 남아 있으면 놓친 게 없음)
+        """
+        # last_id 또는 그 이전 메시지가 아직 있으면, 그 뒤는 하나도 잘리지 않음 (오래된 것부터 잘리므로)
+        if await self.redis.xrevrange(key, max=last_id, min="-", count=1):
+            return False
+        try:
+            info = await self.redis.xinfo_stream(key)
+        except ResponseError:
+            return False  # 스트림 없음 (기록이 한 번도 없었음)
+        max_deleted = info.get("max-deleted-entry-id")
+        if max_deleted is not None:
+            # Redis 7+: 지금까지 잘려 나간 가장 큰 id가 last_id보다 뒤면 놓친 메시지가 있음
+            return _id_key(max_deleted) > _id_key(last_id)
+        # Redis 7 미만: 가장 오래 보관 중인 메시지가 last_id보다 뒤면 잘렸을 수 있음 (보수적으로 판단)
+        first_entry = info.get("first-entry")
+        return bool(first_entry) and _id_key(first_entry[0]) > _id_key(last_id)
+    # ~~ 기록
+
+    async def _deliver(self, channel: str, frame: str) -> None:
+        """
+        백플레인 수신 핸들러: 이 워커의 로컬 소켓 송신 큐에 넣기만 함 (await 없음)
+        """
+        room_id = channel[len(CHANNEL_PREFIX):]
+        for outbox in list(self.active_connections.get(room_id, ())):
+            outbox.send(frame)
+
+    def _send(self, websocket: WebSocket, frame: str) -> None:
+        outbox = self.outboxes.get(websocket)
+        if outbox is not None:
+            outbox.send(frame)
+
+    def _leave(self, room_id: str, outbox: Outbox) -> None:
+        room = self.active_connections.get(room_id)
+        if room is None:
+            return
+        room.discard(outbox)
+        if not room:
+            del self.active_connections[room_id]
+
+
+def _channel(room_id: str) -> str:
+    return f"{CHANNEL_PREFIX}{room_id}"
+
+
+def _stream_key(room_id: str) -> str:
+    return f"room:{room_id}:stream"
+
+
+def _id_key(stream_id: str) -> tuple[int, int]:
+    milliseconds, sequence = stream_id.split("-")
+    return int(milliseconds), int(sequence)
@@ -0,0 +1,105 @@
+# app/services/ws_outbox.py
+
+"""
+WebSocket 연결별 송신 큐 (채팅 / WebRTC 시그널링 공용)
+
+- 브로드캐스트는 send()로 큐에 넣기만 함 (await 없음) → 느린 클라이언트 하나가 방 전체를 막지 않음
+- 연결마다 전용 writer 태스크가 큐를 비우며 실제로 전송
+- 큐가 가득 차거나(WS_SEND_QUEUE_SIZE) 한 프레임 전송이 WS_SEND_TIMEOUT_SECONDS를 넘기면
+  느린 소비자로 보고 연결을 끊음 (close code 1013 Try Again Later)
+- 같은 소켓에 대한 전송은 writer 하나에서만 일어나므로 프레임 순서가 보장됨
+"""
+
+import asyncio
+import logging
+from typing import Callable, Optional
+
+from fastapi import WebSocket
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SLOW_CONSUMER_CLOSE_CODE = 1013  # Try Again Later
+
+
+class Outbox:
+    def __init__(
+        self,
+        websocket: WebSocket,
+        *,
+        on_evict: Optional[Callable[["Outbox"], None]] = None,
+        max_queue: Optional[int] = None,
+        send_timeout: Optional[float] = None,
+    ) -> None:
+        self.websocket = websocket
+        self.closed = False
+        self._on_evict = on_evict
+        self._send_timeout = settings.WS_SEND_TIMEOUT_SECONDS if send_timeout is None else send_timeout
+        self._queue: asyncio.Queue[str] = asyncio.Queue(
+            maxsize=settings.WS_SEND_QUEUE_SIZE if max_queue is None else max_queue
+        )
+        self._writer: Optional[asyncio.Task] = None
+        self._closer: Optional[asyncio.Task] = None
+
+    def start(self) -> "Outbox":
+        self._writer = asyncio.create_task(self._run())
+        return self
+
+    def send(self, frame: str) -> bool:
+        """
+        전송 예약 (블로킹 없음). 이미 끊겼거나 큐가 넘쳐서 끊으면 False
+        """
+        if self.closed:
+            return False
+        try:
+            self._queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.evict("send queue overflow")
+            return False
+        return True
+
+    def evict(self, reason: str) -> None:
+        """
+        느린 소비자 강제 종료: 멤버십에서 즉시 빼고(on_evict) 소켓 닫기는 백그라운드로
+        """
+        if self.closed:
+            return
+        self.closed = True
+        logger.warning("closing websocket connection: %s", reason)
+        if self._on_evict is not None:
+            self._on_evict(self)
+        self._closer = asyncio.create_task(self._close_socket())
+
+    async def aclose(self) -> None:
+        """
+        정상 종료(클라이언트가 나감) 시 writer 정리
+        """
+        self.closed = True
+        if self._writer is not None:
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+
+    async def _run(self) -> None:
+        # wait_for는 안쪽 전송이 막 끝난 순간 들어온 cancel()을 삼킬 수 있으므로(3.11 이하)
+        # closed도 확인해서 aclose()가 writer를 기다리다 멈추지 않게 함
+        while not self.closed:
+            frame = await self._queue.get()
+            try:
+                await asyncio.wait_for(self.websocket.send_text(frame), self._send_timeout)
+            except asyncio.TimeoutError:
+                self.evict("send timed out")
+                return
+            except Exception as exc:
+                self.evict(f"send failed: {exc!r}")
+                return
+
+    async def _close_socket(self) -> None:
+        if self._writer is not None and not self._writer.done():
+            self._writer.cancel()
+        try:
+            await asyncio.wait_for(
+                self.websocket.close(code=SLOW_CONSUMER_CLOSE_CODE), self._send_timeout
+            )
+        except Exception:
+            pass  # 이미 끊긴 소켓
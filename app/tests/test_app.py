@@ -1,7 +1,22 @@
+import asyncio
+import fnmatch
+import hashlib
+import io
+import json
 import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError, ResponseError
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker
+from passlib.context import CryptContext
 
 from app.core.config import settings
 
@@ -14,9 +29,41 @@ if os.path.exists("./test.db"):
     os.remove("./test.db")
 
 from app.db.base import Base
+from app.core import metrics
+from app.core.body_limit import BodySizeLimitMiddleware
 from app.main import app
 from app.api.deps import get_db
+from app.db import pool_metrics, query_profiler
+from app.db.pool_metrics import TimedQueuePool
 from app.db.models.board import Board
+from app.db.models.file import File
+from app.db.models.file_blob import FileBlob
+from app.db.models.file_variant import FileVariant
+from app.db.models.post import Post
+from app.db.models.user import User
+from app.schemas.post import PostOut
+from app.crud import comment as comment_crud
+from app.services import post_cache
+from app.services.board_counters import reconcile_post_counts
+from app.services import auth as auth_service
+from app.services.password_hasher import PasswordHasher
+from app.db.models.upload_session import UploadSession
+from app.services import image_variants, storage_backends
+from app.services import storage as storage_module
+from app.services.backplane import Backplane
+from app.services.webrtc import CallManager
+from app.services.websocket import ConnectionManager
+from app.services.ws_outbox import SLOW_CONSUMER_CLOSE_CODE, Outbox
+from app.services.storage_backends import LocalStorageBackend, S3StorageBackend
+from app.services.storage_layout import migrate_layout
+from app.services.storage import (
+    STAGING_DIR,
+    UPLOAD_DIR,
+    collect_expired_upload_sessions,
+    collect_unreferenced_blobs,
+)
+from app.utils.file_response import ConditionalFileResponse
+from app.utils.ttl_cache import TTLCache
 
 # Use SQLite database for testing
 TEST_ENGINE = create_engine(
@@ -65,6 +112,13 @@ def signup_and_login(username="alice"):
     return r.json()["access_token"]
 
 
+async def wait_until(condition, attempts=200):
+    for _ in range(attempts):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met")
+
 def test_signup_login_me():
     token = signup_and_login()
     headers = {"Authorization": f"Bearer {token}"}
@@ -146,3 +200,1861 @@ def test_post_with_file():
     assert len(data["files"]) == 1
     assert data["files"][0]["id"] == file_id
     assert data["files"][0]["url"] == f"/api/v1/files/{file_id}/download"
+
+
+def test_upload_streams_checksum_and_enforces_limit(monkeypatch):
+    token = signup_and_login("upload_limit_user")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with TestingSessionLocal() as db:
+        board = create_board(db, name="uploadlimitboard")
+        board_id = board.id
+
+    r = client.post(
+        f"/api/v1/posts/boards/{board_id}/posts",
+        json={"title": "upload", "content": "limit", "board_id": board_id},
+        headers=headers,
+    )
+    post_id = r.json()["id"]
+
+    # 청크 경계를 넘는 업로드: 크기·체크섬 기록, 임시 파일 없음
+    payload = os.urandom(1024 * 1024 + 123)
+    r = client.post(
+        f"/api/v1/posts/{post_id}/files",
+        files={"file": ("big.bin", payload, "application/octet-stream")},
+        headers=headers,
+    )
+    assert r.status_code == 201
+    assert r.json()["size"] == len(payload)
+    with TestingSessionLocal() as db:
+        meta = db.get(File, r.json()["id"])
+        assert meta.checksum == hashlib.sha256(payload).hexdigest()
+    assert not list(STAGING_DIR.glob("*.part"))
+
+    # 한도 초과: 413, 디스크·DB에 아무것도 남지 않음
+    monkeypatch.setattr(settings, "MAX_UPLOAD_MB", 1)
+    before = set(UPLOAD_DIR.iterdir())
+    r = client.post(
+        f"/api/v1/posts/{post_id}/files",
+        files={"file": ("too_big.bin", payload, "application/octet-stream")},
+        headers=headers,
+    )
+    assert r.status_code == 413
+    assert set(UPLOAD_DIR.iterdir()) == before
+    with TestingSessionLocal() as db:
+        assert db.query(File).filter(File.post_id == post_id).count() == 1
+
+
+def test_upload_dedup_shares_blob_until_last_reference():
+    token = signup_and_login("dedup_user")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with TestingSessionLocal() as db:
+        board = create_board(db, name="dedupboard")
+        board_id = board.id
+
+    post_ids = []
+    for title in ("a", "b", "c"):
+        r = client.post(
+            f"/api/v1/posts/boards/{board_id}/posts",
+            json={"title": title, "content": "dedup", "board_id": board_id},
+            headers=headers,
+        )
+        post_ids.append(r.json()["id"])
+
+    payload = os.urandom(4096)
+    file_ids = []
+    for post_id in post_ids:
+        r = client.post(
+            f"/api/v1/posts/{post_id}/files",
+            files={"file": ("same.png", payload, "image/png")},
+            headers=headers,
+        )
+        assert r.status_code == 201
+        file_ids.append(r.json()["id"])
+
+    checksum = hashlib.sha256(payload).hexdigest()
+    with TestingSessionLocal() as db:
+        blob = db.query(FileBlob).filter(FileBlob.sha256 == checksum).one()
+        assert blob.ref_count == 3
+        keys = {f.object_key for f in db.query(File).filter(File.id.in_(file_ids))}
+        assert keys == {blob.object_key}
+        blob_path = blob.object_key
+    assert os.path.exists(blob_path)
+
+    # 다른 참조가 남아 있으면 디스크 파일 유지
+    assert client.delete(f"/api/v1/files/{file_ids[0]}", headers=headers).status_code == 204
+    assert os.path.exists(blob_path)
+    assert client.get(f"/api/v1/files/{file_ids[1]}/download").content == payload
+
+    # 게시글 삭제(첨부 CASCADE)는 참조 수만 내리고, 정리 작업이 디스크까지 삭제
+    r = client.delete(f"/api/v1/posts/boards/{board_id}/posts/{post_ids[1]}", headers=headers)
+    assert r.status_code == 204
+    with TestingSessionLocal() as db:
+        assert db.get(FileBlob, blob.id).ref_count == 1
+        assert collect_unreferenced_blobs(db) == 0
+    assert os.path.exists(blob_path)
+
+    # 마지막 참조 삭제 시 blob 행과 파일 삭제
+    assert client.delete(f"/api/v1/files/{file_ids[2]}", headers=headers).status_code == 204
+    assert not os.path.exists(blob_path)
+    with TestingSessionLocal() as db:
+        assert db.get(FileBlob, blob.id) is None
+
+    # 게시글 삭제로 마지막 참조가 끊긴 blob은 정리 작업이 삭제
+    other = os.urandom(2048)
+    r = client.post(
+        f"/api/v1/posts/{post_ids[0]}/files",
+        files={"file": ("other.bin", other, "application/octet-stream")},
+        headers=headers,
+    )
+    with TestingSessionLocal() as db:
+        other_path = Path(db.get(File, r.json()["id"]).object_key)
+    assert other_path.exists()
+    r = client.delete(f"/api/v1/posts/boards/{board_id}/posts/{post_ids[0]}", headers=headers)
+    assert r.status_code == 204
+    with TestingSessionLocal() as db:
+        assert collect_unreferenced_blobs(db) == 1
+    assert not other_path.exists()
+
+
+def test_resumable_chunked_upload():
+    token = signup_and_login("resume_user")
+    headers = {"Authorization": f"Bearer {token}"}
+    other_headers = {"Authorization": f"Bearer {signup_and_login('resume_other')}"}
+
+    with TestingSessionLocal() as db:
+        board = create_board(db, name="resumeboard")
+        board_id = board.id
+
+    r = client.post(
+        f"/api/v1/posts/boards/{board_id}/posts",
+        json={"title": "resume", "content": "chunks", "board_id": board_id},
+        headers=headers,
+    )
+    post_id = r.json()["id"]
+    payload = os.urandom(10_000)
+
+    r = client.post(
+        f"/api/v1/posts/{post_id}/uploads",
+        json={"filename": "movie.mp4", "content_type": "video/mp4", "size": len(payload)},
+        headers=headers,
+    )
+    assert r.status_code == 201
+    upload_id = r.json()["id"]
+    assert r.json()["offset"] == 0
+    base = f"/api/v1/uploads/{upload_id}"
+
+    r = client.put(f"{base}?offset=0", content=payload[:4000], headers=headers)
+    assert r.status_code == 200
+    assert r.json()["offset"] == 4000
+
+    # 잘못된 offset / 남의 세션 / 미완료 확정
+    r = client.put(f"{base}?offset=0", content=payload[:4000], headers=headers)
+    assert r.status_code == 409
+    assert r.headers["upload-offset"] == "4000"
+    assert client.get(base, headers=other_headers).status_code == 403
+    assert client.post(f"{base}/complete", headers=headers).status_code == 409
+
+    # 재개: GET으로 offset 확인 후 이어서 전송
+    offset = client.get(base, headers=headers).json()["offset"]
+    r = client.put(f"{base}?offset={offset}", content=payload[offset:], headers=headers)
+    assert r.json()["offset"] == len(payload)
+
+    r = client.post(f"{base}/complete", headers=headers)
+    assert r.status_code == 201
+    assert r.json()["size"] == len(payload)
+    assert client.get(r.json()["url"]).content == payload
+    assert not (STAGING_DIR / f"{upload_id}.part").exists()
+    assert client.get(base, headers=headers).status_code == 404
+
+    # 선언한 크기 초과 / 만료 세션 정리
+    r = client.post(
+        f"/api/v1/posts/{post_id}/uploads",
+        json={"filename": "small.bin", "size": 10},
+        headers=headers,
+    )
+    small_id = r.json()["id"]
+    r = client.put(f"/api/v1/uploads/{small_id}?offset=0", content=b"x" * 11, headers=headers)
+    assert r.status_code == 413
+
+    with TestingSessionLocal() as db:
+        db.get(UploadSession, small_id).expires_at = datetime(2000, 1, 1)
+        db.commit()
+        assert collect_expired_upload_sessions(db) == 1
+        assert db.get(UploadSession, small_id) is None
+    assert not (STAGING_DIR / f"{small_id}.part").exists()
+
+
+def test_resumable_upload_completion_failure_removes_staging_file(monkeypatch):
+    token = signup_and_login("resume_fail_user")
+    headers = {"Authorization": f"Bearer {token}"}
+    with TestingSessionLocal() as db:
+        board_id = create_board(db, name="resumefailboard").id
+    post_id = client.post(
+        f"/api/v1/posts/boards/{board_id}/posts",
+        json={"title": "resume", "content": "fail", "board_id": board_id},
+        headers=headers,
+    ).json()["id"]
+
+    payload = os.urandom(1_000)
+    upload_id = client.post(
+        f"/api/v1/posts/{post_id}/uploads",
+        json={"filename": "broken.bin", "size": len(payload)},
+        headers=headers,
+    ).json()["id"]
+    client.put(f"/api/v1/uploads/{upload_id}?offset=0", content=payload, headers=headers)
+
+    # 세션 행을 claim 한 뒤 메타데이터 기록 단계에서 실패
+    def broken(*args, **kwargs):
+        raise HTTPException(status_code=500, detail="metadata insert failed")
+
+    monkeypatch.setattr(storage_module.file_crud, "acquire_blob", broken)
+    monkeypatch.setattr(storage_module.file_crud, "create_file_meta", broken)
+    r = client.post(f"/api/v1/uploads/{upload_id}/complete", headers=headers)
+    assert r.status_code == 500
+    assert not (STAGING_DIR / f"{upload_id}.part").exists()
+
+
+class FakeS3Client:
+    """
+    S3StorageBackend가 쓰는 boto3 S3 클라이언트 메서드만 흉내 낸 프로세스 내 가짜
+    """
+
+    def __init__(self):
+        self.objects = {}
+
+    def upload_file(self, Filename, Bucket, Key, ExtraArgs=None):
+        with open(Filename, "rb") as f:
+            self.objects[(Bucket, Key)] = (f.read(), (ExtraArgs or {}).get("ContentType"))
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+    def list_objects_v2(self, Bucket, Prefix, MaxKeys):
+        keys = sorted(k for b, k in self.objects if b == Bucket and k.startswith(Prefix))
+        return {"Contents": [{"Key": k} for k in keys[:MaxKeys]]}
+
+    def get_object(self, Bucket, Key):
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)][0])}
+
+    def generate_presigned_url(self, operation, Params, ExpiresIn):
+        return f"https://s3.test/{Params['Bucket']}/{Params['Key']}?expires={ExpiresIn}"
+
+
+def test_s3_backend_upload_presigned_download_and_delete(monkeypatch):
+    fake = FakeS3Client()
+    monkeypatch.setattr(
+        storage_backends, "_backend", S3StorageBackend("media", prefix="att", client=fake)
+    )
+    token = signup_and_login("s3_user")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with TestingSessionLocal() as db:
+        board = create_board(db, name="s3board")
+        board_id = board.id
+
+    r = client.post(
+        f"/api/v1/posts/boards/{board_id}/posts",
+        json={"title": "s3", "content": "remote", "board_id": board_id},
+        headers=headers,
+    )
+    post_id = r.json()["id"]
+    payload = os.urandom(3000)
+    r = client.post(
+        f"/api/v1/posts/{post_id}/files",
+        files={"file": ("doc.pdf", payload, "application/pdf")},
+        headers=headers,
+    )
+    assert r.status_code == 201
+    file_id = r.json()["id"]
+    [(bucket, key)] = fake.objects
+    assert bucket == "media" and key.startswith("att/blobs/")
+    assert fake.objects[(bucket, key)] == (payload, "application/pdf")
+    assert not list(STAGING_DIR.glob("*.part"))
+
+    # presigned URL로 redirect → 바이트가 API를 거치지 않음
+    r = client.get(f"/api/v1/files/{file_id}/download", follow_redirects=False)
+    assert r.status_code == 307
+    assert r.headers["location"].startswith(f"https://s3.test/media/{key}")
+
+    # presigned 끄면 저장소에서 읽어 스트리밍
+    monkeypatch.setattr(settings, "STORAGE_PRESIGNED_DOWNLOADS", False)
+    r = client.get(f"/api/v1/files/{file_id}/download")
+    assert r.status_code == 200
+    assert r.content == payload
+    assert r.headers["etag"] == f'"{hashlib.sha256(payload).hexdigest()}"'
+
+    assert client.delete(f"/api/v1/files/{file_id}", headers=headers).status_code == 204
+    assert fake.objects == {}
+
+
+def test_s3_backend_against_moto(tmp_path):
+    moto = pytest.importorskip("moto")
+    boto3 = pytest.importorskip("boto3")
+
+    with moto.mock_aws():
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket="media")
+        backend = S3StorageBackend("media", prefix="att", client=s3)
+
+        src = tmp_path / "upload.part"
+        src.write_bytes(b"hello s3")
+        key = backend.key_for("blobs/abc")
+        backend.put_file(src, key, "text/plain")
+
+        assert not src.exists()
+        assert backend.exists(key)
+        assert b"".join(backend.iter_chunks(key)) == b"hello s3"
+        assert key in backend.presigned_url(
+            key, filename="a.txt", content_type="text/plain", expires_in=60
+        )
+        backend.delete(key)
+        assert not backend.exists(key)
+
+
+def test_storage_layout_migration_to_fanout(monkeypatch):
+    token = signup_and_login("layout_user")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with TestingSessionLocal() as db:
+        board = create_board(db, name="layoutboard")
+        board_id = board.id
+
+    post_ids = []
+    for title in ("a", "b"):
+        r = client.post(
+            f"/api/v1/posts/boards/{board_id}/posts",
+            json={"title": title, "content": "layout", "board_id": board_id},
+            headers=headers,
+        )
+        post_ids.append(r.json()["id"])
+
+    # 평면 레이아웃으로 저장: blob 공유 2개 + blob 없는 파일 1개
+    monkeypatch.setattr(storage_backends, "_backend", LocalStorageBackend(UPLOAD_DIR, 0))
+    shared, plain = os.urandom(1500), os.urandom(1600)
+    file_ids = []
+    for post_id in post_ids:
+        r = client.post(
+            f"/api/v1/posts/{post_id}/files",
+            files={"file": ("shared.jpg", shared, "image/jpeg")},
+            headers=headers,
+        )
+        file_ids.append(r.json()["id"])
+    monkeypatch.setattr(settings, "FILE_DEDUP_ENABLED", False)
+    r = client.post(
+        f"/api/v1/posts/{post_ids[0]}/files",
+        files={"file": ("plain.txt", plain, "text/plain")},
+        headers=headers,
+    )
+    file_ids.append(r.json()["id"])
+
+    with TestingSessionLocal() as db:
+        old_keys = [db.get(File, file_id).object_key for file_id in file_ids]
+    assert all(Path(key).parent in (UPLOAD_DIR, UPLOAD_DIR / "blobs") for key in old_keys)
+
+    sharded = LocalStorageBackend(UPLOAD_DIR, 2)
+    monkeypatch.setattr(storage_backends, "_backend", sharded)
+    with TestingSessionLocal() as db:
+        stats = migrate_layout(db, sharded, batch_size=1, grace_seconds=0)
+        assert stats.conflicts == 0 and stats.missing == 0
+        new_keys = [db.get(File, file_id).object_key for file_id in file_ids]
+        blob = db.get(FileBlob, db.get(File, file_ids[0]).blob_id)
+
+    assert new_keys[0] == new_keys[1] == blob.object_key
+    for old_key, new_key in zip(old_keys, new_keys):
+        assert sharded.is_sharded(new_key)
+        assert Path(new_key).name == Path(old_key).name
+        assert not Path(old_key).exists()
+    assert client.get(f"/api/v1/files/{file_ids[1]}/download").content == shared
+    assert client.get(f"/api/v1/files/{file_ids[2]}/download").content == plain
+
+    # 다시 실행해도 옮길 것이 없음
+    with TestingSessionLocal() as db:
+        assert migrate_layout(db, sharded, grace_seconds=0).moved == 0
+
+
+def test_download_conditional_and_range():
+    token = signup_and_login("range_user")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with TestingSessionLocal() as db:
+        board = create_board(db, name="rangeboard")
+        board_id = board.id
+
+    r = client.post(
+        f"/api/v1/posts/boards/{board_id}/posts",
+        json={"title": "range", "content": "video", "board_id": board_id},
+        headers=headers,
+    )
+    post_id = r.json()["id"]
+    payload = bytes(range(256)) * 40
+    r = client.post(
+        f"/api/v1/posts/{post_id}/files",
+        files={"file": ("clip.mp4", payload, "video/mp4")},
+        headers=headers,
+    )
+    url = r.json()["url"]
+
+    r = client.get(url)
+    assert r.status_code == 200
+    assert r.content == payload
+    etag = r.headers["etag"]
+    assert etag == f'"{hashlib.sha256(payload).hexdigest()}"'
+    assert r.headers["accept-ranges"] == "bytes"
+
+    # 조건부 GET
+    r = client.get(url, headers={"If-None-Match": f'"other", W/{etag}'})
+    assert r.status_code == 304
+    assert r.headers["etag"] == etag
+    assert r.content == b""
+    r = client.get(url, headers={"If-Modified-Since": r.headers["last-modified"]})
+    assert r.status_code == 304
+    assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+
+    # 단일 / 다중 Range, If-Range
+    r = client.get(url, headers={"Range": "bytes=100-199"})
+    assert r.status_code == 206
+    assert r.content == payload[100:200]
+    assert r.headers["content-range"] == f"bytes 100-199/{len(payload)}"
+
+    r = client.get(url, headers={"Range": "bytes=0-9,-10"})
+    assert r.status_code == 206
+    assert r.headers["content-type"].startswith("multipart/byteranges; boundary=")
+    assert "content-range" not in r.headers
+    assert payload[:10] in r.content and payload[-10:] in r.content
+
+    r = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert r.status_code == 200
+    assert r.content == payload
+
+
+def test_image_variant_download_and_bounded_queue(monkeypatch):
+    token = signup_and_login("variant_user")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with TestingSessionLocal() as db:
+        board = create_board(db, name="variantboard")
+        board_id = board.id
+
+    r = client.post(
+        f"/api/v1/posts/boards/{board_id}/posts",
+        json={"title": "photo", "content": "img", "board_id": board_id},
+        headers=headers,
+    )
+    post_id = r.json()["id"]
+    original = b"\x89PNG fake image bytes"
+    r = client.post(
+        f"/api/v1/posts/{post_id}/files",
+        files={"file": ("photo.png", original, "image/png")},
+        headers=headers,
+    )
+    image_id = r.json()["id"]
+    r = client.post(
+        f"/api/v1/posts/{post_id}/files",
+        files={"file": ("notes.txt", b"plain", "text/plain")},
+        headers=headers,
+    )
+    text_id = r.json()["id"]
+
+    # 파생본 행을 직접 넣음 (렌더링은 Pillow가 필요하므로 여기서는 서빙 경로만)
+    thumb = b"thumbnail bytes"
+    with TestingSessionLocal() as db:
+        object_key = db.get(File, image_id).object_key
+        thumb_key = f"{object_key}.{image_id}.thumb.jpg"
+        Path(thumb_key).write_bytes(thumb)
+        db.add(
+            FileVariant(
+                file_id=image_id, name="thumb", object_key=thumb_key, content_type="image/jpeg",
+                size=len(thumb), width=32, height=32, checksum=hashlib.sha256(thumb).hexdigest(),
+            )
+        )
+        db.commit()
+
+    r = client.get(f"/api/v1/files/{image_id}/download", params={"variant": "thumb"})
+    assert r.status_code == 200
+    assert r.content == thumb
+    assert r.headers["content-type"] == "image/jpeg"
+    assert "photo_thumb.jpg" in r.headers["content-disposition"]
+    # 아직 없는 파생본은 원본으로 대체, 이미지가 아니면 404
+    r = client.get(f"/api/v1/files/{image_id}/download", params={"variant": "preview"})
+    assert r.status_code == 200
+    assert r.content == original
+    assert client.get(f"/api/v1/files/{text_id}/download", params={"variant": "thumb"}).status_code == 404
+    assert client.get(f"/api/v1/files/{image_id}/download", params={"variant": "huge"}).status_code == 422
+
+    # 원본 삭제 시 파생본 객체도 삭제
+    assert client.delete(f"/api/v1/files/{image_id}", headers=headers).status_code == 204
+    assert not Path(thumb_key).exists()
+    with TestingSessionLocal() as db:
+        assert db.query(FileVariant).filter(FileVariant.file_id == image_id).count() == 0
+
+    # 큐가 가득 차면 버림 (업로드 요청은 기다리지 않음)
+    monkeypatch.setattr(image_variants.image_render, "AVAILABLE", True)
+    pipeline = image_variants.ImageVariantPipeline(workers=1, queue_size=1)
+
+    async def scenario():
+        assert not pipeline.schedule(1, "image/png")  # 시작 전
+        await pipeline.start()
+        try:
+            assert not pipeline.schedule(1, "text/plain")
+            assert not pipeline.schedule(1, "image/svg+xml")
+            assert pipeline.schedule(1, "image/png")
+            assert not pipeline.schedule(2, "image/jpeg")
+        finally:
+            await pipeline.stop()
+
+    asyncio.run(scenario())
+
+
+def test_image_variant_pipeline_renders_thumbnails(monkeypatch):
+    from PIL import Image  # requirements.txt - 없으면 스킵하지 않고 실패
+
+    monkeypatch.setattr(image_variants, "SessionLocal", TestingSessionLocal)
+
+    token = signup_and_login("render_user")
+    headers = {"Authorization": f"Bearer {token}"}
+    with TestingSessionLocal() as db:
+        board = create_board(db, name="renderboard")
+        board_id = board.id
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (2000, 1000), (200, 30, 30)).save(buffer, "JPEG")
+
+    with TestClient(app) as live:  # lifespan에서 파이프라인 시작
+        r = live.post(
+            f"/api/v1/posts/boards/{board_id}/posts",
+            json={"title": "render", "content": "img", "board_id": board_id},
+            headers=headers,
+        )
+        post_id = r.json()["id"]
+        r = live.post(
+            f"/api/v1/posts/{post_id}/files",
+            files={"file": ("wide.jpg", buffer.getvalue(), "image/jpeg")},
+            headers=headers,
+        )
+        file_id = r.json()["id"]
+
+        async def drain():
+            await image_variants.pipeline._queue.join()
+
+        live.portal.call(drain)
+
+        with TestingSessionLocal() as db:
+            variants = {v.name: v for v in db.query(FileVariant).filter(FileVariant.file_id == file_id)}
+        assert set(variants) == set(image_variants.VARIANT_SIZES)
+        assert (variants["thumb"].width, variants["thumb"].height) == (320, 160)
+        assert (variants["preview"].width, variants["preview"].height) == (1280, 640)
+
+        r = live.get(f"/api/v1/files/{file_id}/download", params={"variant": "thumb"})
+        assert r.status_code == 200
+        assert Image.open(io.BytesIO(r.content)).size == (320, 160)
+
+        # 게시글 삭제 시 첨부 파일의 파생본 객체와 행도 삭제
+        variant_keys = [v.object_key for v in variants.values()]
+        assert all(Path(key).exists() for key in variant_keys)
+        assert live.delete(f"/api/v1/posts/boards/{board_id}/posts/{post_id}", headers=headers).status_code == 204
+        assert not any(Path(key).exists() for key in variant_keys)
+        with TestingSessionLocal() as db:
+            assert db.query(FileVariant).filter(FileVariant.file_id == file_id).count() == 0
+
+
+def test_route_metrics_and_multiprocess_aggregation(monkeypatch, tmp_path):
+    def sample(text, name, **labels):
+        ordered = {name: labels[name] for name in ("method", "route", "status", "le") if name in labels}
+        wanted = metrics._labels(**ordered)
+        for line in text.splitlines():
+            if line.startswith(f"{name}{wanted} "):
+                return float(line.rsplit(" ", 1)[1])
+        return 0.0
+
+    route = "/api/v1/posts/boards/{board_id}/posts/{post_id}"
+    before = client.get("/metrics").text
+    for post_id in (987001, 987002):
+        assert client.get(f"/api/v1/posts/boards/1/posts/{post_id}").status_code == 404
+    client.get("/no/such/path")
+    text = client.get("/metrics").text
+    assert text.count("# TYPE http_request_duration_seconds histogram") == 1
+
+    # 실제 경로가 아니라 라우트 템플릿 단위로 집계
+    assert "/api/v1/posts/boards/1/posts/987001" not in text
+    labels = {"method": "GET", "route": route}
+    assert sample(text, "http_requests_total", status="404", **labels) - sample(
+        before, "http_requests_total", status="404", **labels
+    ) == 2
+    assert sample(text, "http_request_duration_seconds_count", **labels) - sample(
+        before, "http_request_duration_seconds_count", **labels
+    ) == 2
+    assert sample(text, "http_request_duration_seconds_bucket", le="+Inf", **labels) == sample(
+        text, "http_request_duration_seconds_count", **labels
+    )
+    assert sample(text, "http_requests_total", method="GET", route="<unmatched>", status="404") >= 1
+    assert "http_requests_in_progress 1" in text  # /metrics 요청 자신
+
+    # 여러 워커: 디렉터리의 스냅샷을 합산 (종료된 워커의 gauge는 제외)
+    import subprocess
+    import sys
+
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    other = metrics.RequestMetrics()
+    other.observe("GET", route, 200, 0.02)
+    other.observe("GET", route, 200, 30.0)
+    other.in_progress = 7
+    (tmp_path / f"metrics-{dead.pid}.json").write_text(json.dumps({**other.snapshot(), "pid": dead.pid}))
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", tmp_path)
+
+    local_ok = sample(text, "http_requests_total", status="200", **labels)
+    text = client.get("/metrics").text
+    assert (tmp_path / f"metrics-{os.getpid()}.json").exists()
+    assert sample(text, "http_requests_total", status="200", **labels) == local_ok + 2
+    assert sample(text, "http_request_duration_seconds_bucket", le="0.025", **labels) >= 1
+    assert sample(text, "http_request_duration_seconds_bucket", le="10.0", **labels) < sample(
+        text, "http_request_duration_seconds_bucket", le="+Inf", **labels
+    )
+    assert "http_requests_in_progress 1" in text
+
+
+def test_download_zerocopy_send(tmp_path):
+    path = tmp_path / "blob.bin"
+    path.write_bytes(b"0123456789")
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.zerocopysend":
+            file = message["file"]
+            message = {**message, "data": os.pread(file.fileno(), message["count"], message["offset"])}
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "headers": [(b"range", b"bytes=2-5")],
+        "extensions": {"http.response.zerocopysend": {}},
+    }
+    asyncio.run(ConditionalFileResponse(path, checksum="abc")(scope, receive, send))
+
+    assert messages[0]["status"] == 206
+    assert (b"etag", b'"abc"') in messages[0]["headers"]
+    assert messages[1]["type"] == "http.response.zerocopysend"
+    assert messages[1]["data"] == b"2345"
+    assert messages[1]["more_body"] is False
+
+
+def test_body_size_limit_middleware():
+    received = []
+
+    async def echo_app(scope, receive, send):
+        while True:
+            message = await receive()
+            received.append(len(message.get("body", b"")))
+            if not message.get("more_body"):
+                break
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    limited = TestClient(BodySizeLimitMiddleware(echo_app, max_bytes=10))
+
+    assert limited.post("/", content=b"x" * 10).status_code == 200
+    # Content-Length로 바로 거절: 바디를 읽지 않음
+    received.clear()
+    assert limited.post("/", content=b"x" * 11).status_code == 413
+    assert received == []
+
+    # Content-Length 없는(chunked) 스트림도 한도 초과 시점에 중단
+    def chunks():
+        yield b"x" * 6
+        yield b"x" * 6
+
+    r = limited.post("/", content=chunks())
+    assert r.status_code == 413
+
+
+def test_list_posts_cursor_pagination():
+    signup_and_login("cursor_user")
+
+    with TestingSessionLocal() as db:
+        board = create_board(db, name="cursorboard")
+        board_id = board.id
+        author = db.query(User).filter(User.username == "cursor_user").one()
+        # 같은 created_at 끼리는 id로 순서가 갈려야 함
+        stamps = [datetime(2025, 1, 1, 12, 0, 0)] * 3 + [datetime(2025, 1, 2, 12, 0, 0)] * 2
+        for i, ts in enumerate(stamps):
+            db.add(Post(title=f"p{i}", content="c", author_id=author.id, board_id=board_id, created_at=ts))
+        db.commit()
+        expected = [
+            p.id
+            for p in db.query(Post)
+            .filter(Post.board_id == board_id)
+            .order_by(Post.created_at.desc(), Post.id.desc())
+        ]
+
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        r = client.get(
+            f"/api/v1/posts/boards/{board_id}/posts",
+            params={"cursor": cursor, "size": 2},
+        )
+        assert r.status_code == 200
+        data = r.json()
+        seen.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+    assert seen == expected
+
+    r = client.get(f"/api/v1/posts/boards/{board_id}/posts", params={"cursor": "not-a-cursor"})
+    assert r.status_code == 400
+    r = client.get(f"/api/v1/posts/boards/{board_id}/posts", params={"cursor": "", "size": 0})
+    assert r.status_code == 422
+
+
+def test_list_posts_by_board():
+    token = signup_and_login("list_user")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with TestingSessionLocal() as db:
+        board = create_board(db, name="listboard")
+        board_id = board.id
+
+    for title in ("first", "second"):
+        post_data = {"title": title, "content": "body", "board_id": board_id}
+        r = client.post(f"/api/v1/posts/boards/{board_id}/posts", json=post_data, headers=headers)
+        assert r.status_code == 201
+
+    r = client.get(f"/api/v1/posts/boards/{board_id}/posts", params={"size": 10})
+    assert r.status_code == 200
+    data = r.json()
+    assert {p["title"] for p in data} == {"first", "second"}
+    assert all(p["author"]["username"] == "list_user" for p in data)
+    assert all("content" not in p for p in data)
+
+
+def test_update_and_delete_post_refresh_read():
+    token = signup_and_login("cache_user")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with TestingSessionLocal() as db:
+        board = create_board(db, name="cacheboard")
+        board_id = board.id
+
+    post_data = {"title": "before", "content": "body", "board_id": board_id}
+    r = client.post(f"/api/v1/posts/boards/{board_id}/posts", json=post_data, headers=headers)
+    post_id = r.json()["id"]
+    url = f"/api/v1/posts/boards/{board_id}/posts/{post_id}"
+
+    assert client.get(url).json()["title"] == "before"
+    r = client.put(url, json={"title": "after", "board_id": board_id}, headers=headers)
+    assert r.status_code == 200
+    assert client.get(url).json()["title"] == "after"
+
+    r = client.delete(url, headers=headers)
+    assert r.status_code == 204
+    assert client.get(url).status_code == 404
+
+
+def test_post_cache_single_flight():
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return PostOut(
+            id=987654, board_id=1, title="t", content="c",
+            author={"id": 1, "username": "u"},
+            created_at=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 1),
+        )
+
+    async def main():
+        await post_cache.invalidate(987654)
+        return await asyncio.gather(*(post_cache.get_post(987654, loader) for _ in range(10)))
+
+    results = asyncio.run(main())
+    assert calls == 1
+    assert all(p.title == "t" for p in results)
+
+
+def test_post_cache_leader_cancel_does_not_cancel_waiters():
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return PostOut(
+            id=987655, board_id=1, title="t", content="c",
+            author={"id": 1, "username": "u"},
+            created_at=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 1),
+        )
+
+    async def main():
+        leader = asyncio.create_task(post_cache.get_post(987655, loader))
+        await wait_until(lambda: calls == 1)
+        waiters = [asyncio.create_task(post_cache.get_post(987655, loader)) for _ in range(3)]
+        await asyncio.sleep(0)  # 대기자들이 진행 중인 조회에 합류
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        # 대기자는 취소되지 않고, 그중 하나가 다시 채움
+        results = await asyncio.gather(*waiters)
+        assert all(p.title == "t" for p in results)
+
+        # 대기자 자신이 취소되면 그 대기자만 취소됨
+        leader = asyncio.create_task(post_cache.get_post(987655, loader))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(post_cache.get_post(987655, loader))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert (await leader).title == "t"
+
+    asyncio.run(main())
+    assert calls == 3
+
+
+class FakeCacheRedis:
+    """
+    게시글 캐시가 쓰는 명령(get/set/incr/expire/delete/eval/pipeline)만 흉내 내는 가짜 Redis
+    """
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, name):
+        return self.values.get(name)
+
+    async def set(self, name, value, ex=None, px=None, nx=False):
+        if nx and name in self.values:
+            return None
+        self.values[name] = value
+        return True
+
+    async def incr(self, name):
+        self.values[name] = str(int(self.values.get(name, "0")) + 1)
+        return int(self.values[name])
+
+    async def expire(self, name, seconds):
+        return name in self.values
+
+    async def delete(self, *names):
+        return sum(self.values.pop(name, None) is not None for name in names)
+
+    async def eval(self, script, numkeys, *args):
+        keys, argv = args[:numkeys], args[numkeys:]
+        if script == post_cache._UNLOCK_SCRIPT:
+            return await self.delete(keys[0]) if self.values.get(keys[0]) == argv[0] else 0
+        if script == post_cache._SET_IF_GENERATION_SCRIPT:
+            if self.values.get(keys[1], "0") != argv[0]:
+                return 0
+            return await self.set(keys[0], argv[1])
+        raise AssertionError("unexpected script")
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+def test_post_cache_invalidation_during_fill_is_not_lost(monkeypatch):
+    redis = FakeCacheRedis()
+    monkeypatch.setattr(post_cache, "redis_client", redis)
+    monkeypatch.setattr(post_cache, "_redis_retry_at", 0.0)
+    titles = ["old", "new"]
+
+    async def loader():
+        title = titles.pop(0)
+        if title == "old":
+            # DB에서 옛 값을 읽은 직후, 다른 요청이 수정을 커밋하고 무효화
+            await post_cache.invalidate(987656)
+        return PostOut(
+            id=987656, board_id=1, title=title, content="c",
+            author={"id": 1, "username": "u"},
+            created_at=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 1),
+        )
+
+    async def main():
+        assert (await post_cache.get_post(987656, loader)).title == "old"
+        assert post_cache._key(987656) not in redis.values  # 옛 값은 저장되지 않음
+        assert (await post_cache.get_post(987656, loader)).title == "new"
+        assert (await post_cache.get_post(987656, loader)).title == "new"  # 캐시 hit
+
+    asyncio.run(main())
+    assert titles == []
+
+
+class FakePubSubRedis:
+    """
+    publish / pubsub()만 흉내 내는 가짜 Redis - 인스턴스 하나를 여러 Backplane(워커)이 공유
+    """
+
+    def __init__(self):
+        self.pubsubs = []
+        self.published = []
+        self.down = False
+
+    async def publish(self, channel, payload):
+        if self.down:
+            raise RedisConnectionError("down")
+        self.published.append((channel, payload))
+        receivers = [p for p in self.pubsubs if channel in p.channels]
+        for pubsub in receivers:
+            pubsub.queue.put_nowait({"type": "message", "channel": channel, "data": payload})
+        return len(receivers)
+
+    def pubsub(self, **kwargs):
+        pubsub = FakePubSub(self)
+        self.pubsubs.append(pubsub)
+        return pubsub
+
+
+class FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+        self.channels = set()
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, *channels):
+        if self.redis.down:
+            raise RedisConnectionError("down")
+        self.channels.update(channels)
+
+    async def unsubscribe(self, *channels):
+        self.channels.difference_update(channels)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        if self.redis.down:
+            raise RedisConnectionError("down")
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self):
+        self.redis.pubsubs.remove(self)
+
+
+def test_backplane_fans_out_across_workers():
+    fake = FakePubSubRedis()
+    received = {"a": [], "b": []}
+
+    def handler(worker):
+        async def handle(channel, payload):
+            received[worker].append((channel, payload))
+        return handle
+
+    async def scenario():
+        worker_a = Backplane(fake, retry_seconds=0.05)
+        worker_b = Backplane(fake, retry_seconds=0.05)
+        handle_a, handle_b = handler("a"), handler("b")
+        await worker_a.subscribe("chat:room:1", handle_a)
+        await worker_b.subscribe("chat:room:1", handle_b)
+        await worker_b.subscribe("chat:room:2", handle_b)
+        await wait_until(lambda: sum(len(p.channels) for p in fake.pubsubs) == 3)
+        assert len(fake.pubsubs) == 2  # 워커당 PubSub 연결 하나로 모든 방을 다중화
+
+        # 한 번만 발행하고 각 워커가 자기 소켓에 전달
+        await worker_a.publish("chat:room:1", "hi")
+        await worker_a.publish("chat:room:2", "room two")
+        await wait_until(lambda: len(received["b"]) == 2 and len(received["a"]) == 1)
+        assert fake.published == [("chat:room:1", "hi"), ("chat:room:2", "room two")]
+        assert received["a"] == [("chat:room:1", "hi")]
+
+        # Redis 장애: 같은 워커 로컬로만 전달(fail-open), 복구되면 재구독
+        fake.down = True
+        await worker_a.publish("chat:room:1", "local only")
+        assert received["a"][-1] == ("chat:room:1", "local only")
+        await asyncio.sleep(0.05)
+        fake.down = False
+        await wait_until(lambda: sum(len(p.channels) for p in fake.pubsubs) == 3)
+        await asyncio.sleep(0.06)  # 발행 쪽 backoff 종료
+        await worker_a.publish("chat:room:1", "recovered")
+        await wait_until(lambda: received["b"][-1] == ("chat:room:1", "recovered"))
+        assert ("chat:room:1", "local only") not in received["b"]
+
+        # 마지막 핸들러가 빠지면 구독 해제
+        await worker_b.unsubscribe("chat:room:1", handle_b)
+        assert worker_b.channels == {"chat:room:2"}
+        await worker_a.publish("chat:room:1", "after leave")
+        await wait_until(lambda: received["a"][-1] == ("chat:room:1", "after leave"))
+        assert received["b"][-1] == ("chat:room:1", "recovered")
+
+        await worker_a.close()
+        await worker_b.close()
+        assert fake.pubsubs == []
+
+    asyncio.run(scenario())
+
+
+def test_chat_websocket_delivers_without_redis():
+    room = f"lobby-{uuid.uuid4().hex[:8]}"
+
+    def text(frame):
+        data = json.loads(frame)
+        assert data["type"] == "message"
+        return data["text"]
+
+    with TestClient(app) as live:
+        with live.websocket_connect(f"/api/v1/ws/chat/{room}?username=amy") as amy:
+            assert json.loads(amy.receive_text())["type"] == "history"
+            assert text(amy.receive_text()) == "amy joined!"
+            with live.websocket_connect(f"/api/v1/ws/chat/{room}?username=ben") as ben:
+                assert json.loads(ben.receive_text())["type"] == "history"
+                assert text(ben.receive_text()) == "ben joined!"
+                assert text(amy.receive_text()) == "ben joined!"
+                ben.send_text("hello")
+                assert text(amy.receive_text()) == "ben: hello"
+                assert text(ben.receive_text()) == "ben: hello"
+                ben.close()
+                assert text(amy.receive_text()) == "ben left!"
+
+
+def test_chat_websocket_cleans_up_after_unexpected_error():
+    from app.api.v1.endpoints.ws import manager
+
+    room = f"crash-{uuid.uuid4().hex[:8]}"
+    with TestClient(app) as live:
+        with live.websocket_connect(f"/api/v1/ws/chat/{room}?username=amy") as amy:
+            assert json.loads(amy.receive_text())["type"] == "history"
+            assert json.loads(amy.receive_text())["text"] == "amy joined!"
+            with pytest.raises(KeyError):  # receive_text()가 바이너리 프레임에서 KeyError
+                with live.websocket_connect(f"/api/v1/ws/chat/{room}?username=ghost") as ghost:
+                    ghost.receive_text()
+                    ghost.receive_text()
+                    ghost.send_bytes(b"\x00")
+                    ghost.receive_text()
+            # 남은 건 amy의 송신 큐 하나뿐
+            for _ in range(200):
+                if len(manager.active_connections[room]) == 1:
+                    break
+                time.sleep(0.01)
+            assert len(manager.active_connections[room]) == 1
+            assert sum(o in manager.active_connections[room] for o in manager.outboxes.values()) == 1
+            assert json.loads(amy.receive_text())["text"] == "ghost joined!"
+            assert json.loads(amy.receive_text())["text"] == "ghost left!"
+
+
+class FakeStreamRedis:
+    """
+    XADD(MAXLEN) / XRANGE / XREVRANGE / XINFO STREAM만 흉내 내는 가짜 Redis
+    """
+
+    def __init__(self):
+        self.streams = {}
+        self.max_deleted = {}
+        self.seq = 0
+
+    async def xadd(self, name, fields, maxlen=None, approximate=True):
+        self.seq += 1
+        entry_id = f"{self.seq}-0"
+        entries = self.streams.setdefault(name, [])
+        entries.append((entry_id, dict(fields)))
+        if maxlen and len(entries) > maxlen:
+            self.max_deleted[name] = entries[-maxlen - 1][0]
+            del entries[:-maxlen]
+        return entry_id
+
+    async def xinfo_stream(self, name):
+        if name not in self.streams:
+            raise ResponseError("no such key")
+        entries = self.streams[name]
+        return {
+            "length": len(entries),
+            "max-deleted-entry-id": self.max_deleted.get(name, "0-0"),
+            "first-entry": entries[0] if entries else None,
+        }
+
+    async def xrange(self, name, min="-", max="+", count=None):
+        entries = list(self.streams.get(name, []))
+        if min.startswith("("):
+            bound = tuple(map(int, min[1:].split("-")))
+            entries = [e for e in entries if tuple(map(int, e[0].split("-"))) > bound]
+        return entries[:count]
+
+    async def xrevrange(self, name, max="+", min="-", count=None):
+        entries = list(reversed(self.streams.get(name, [])))
+        if max.startswith("("):
+            bound = tuple(map(int, max[1:].split("-")))
+            entries = [e for e in entries if tuple(map(int, e[0].split("-"))) < bound]
+        elif max != "+":
+            bound = tuple(map(int, max.split("-")))
+            entries = [e for e in entries if tuple(map(int, e[0].split("-"))) <= bound]
+        return entries[:count]
+
+
+class FakeWebSocket:
+    def __init__(self, stalled=False):
+        self.frames = []
+        self.close_code = None
+        self.stalled = stalled  # 전송이 끝나지 않는 (느린) 클라이언트
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data):
+        if self.stalled:
+            await asyncio.Event().wait()
+        self.frames.append(json.loads(data))
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+def test_chat_history_lists_migrate_to_streams():
+    from app.services import chat_history_migration
+
+    class FakeListAndStreamRedis(FakeStreamRedis):
+        def __init__(self):
+            super().__init__()
+            self.lists = {}
+
+        async def scan_iter(self, match=None, count=None):
+            for key in list(self.lists):
+                if fnmatch.fnmatchcase(key, match):
+                    yield key
+
+        async def eval(self, script, numkeys, list_key, stream_key, max_messages):
+            # _MIGRATE_SCRIPT와 같은 동작 (Lua는 원자적으로 실행됨)
+            assert script == chat_history_migration._MIGRATE_SCRIPT
+            items = self.lists.pop(list_key, [])[-max_messages:]
+            if items:
+                existing = self.streams.get(stream_key, [])
+                migrated = [(f"0-{i}", {"text": text}) for i, text in enumerate(items, 1)]
+                self.streams[stream_key] = (migrated + existing)[-max_messages:]
+            return len(items)
+
+    pubsub = FakePubSubRedis()
+    pubsub.down = True
+    redis = FakeListAndStreamRedis()
+    redis.lists["room:legacy:messages"] = [f"old {i}" for i in range(5)]
+    redis.lists["room:empty:messages"] = []
+
+    async def scenario():
+        manager = ConnectionManager(Backplane(pubsub, retry_seconds=60), redis)
+        await manager.send_message("legacy", "new since deploy")  # 배포 후 이미 쌓인 메시지
+
+        assert await chat_history_migration.migrate_room_lists(redis, max_messages=4) == 2
+        assert redis.lists == {}
+        assert await chat_history_migration.migrate_room_lists(redis, max_messages=4) == 0  # 다시 실행해도 무해
+
+        ws = FakeWebSocket()
+        await manager.connect(ws, "legacy", "amy")
+        await wait_until(lambda: len(ws.frames) == 2)
+        history = ws.frames[0]["messages"]
+        # 옮겨진 기록이 배포 후 메시지보다 앞에 옴 (보관 한도만큼)
+        assert [m["text"] for m in history] == ["old 2", "old 3", "old 4", "new since deploy"]
+        assert [m["id"] for m in history][:3] == ["0-2", "0-3", "0-4"]
+        await manager.disconnect(ws, "legacy", "amy")
+        await manager.backplane.close()
+
+    asyncio.run(scenario())
+
+
+def test_chat_history_is_capped_and_paged(monkeypatch):
+    monkeypatch.setattr(settings, "CHAT_HISTORY_MAX_MESSAGES", 7)
+    monkeypatch.setattr(settings, "CHAT_HISTORY_PAGE_SIZE", 2)
+    monkeypatch.setattr(settings, "CHAT_HISTORY_MAX_PAGE_SIZE", 3)
+    pubsub = FakePubSubRedis()
+    pubsub.down = True  # 로컬 전달만
+    redis = FakeStreamRedis()
+
+    async def scenario():
+        manager = ConnectionManager(Backplane(pubsub, retry_seconds=60), redis)
+        amy, ben = FakeWebSocket(), FakeWebSocket()
+        await manager.connect(amy, "r1", "amy")
+        await wait_until(lambda: len(amy.frames) == 2)
+        assert amy.frames[0] == {"type": "history", "messages": [], "has_more": False}
+        assert amy.frames[1]["text"] == "amy joined!"
+        for n in range(1, 7):
+            await manager.send_message("r1", f"amy: m{n}")
+
+        # 입장 시 최근 N개를 한 프레임으로
+        await manager.connect(ben, "r1", "ben")
+        await wait_until(lambda: len(ben.frames) == 2)
+        # 보관 개수 제한 (MAXLEN): 가장 오래된 "amy joined!"가 밀려남
+        stored = [fields["text"] for _, fields in redis.streams["room:r1:stream"]]
+        assert stored == [f"amy: m{n}" for n in range(1, 7)] + ["ben joined!"]
+        history = ben.frames[0]
+        assert history["type"] == "history" and history["has_more"] is True
+        assert [m["text"] for m in history["messages"]] == ["amy: m5", "amy: m6"]
+
+        # 이전 기록: id 기준으로 뒤로 페이지 (limit은 최대 페이지 크기로 제한)
+        await manager.send_history(ben, "r1", before=history["messages"][0]["id"], limit=10)
+        await wait_until(lambda: len(ben.frames) == 3)
+        older = ben.frames[-1]
+        assert [m["text"] for m in older["messages"]] == ["amy: m2", "amy: m3", "amy: m4"]
+        assert older["has_more"] is True
+        await manager.send_history(ben, "r1", before="not-an-id")
+        await wait_until(lambda: len(ben.frames) == 4)
+        assert ben.frames[-1]["type"] == "error"
+        await manager.backplane.close()
+
+    asyncio.run(scenario())
+
+
+def test_chat_reconnect_sends_only_missed_messages(monkeypatch):
+    monkeypatch.setattr(settings, "CHAT_HISTORY_MAX_MESSAGES", 5)
+    pubsub = FakePubSubRedis()
+    pubsub.down = True
+    redis = FakeStreamRedis()
+
+    async def scenario():
+        manager = ConnectionManager(Backplane(pubsub, retry_seconds=60), redis)
+        amy = FakeWebSocket()
+        await manager.connect(amy, "resume", "amy")
+        await manager.send_message("resume", "amy: one")
+        await wait_until(lambda: len(amy.frames) == 3)
+        last_seen = amy.frames[-1]["id"]
+        await manager.disconnect(amy, "resume", "amy")
+        for text in ("ben: two", "ben: three"):
+            await manager.send_message("resume", text)
+
+        # 재접속: last_id 이후 메시지만 (전체 기록 재전송 없음)
+        again = FakeWebSocket()
+        await manager.connect(again, "resume", "amy", last_id=last_seen)
+        await wait_until(lambda: len(again.frames) == 2)
+        delta = again.frames[0]
+        assert delta["after"] == last_seen and delta["truncated"] is False
+        assert [m["text"] for m in delta["messages"]] == ["amy left!", "ben: two", "ben: three"]
+        ids = [m["id"] for m in delta["messages"]] + [again.frames[1]["id"]]
+        assert ids == sorted(ids, key=lambda i: tuple(map(int, i.split("-"))))
+
+        # 보관 한도를 넘겨 놓친 메시지가 잘려 나갔으면 truncated
+        for text in ("ben: four", "ben: five"):
+            await manager.send_message("resume", text)
+        stale = FakeWebSocket()
+        await manager.connect(stale, "resume", "carl", last_id="1-0")
+        await wait_until(lambda: len(stale.frames) == 2)
+        assert stale.frames[0]["truncated"] is True
+        assert len(stale.frames[0]["messages"]) == 5
+
+        # last_id 자체만 잘리고 바로 다음 메시지가 남아 있으면 놓친 게 없음
+        oldest = redis.streams["room:resume:stream"][0][0]
+        just_trimmed = f"{int(oldest.split('-')[0]) - 1}-0"
+        edge = FakeWebSocket()
+        await manager.connect(edge, "resume", "erin", last_id=just_trimmed)
+        await wait_until(lambda: len(edge.frames) == 2)
+        assert edge.frames[0]["truncated"] is False
+        assert edge.frames[0]["messages"][0]["id"] == oldest
+
+        # 형식이 잘못된 last_id는 일반 입장과 동일
+        fresh = FakeWebSocket()
+        await manager.connect(fresh, "resume", "dora", last_id="garbage")
+        await wait_until(lambda: len(fresh.frames) == 2)
+        assert "has_more" in fresh.frames[0]
+        await manager.backplane.close()
+
+    asyncio.run(scenario())
+
+
+def test_slow_websocket_consumers_are_evicted(monkeypatch):
+    monkeypatch.setattr(settings, "WS_SEND_TIMEOUT_SECONDS", 0.05)
+    pubsub = FakePubSubRedis()
+    pubsub.down = True
+
+    async def scenario():
+        # 송신 큐가 넘치면 즉시 끊음
+        evicted = []
+        stalled = FakeWebSocket(stalled=True)
+        outbox = Outbox(stalled, on_evict=evicted.append, max_queue=2, send_timeout=10).start()
+        assert outbox.send('{"n": 1}')
+        await asyncio.sleep(0)  # writer가 첫 프레임을 가져가서 전송 중에 멈춤
+        assert outbox.send('{"n": 2}') and outbox.send('{"n": 3}')
+        assert not outbox.send('{"n": 4}')
+        assert evicted == [outbox]
+        await wait_until(lambda: stalled.close_code == SLOW_CONSUMER_CLOSE_CODE)
+        assert not outbox.send('{"n": 5}')
+
+        # 채팅: 멈춘 클라이언트가 있어도 브로드캐스트는 기다리지 않고, 전송 시간 초과로 방에서 빠짐
+        manager = ConnectionManager(Backplane(pubsub, retry_seconds=60), FakeStreamRedis())
+        amy, bob = FakeWebSocket(), FakeWebSocket(stalled=True)
+        await manager.connect(amy, "slow", "amy")
+        await manager.connect(bob, "slow", "bob")
+        await asyncio.wait_for(manager.send_message("slow", "amy: hi"), 0.01)
+        await wait_until(lambda: bob.close_code == SLOW_CONSUMER_CLOSE_CODE)
+        assert [o.websocket for o in manager.active_connections["slow"]] == [amy]
+        await wait_until(lambda: amy.frames and amy.frames[-1].get("text") == "amy: hi")
+        await manager.disconnect(bob, "slow", "bob")  # 이미 빠진 연결 정리는 무시
+        await manager.disconnect(amy, "slow", "amy")
+        assert "slow" not in manager.active_connections
+        await manager.backplane.close()
+
+        # WebRTC: 느린 피어는 빠지고 나머지는 계속 시그널링
+        calls = CallManager(Backplane(pubsub, retry_seconds=60), FakeRegistryRedis(), worker_id="w1")
+        alice, bob, carol = FakeWebSocket(), FakeWebSocket(stalled=True), FakeWebSocket()
+        for ws, name in ((alice, "alice"), (bob, "bob"), (carol, "carol")):
+            await calls.connect(ws, "call", name)
+        await asyncio.wait_for(calls.broadcast("call", {"type": "offer"}, sender="alice"), 0.01)
+        await wait_until(lambda: bob.close_code == SLOW_CONSUMER_CLOSE_CODE)
+        assert set(calls.active_connections["call"]) == {"alice", "carol"}
+        await wait_until(lambda: {"type": "offer"} in carol.frames)
+        assert {"type": "offer"} not in alice.frames
+        for ws, name in ((alice, "alice"), (carol, "carol")):
+            await calls.disconnect("call", name, ws)
+        assert "call" not in calls.active_connections
+        await calls.backplane.close()
+
+    asyncio.run(scenario())
+
+
+def test_outbox_aclose_when_cancel_lands_as_send_completes():
+    class ClosingWebSocket(FakeWebSocket):
+        """전송이 끝나는 바로 그 순간에 aclose()가 writer를 cancel 하도록 예약"""
+
+        outbox = None
+        closing = None
+
+        async def send_text(self, data):
+            await super().send_text(data)
+            self.closing = asyncio.get_running_loop().create_task(self.outbox.aclose())
+
+    async def scenario():
+        ws = ClosingWebSocket()
+        ws.outbox = outbox = Outbox(ws, send_timeout=5).start()
+        assert outbox.send('{"n": 1}')
+        await wait_until(lambda: ws.closing is not None)
+        # wait_for가 cancel을 삼켜도(3.11) writer가 빈 큐에서 계속 기다리며 aclose()가 멈추면 안 됨
+        await asyncio.wait_for(ws.closing, 1)
+        assert outbox._writer.done()
+        assert ws.frames == [{"n": 1}]
+
+    asyncio.run(scenario())
+
+
+def test_webrtc_targeted_signaling_and_presence():
+    pubsub = FakePubSubRedis()
+    pubsub.down = True  # 단일 워커 (로컬 전달)
+
+    async def scenario():
+        calls = CallManager(Backplane(pubsub, retry_seconds=60), FakeRegistryRedis(), worker_id="w1")
+        alice, bob, carol = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        await calls.connect(alice, "mesh", "alice")
+        await calls.connect(bob, "mesh", "bob")
+        await calls.connect(carol, "mesh", "carol")
+        await wait_until(lambda: len(alice.frames) == 3 and len(bob.frames) == 2 and carol.frames)
+        # 입장: 본인에게는 기존 피어 목록, 나머지에게는 join
+        assert alice.frames == [
+            {"type": "peers", "peers": []},
+            {"type": "join", "user": "bob"},
+            {"type": "join", "user": "carol"},
+        ]
+        assert carol.frames == [{"type": "peers", "peers": ["alice", "bob"]}]
+
+        # "to"가 있으면 그 피어에게만 (보낸 사람은 서버가 "from"으로 채움)
+        await calls.relay("mesh", {"type": "offer", "sdp": "x", "to": "bob", "from": "mallory"}, sender="carol")
+        await wait_until(lambda: len(bob.frames) == 3)
+        assert bob.frames[-1] == {"type": "offer", "sdp": "x", "to": "bob", "from": "carol"}
+        # 없는 피어면 보낸 사람에게 오류
+        await calls.relay("mesh", {"type": "answer", "to": "nobody"}, sender="carol")
+        await wait_until(lambda: len(carol.frames) == 2)
+        assert carol.frames[-1] == {"type": "error", "detail": "peer not found", "to": "nobody"}
+        # "to"가 문자열이 아니면 오류 프레임 (연결은 유지)
+        await calls.relay("mesh", {"type": "offer", "to": ["bob"]}, sender="carol")
+        await wait_until(lambda: len(carol.frames) == 3)
+        assert carol.frames[-1] == {"type": "error", "detail": "\"to\" must be a username string"}
+        # "to"가 없으면 방 전체
+        await calls.relay("mesh", {"type": "mute"}, sender="bob")
+        await wait_until(lambda: len(carol.frames) == 4)
+        assert alice.frames[-1] == {"type": "mute", "from": "bob"}
+        assert len(alice.frames) == 4
+
+        # 퇴장 알림
+        await calls.disconnect("mesh", "bob", bob)
+        await wait_until(lambda: alice.frames[-1] == {"type": "leave", "user": "bob"})
+        assert carol.frames[-1] == {"type": "leave", "user": "bob"}
+        assert set(calls.active_connections["mesh"]) == {"alice", "carol"}
+        await calls.disconnect("mesh", "alice", alice)
+        await calls.disconnect("mesh", "carol", carol)
+        await calls.backplane.close()
+
+    asyncio.run(scenario())
+
+
+def test_webrtc_endpoint_cleans_up_after_unexpected_error(monkeypatch):
+    from app.services.webrtc import call_manager
+
+    async def broken_relay(room_id, message, sender):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(call_manager, "relay", broken_relay)
+    with pytest.raises(RuntimeError):
+        with client.websocket_connect("/api/v1/ws/webrtc/crash-room?username=ghost") as ws:
+            assert ws.receive_json() == {"type": "peers", "peers": []}
+            ws.send_text(json.dumps({"type": "offer", "to": "bob"}))
+            ws.receive_json()
+    # 예외로 끝나도 유령 피어가 남지 않음
+    assert "ghost" not in call_manager.active_connections.get("crash-room", {})
+
+
+class FakeRegistryRedis:
+    """
+    WebRTC 피어 레지스트리가 쓰는 문자열/집합 명령만 흉내 내는 가짜 Redis (TTL 만료는 expire_now()로 흉내)
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+
+    def expire_now(self, key):
+        self.values.pop(key, None)
+
+    async def set(self, name, value, px=None, get=False):
+        previous = self.values.get(name)
+        self.values[name] = value
+        return previous if get else True
+
+    async def get(self, name):
+        return self.values.get(name)
+
+    async def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    async def delete(self, *names):
+        return sum(self.values.pop(name, None) is not None for name in names)
+
+    async def sadd(self, name, *members):
+        bucket = self.sets.setdefault(name, set())
+        added = len(set(members) - bucket)
+        bucket.update(members)
+        return added
+
+    async def srem(self, name, *members):
+        bucket = self.sets.get(name, set())
+        removed = len(bucket & set(members))
+        bucket.difference_update(members)
+        return removed
+
+    async def smembers(self, name):
+        return set(self.sets.get(name, set()))
+
+    async def pexpire(self, name, ms):
+        return True
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+def test_webrtc_signaling_across_workers():
+    pubsub = FakePubSubRedis()  # 워커들이 공유하는 Redis
+    registry = FakeRegistryRedis()
+
+    async def scenario():
+        worker_a = CallManager(Backplane(pubsub, retry_seconds=0.05), registry, worker_id="a")
+        worker_b = CallManager(Backplane(pubsub, retry_seconds=0.05), registry, worker_id="b")
+        alice, bob, carol = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        await worker_a.connect(alice, "x", "alice")
+        await wait_until(lambda: alice.frames)
+        await worker_b.connect(bob, "x", "bob")
+        await worker_b.connect(carol, "x", "carol")
+
+        # 다른 워커의 피어도 목록/입장 알림에 보임
+        await wait_until(lambda: len(alice.frames) == 3 and carol.frames)
+        assert bob.frames[0] == {"type": "peers", "peers": ["alice"]}
+        assert carol.frames[0] == {"type": "peers", "peers": ["alice", "bob"]}
+        assert alice.frames[1:] == [{"type": "join", "user": "bob"}, {"type": "join", "user": "carol"}]
+        assert registry.values["webrtc:room:x:peer:bob"] == "b"
+
+        # "to": 대상 워커 채널로 한 번만 → 그 워커가 자기 소켓에만 전달
+        await worker_a.relay("x", {"type": "offer", "sdp": "o", "to": "bob"}, sender="alice")
+        await wait_until(lambda: bob.frames[-1].get("type") == "offer")
+        assert bob.frames[-1] == {"type": "offer", "sdp": "o", "to": "bob", "from": "alice"}
+        assert all(frame.get("type") != "offer" for frame in carol.frames)
+        worker_channels = [c for c, _ in pubsub.published if c.startswith("webrtc:worker:")]
+        assert worker_channels == ["webrtc:worker:b"]
+
+        # 방 전체: 방 채널에 한 번 발행, 각 워커가 전달
+        await worker_b.relay("x", {"type": "mute"}, sender="carol")
+        await wait_until(lambda: alice.frames[-1] == {"type": "mute", "from": "carol"})
+        await wait_until(lambda: bob.frames[-1] == {"type": "mute", "from": "carol"})
+
+        # 죽은 워커의 피어는 TTL 만료 후 heartbeat 정리 때 leave가 한 번만 발행됨
+        registry.sets["webrtc:room:x:peers"].add("ghost")
+        await worker_a.heartbeat()
+        await worker_b.heartbeat()
+        await wait_until(lambda: carol.frames[-1] == {"type": "leave", "user": "ghost"})
+        assert alice.frames.count({"type": "leave", "user": "ghost"}) == 1
+        assert "ghost" not in registry.sets["webrtc:room:x:peers"]
+        # 살아 있는 워커의 heartbeat는 등록을 되살림
+        registry.expire_now("webrtc:room:x:peer:alice")
+        await worker_a.heartbeat()
+        assert registry.values["webrtc:room:x:peer:alice"] == "a"
+
+        # 같은 이름이 다른 워커로 다시 접속하면 이전 연결은 끊고 leave는 보내지 않음
+        alice_again = FakeWebSocket()
+        await worker_b.connect(alice_again, "x", "alice")
+        await wait_until(lambda: alice.close_code == SLOW_CONSUMER_CLOSE_CODE)
+        await wait_until(lambda: "x" not in worker_a.active_connections)
+        assert registry.values["webrtc:room:x:peer:alice"] == "b"
+        await worker_a.disconnect("x", "alice", alice)
+        await worker_b.relay("x", {"type": "answer", "to": "alice"}, sender="bob")
+        await wait_until(lambda: alice_again.frames and alice_again.frames[-1].get("type") == "answer")
+        assert {"type": "leave", "user": "alice"} not in bob.frames
+
+        # 정상 퇴장
+        await worker_b.disconnect("x", "bob", bob)
+        await wait_until(lambda: carol.frames[-1] == {"type": "leave", "user": "bob"})
+        assert "webrtc:room:x:peer:bob" not in registry.values
+        await worker_a.backplane.close()
+        await worker_b.backplane.close()
+
+    asyncio.run(scenario())
+
+
+def test_board_post_count_tracks_moves_and_deletes():
+    token = signup_and_login("count_user")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with TestingSessionLocal() as db:
+        src_id = create_board(db, name="count_src").id
+        dst_id = create_board(db, name="count_dst").id
+
+    def counts():
+        data = client.get("/api/v1/boards/").json()
+        by_id = {b["id"]: b["posts"] for b in data}
+        return by_id[src_id], by_id[dst_id]
+
+    post_ids = []
+    for i in range(2):
+        post_data = {"title": f"t{i}", "content": "c", "board_id": src_id}
+        r = client.post(f"/api/v1/posts/boards/{src_id}/posts", json=post_data, headers=headers)
+        post_ids.append(r.json()["id"])
+    assert counts() == (2, 0)
+
+    r = client.put(
+        f"/api/v1/posts/boards/{src_id}/posts/{post_ids[0]}",
+        json={"board_id": dst_id},
+        headers=headers,
+    )
+    assert r.status_code == 200
+    assert counts() == (1, 1)
+
+    r = client.delete(f"/api/v1/posts/boards/{src_id}/posts/{post_ids[1]}", headers=headers)
+    assert r.status_code == 204
+    assert counts() == (0, 1)
+
+    # 카운터가 어긋나도 보정 작업으로 복구
+    with TestingSessionLocal() as db:
+        db.query(Board).filter(Board.id == dst_id).update({Board.post_count: 42})
+        db.commit()
+        assert reconcile_post_counts(db) >= 1
+    assert counts() == (0, 1)
+
+
+def test_comment_tree_single_query():
+    token = signup_and_login("tree_user")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    with TestingSessionLocal() as db:
+        board_id = create_board(db, name="treeboard").id
+
+    post_data = {"title": "tree", "content": "c", "board_id": board_id}
+    post_id = client.post(f"/api/v1/posts/boards/{board_id}/posts", json=post_data, headers=headers).json()["id"]
+
+    def comment(content, parent=None):
+        url = f"/api/v1/comments/{parent}/replies" if parent else f"/api/v1/posts/{post_id}/comments"
+        r = client.post(url, json={"content": content}, headers=headers)
+        assert r.status_code == 201
+        return r.json()["id"]
+
+    a = comment("a")
+    b = comment("b")
+    a1 = comment("a1", a)
+    a1x = comment("a1x", a1)
+    a2 = comment("a2", a)
+
+    r = client.get(f"/api/v1/posts/{post_id}/comments/tree")
+    assert r.status_code == 200
+    data = r.json()
+    assert data["next_cursor"] is None
+    assert [c["id"] for c in data["items"]] == [a, b]
+    assert [c["id"] for c in data["items"][0]["replies"]] == [a1, a2]
+    assert data["items"][0]["replies"][0]["replies"][0]["id"] == a1x
+
+    # 페이지 단위: path 순서대로 이어짐
+    seen, cursor = [], None
+    while True:
+        params = {"size": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get(f"/api/v1/posts/{post_id}/comments/tree", params=params).json()
+
+        def walk(nodes):
+            for n in nodes:
+                seen.append(n["id"])
+                walk(n["replies"])
+
+        walk(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [a, a1, a1x, a2, b]
+
+    r = client.get(f"/api/v1/posts/{post_id}/comments/tree", params={"max_depth": 0})
+    assert all(c["replies"] == [] for c in r.json()["items"])
+
+    # 트리 조회는 SELECT 한 번 (작성자의 posts/comments/files 관계를 끌고 오지 않음)
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(TEST_ENGINE, "before_cursor_execute", count_statement)
+    try:
+        with TestingSessionLocal() as db:
+            items, _ = comment_crud.get_comment_tree(db, post_id)
+    finally:
+        event.remove(TEST_ENGINE, "before_cursor_execute", count_statement)
+    assert len(statements) == 1, statements
+    assert items[0]["author"]["username"] == "tree_user"
+
+
+def test_principal_cache_invalidated_on_user_change():
+    token = signup_and_login("promoted_user")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # 일반 유저 - 캐시에 is_admin=False 로 올라감
+    assert client.get("/api/v1/posts/all_posts", headers=headers).status_code == 403
+
+    with TestingSessionLocal() as db:
+        user = db.query(User).filter(User.username == "promoted_user").one()
+        user.is_admin = True
+        db.commit()
+
+    assert client.get("/api/v1/posts/all_posts", headers=headers).status_code == 200
+
+    # bulk update는 대상 id를 모르므로 캐시 전체 무효화
+    with TestingSessionLocal() as db:
+        db.query(User).filter(User.username == "promoted_user").update({User.is_admin: False})
+        db.commit()
+
+    assert client.get("/api/v1/posts/all_posts", headers=headers).status_code == 403
+
+
+def test_login_rehashes_password_when_cost_changes():
+    signup_and_login("rehash_user")
+
+    # 예전 cost(4)로 저장된 해시 흉내
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("secret")
+    with TestingSessionLocal() as db:
+        user = db.query(User).filter(User.username == "rehash_user").one()
+        user.hashed_password = old_hash
+        db.commit()
+
+    r = client.post("/api/v1/auth/login", json={"username": "rehash_user", "password": "wrong"})
+    assert r.status_code == 401
+    with TestingSessionLocal() as db:
+        assert db.query(User.hashed_password).filter(User.username == "rehash_user").scalar() == old_hash
+
+    r = client.post("/api/v1/auth/login", json={"username": "rehash_user", "password": "secret"})
+    assert r.status_code == 200
+    with TestingSessionLocal() as db:
+        stored = db.query(User.hashed_password).filter(User.username == "rehash_user").scalar()
+    assert stored.startswith(f"$2b${settings.BCRYPT_ROUNDS:02d}$")
+
+    r = client.post("/api/v1/auth/login", json={"username": "rehash_user", "password": "secret"})
+    assert r.status_code == 200
+
+
+def test_password_hasher_rejects_when_saturated(monkeypatch):
+    signup_and_login("busy_user")
+    hasher = PasswordHasher(workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        blocker = asyncio.ensure_future(hasher._submit(release.wait))
+        await wait_until(lambda: hasher.pending == 1)
+        with pytest.raises(HTTPException) as exc_info:
+            await hasher.hash("secret")
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers["Retry-After"] == "1"
+        release.set()
+        await blocker
+        assert hasher.pending == 0
+        assert await hasher.verify_and_update("secret", await hasher.hash("secret")) == (True, None)
+
+    asyncio.run(scenario())
+
+    # 로그인 엔드포인트: 바로 503 + Retry-After, 다른 API는 영향 없음
+    hasher.pending = hasher.max_pending
+    monkeypatch.setattr(auth_service, "password_hasher", hasher)
+    r = client.post("/api/v1/auth/login", json={"username": "busy_user", "password": "secret"})
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "1"
+    assert client.get("/api/v1/boards/").status_code == 200
+    hasher.shutdown()
+
+
+def test_ttl_cache_lru_and_expiry():
+    cache = TTLCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a가 최근 사용
+    cache.set("c", 3)           # b 제거
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    expired = TTLCache(maxsize=2, ttl_seconds=0)
+    expired.set("a", 1)
+    assert expired.get("a") is None
+
+
+def test_db_pool_metrics():
+    engine = create_engine(
+        os.environ["DB_TEST_URL"],
+        poolclass=TimedQueuePool,
+        pool_size=2,
+        max_overflow=0,
+        pool_logging_name="pool_test",
+    )
+    metrics = pool_metrics.register("pool_test", engine)
+    with engine.connect():
+        snap = metrics.snapshot()
+        assert snap["pool"]["checked_out"] == 1
+    snap = metrics.snapshot()
+    assert snap["pool"]["checked_out"] == 0
+    assert snap["counters"]["checkouts"] == 1 and snap["counters"]["checkins"] == 1
+    assert snap["checkout_wait_ms"]["samples"] == 1
+    engine.dispose()
+
+    token = signup_and_login("pool_admin")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/v1/admin/metrics/db-pool", headers=headers).status_code == 403
+    with TestingSessionLocal() as db:
+        db.query(User).filter(User.username == "pool_admin").one().is_admin = True
+        db.commit()
+    r = client.get("/api/v1/admin/metrics/db-pool", headers=headers)
+    assert r.status_code == 200
+    assert "pool_test" in r.json()
+    pool_metrics.pool_metrics.pop("pool_test")
+
+
+def test_sql_profiler_flags_repeated_statements():
+    from fastapi import FastAPI
+
+    probe = FastAPI()
+
+    @probe.get("/probe/{n}")
+    def run_queries(n: int):  # 동기 엔드포인트 - threadpool에서도 contextvar로 같은 요청에 집계
+        with TestingSessionLocal() as db:
+            db.execute(text("SELECT count(*) FROM boards")).scalar()
+            for i in range(n):
+                db.execute(text("SELECT id FROM posts WHERE id = :id"), {"id": i}).all()
+        return {"ok": True}
+
+    report = query_profiler.QueryReport()
+    probe_client = TestClient(
+        query_profiler.QueryProfilerMiddleware(probe, repeat_threshold=5, report=report)
+    )
+    query_profiler.attach(TEST_ENGINE)
+    try:
+        r = probe_client.get("/probe/2")
+        assert r.status_code == 200
+        timing = r.headers["server-timing"]
+        assert timing.startswith("db;dur=") and 'desc="3 queries"' in timing
+        assert "db-repeat" not in timing
+
+        r = probe_client.get("/probe/6")
+        assert 'desc="7 queries"' in r.headers["server-timing"]
+        assert 'db-repeat;desc="6x same statement"' in r.headers["server-timing"]
+
+        # 요청 밖의 쿼리는 세지 않음
+        with TestingSessionLocal() as db:
+            db.execute(text("SELECT 1")).all()
+
+        (row,) = report.worst()
+        assert row["route"] == "/probe/{n}" and row["requests"] == 2
+        assert row["queries_max"] == 7 and row["queries_avg"] == 5.0
+        assert row["n_plus_one_requests"] == 1
+        assert row["repeated_statements"] == [
+            {"statement": "SELECT id FROM posts WHERE id = ?", "max_repeats": 6}
+        ]
+
+        # 실제 앱: 관리자 리포트에 라우트 템플릿 단위로 쌓임
+        query_profiler.query_report.reset()
+        app_client = TestClient(query_profiler.QueryProfilerMiddleware(app))
+        r = app_client.get("/api/v1/boards/")
+        assert r.status_code == 200 and "db;dur=" in r.headers["server-timing"]
+    finally:
+        query_profiler.detach(TEST_ENGINE)
+
+    token = signup_and_login("sql_admin")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/v1/admin/metrics/sql", headers=headers).status_code == 403
+    with TestingSessionLocal() as db:
+        db.query(User).filter(User.username == "sql_admin").one().is_admin = True
+        db.commit()
+    r = client.get("/api/v1/admin/metrics/sql", params={"sort": "db_ms"}, headers=headers)
+    assert r.status_code == 200
+    endpoints = {(e["method"], e["route"]): e for e in r.json()["endpoints"]}
+    assert endpoints[("GET", "/api/v1/boards/")]["queries_max"] >= 1
+    assert client.delete("/api/v1/admin/metrics/sql", headers=headers).status_code == 204
+    assert client.get("/api/v1/admin/metrics/sql", headers=headers).json()["endpoints"] == []
+
+
+def test_bench_seed_run_and_compare(tmp_path):
+    from bench import runner, seed as seeder
+    from bench.scenarios import ChatFanoutScenario
+
+    db_url = f"sqlite:///{tmp_path / 'bench.db'}"
+    engine = create_engine(db_url)
+    summary = seeder.seed(engine, seeder.PROFILES["tiny"], batch_size=500)
+    assert summary["comments"] == 3 * 200
+    with engine.connect() as conn:
+        hot = conn.execute(text("SELECT post_count FROM boards ORDER BY post_count DESC")).scalars().all()
+        assert sum(hot) == 2000 and hot[0] > hot[-1]  # Zipf 분포
+        heavy = conn.execute(
+            text("SELECT count(*) FROM posts p JOIN users u ON u.id = p.author_id WHERE u.username = 'bench_heavy_1'")
+        ).scalar()
+        assert heavy == 300
+        assert conn.execute(text("SELECT max(depth) FROM comments")).scalar() >= 3
+    with pytest.raises(RuntimeError):
+        seeder.seed(engine, seeder.PROFILES["tiny"])  # 빈 DB에서만
+    engine.dispose()
+
+    async def run():
+        async with runner.app_database(app, db_url) as bench_engine:
+            return await runner.run_benchmarks(
+                app, bench_engine, ["hot_board_keyset", "comment_tree", "me_heavy_user"],
+                concurrency=2, warmup=0, requests=6,
+            )
+
+    saved = dict(app.dependency_overrides)
+    document = asyncio.run(run())
+    assert app.dependency_overrides == saved
+    for name in ("hot_board_keyset", "comment_tree", "me_heavy_user"):
+        result = document["scenarios"][name]
+        assert result["requests"] == 6 and result["errors"] == 0, result
+        assert result["latency_ms"]["p50"] <= result["latency_ms"]["p95"] <= result["latency_ms"]["p99"]
+    assert document["meta"]["dataset"]["heavy_users"] == 2
+
+    class FakeChatRedis(FakeStreamRedis, FakePubSubRedis):
+        def __init__(self):
+            FakeStreamRedis.__init__(self)
+            FakePubSubRedis.__init__(self)
+            self.down = True  # 로컬 전달만
+
+    chat = asyncio.run(
+        runner.run_chat(ChatFanoutScenario("chat", "", rooms=2, subscribers=3, messages=5), FakeChatRedis())
+    )
+    assert chat["deliveries"] == chat["deliveries_expected"] == 2 * 3 * 5 and chat["evicted"] == 0
+
+    baseline = runner.load_results(runner.save_results(document, tmp_path / "before.json"))
+    slower = json.loads(json.dumps(document))
+    slower["scenarios"]["comment_tree"]["latency_ms"]["p95"] *= 2
+    lines, regressions = runner.compare(baseline, slower)
+    assert regressions == ["comment_tree"]
+    assert any("REGRESSION" in line and line.startswith("comment_tree") for line in lines)
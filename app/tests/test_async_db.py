@@ -0,0 +1,99 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.api.deps import get_db, get_session
+from app.db.base import Base
+from app.db.session import to_async_url
+from app.main import app
+
+# 비동기 경로(AsyncSession + aiosqlite) 테스트 - 동기 경로 테스트(test_app.py)와 DB 파일을 분리
+ASYNC_TEST_DB = "./test_async.db"
+SYNC_URL = f"sqlite:///{ASYNC_TEST_DB}"
+
+
+@pytest.fixture(scope="module")
+def async_client():
+    if os.path.exists(ASYNC_TEST_DB):
+        os.remove(ASYNC_TEST_DB)
+
+    sync_engine = create_engine(SYNC_URL, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=sync_engine)
+    SyncSession = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+
+    # TestClient는 요청마다 이벤트 루프가 달라질 수 있으므로 커넥션 풀을 쓰지 않음
+    async_engine = create_async_engine(to_async_url(SYNC_URL), poolclass=NullPool)
+    AsyncSession = async_sessionmaker(bind=async_engine, autoflush=False)
+
+    def override_get_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_session():
+        async with AsyncSession() as db:
+            yield db
+
+    saved = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session] = override_get_session
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(saved)
+        sync_engine.dispose()
+
+
+def test_async_session_flow(async_client):
+    client = async_client
+    signup = {
+        "username": "async_user",
+        "lastname": "Lee",
+        "firstname": "Async",
+        "email": "async_user@example.com",
+        "password": "secret",
+    }
+    assert client.post("/api/v1/auth/signup", json=signup).status_code == 201
+    token = client.post(
+        "/api/v1/auth/login", json={"username": "async_user", "password": "secret"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/api/v1/users/me", headers=headers).json()["username"] == "async_user"
+
+    board = client.post("/api/v1/boards/", json={"name": "async_board"}).json()
+    board_id = board["id"]
+
+    post_data = {"title": "async", "content": "body", "board_id": board_id}
+    r = client.post(f"/api/v1/posts/boards/{board_id}/posts", json=post_data, headers=headers)
+    assert r.status_code == 201
+    post = r.json()
+    assert post["author"]["username"] == "async_user"
+    assert post["files"] == []
+
+    r = client.get(f"/api/v1/posts/boards/{board_id}/posts/{post['id']}")
+    assert r.status_code == 200 and r.json()["title"] == "async"
+
+    page = client.get(f"/api/v1/posts/boards/{board_id}/posts", params={"cursor": ""}).json()
+    assert [p["id"] for p in page["items"]] == [post["id"]]
+
+    parent = client.post(
+        f"/api/v1/posts/{post['id']}/comments", json={"content": "c"}, headers=headers
+    ).json()
+    client.post(f"/api/v1/comments/{parent['id']}/replies", json={"content": "r"}, headers=headers)
+    tree = client.get(f"/api/v1/posts/{post['id']}/comments/tree").json()
+    assert tree["items"][0]["replies"][0]["content"] == "r"
+
+    boards = client.get("/api/v1/boards/").json()
+    assert next(b for b in boards if b["id"] == board_id)["posts"] == 1
+
+    r = client.delete(f"/api/v1/posts/boards/{board_id}/posts/{post['id']}", headers=headers)
+    assert r.status_code == 204
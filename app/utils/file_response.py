@@ -0,0 +1,179 @@
+# app/utils/file_response.py
+
+"""
+조건부 GET · Range · zero-copy 전송을 지원하는 FileResponse
+
+Starlette FileResponse 위에 다음을 얹음:
+- 강한 ETag: 저장된 sha256(checksum)이 있으면 그대로 ETag로 사용 ("<sha256>")
+  (없으면 Starlette 기본값인 mtime-size 기반 ETag)
+- If-None-Match / If-Modified-Since → 304 Not Modified (GET/HEAD)
+- Range / 다중 Range(RFC 7233), If-Range 는 Starlette 구현을 그대로 사용하고,
+  다중 Range 응답의 Content-Type을 multipart/byteranges 로 바로잡음
+- 서버가 ASGI "http.response.zerocopysend" 확장을 지원하면 본문을 os.sendfile 로 전송
+  (지원하지 않는 서버(uvicorn 등)에서는 기존처럼 청크 단위로 읽어서 전송)
+"""
+
+import os
+from email.utils import parsedate_to_datetime
+from typing import BinaryIO
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+
+_ZEROCOPY = "http.response.zerocopysend"
+
+
+class ConditionalFileResponse(FileResponse):
+    def __init__(self, path, *, checksum: str | None = None, **kwargs) -> None:
+        headers = dict(kwargs.pop("headers", None) or {})
+        if checksum:
+            headers.setdefault("etag", f'"{checksum}"')
+        super().__init__(path, headers=headers, **kwargs)
+        self._zerocopy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.stat_result is None:
+            try:
+                self.stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            except FileNotFoundError:
+                raise RuntimeError(f"File at path {self.path} does not exist.")
+            self.set_stat_headers(self.stat_result)
+
+        method = scope["method"].upper()
+        if method in ("GET", "HEAD") and self._is_not_modified(Headers(scope=scope)):
+            response = Response(status_code=304, headers=self._validator_headers())
+            await response(scope, receive, send)
+            return
+
+        self._zerocopy = method != "HEAD" and _ZEROCOPY in scope.get("extensions", {})
+        await super().__call__(scope, receive, send)
+
+    # 조건부 GET ~~
+    def _is_not_modified(self, request_headers: Headers) -> bool:
+        """
+        RFC 7232: If-None-Match가 있으면 그것만 평가(약한 비교), 없을 때만 If-Modified-Since 평가
+        """
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            etag = _opaque_tag(self.headers["etag"])
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or any(_opaque_tag(tag) == etag for tag in tags)
+
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(self.stat_result.st_mtime) <= since
+
+    def _validator_headers(self) -> dict[str, str]:
+        return {
+            name: self.headers[name]
+            for name in ("etag", "last-modified", "cache-control")
+            if name in self.headers
+        }
+    # ~~ 조건부 GET
+
+    # 본문 전송 ~~
+    async def _handle_simple(self, send: Send, send_header_only: bool) -> None:
+        if not self._zerocopy:
+            await super()._handle_simple(send, send_header_only)
+            return
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        await self._send_zerocopy(send, [(0, self.stat_result.st_size)])
+
+    async def _handle_single_range(
+        self, send: Send, start: int, end: int, file_size: int, send_header_only: bool
+    ) -> None:
+        if not self._zerocopy:
+            await super()._handle_single_range(send, start, end, file_size, send_header_only)
+            return
+        self.headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+        self.headers["content-length"] = str(end - start)
+        await send({"type": "http.response.start", "status": 206, "headers": self.raw_headers})
+        await self._send_zerocopy(send, [(start, end)])
+
+    async def _handle_multiple_ranges(
+        self,
+        send: Send,
+        ranges: list[tuple[int, int]],
+        file_size: int,
+        send_header_only: bool,
+    ) -> None:
+        if not self._zerocopy:
+            # Starlette는 multipart 경계를 Content-Range 헤더에 싣기 때문에 Content-Type으로 옮겨서 보냄
+            await super()._handle_multiple_ranges(_fix_multipart_headers(send), ranges, file_size, send_header_only)
+            return
+
+        boundary = os.urandom(13).hex()
+        content_length, header_generator = self.generate_multipart(
+            ranges, boundary, file_size, self.headers["content-type"]
+        )
+        self.headers["content-type"] = f"multipart/byteranges; boundary={boundary}"
+        self.headers["content-length"] = str(content_length)
+        await send({"type": "http.response.start", "status": 206, "headers": self.raw_headers})
+
+        file = await anyio.to_thread.run_sync(open, self.path, "rb")
+        try:
+            for start, end in ranges:
+                await send({"type": "http.response.body", "body": header_generator(start, end), "more_body": True})
+                await _zerocopy_part(send, file, start, end)
+                await send({"type": "http.response.body", "body": b"\n", "more_body": True})
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": f"\n--{boundary}--\n".encode("latin-1"),
+                    "more_body": False,
+                }
+            )
+        finally:
+            await anyio.to_thread.run_sync(file.close)
+
+    async def _send_zerocopy(self, send: Send, ranges: list[tuple[int, int]]) -> None:
+        file = await anyio.to_thread.run_sync(open, self.path, "rb")
+        try:
+            for index, (start, end) in enumerate(ranges):
+                await _zerocopy_part(send, file, start, end, more_body=index < len(ranges) - 1)
+        finally:
+            await anyio.to_thread.run_sync(file.close)
+    # ~~ 본문 전송
+
+
+# 내부 헬퍼 ~~
+async def _zerocopy_part(
+    send: Send, file: BinaryIO, start: int, end: int, more_body: bool = True
+) -> None:
+    await send(
+        {
+            "type": _ZEROCOPY,
+            "file": file,
+            "offset": start,
+            "count": end - start,
+            "more_body": more_body,
+        }
+    )
+
+
+def _fix_multipart_headers(send: Send) -> Send:
+    async def wrapped(message) -> None:
+        if message["type"] == "http.response.start":
+            headers = [(n, v) for n, v in message["headers"] if n != b"content-type"]
+            headers = [
+                (b"content-type", v) if n == b"content-range" else (n, v) for n, v in headers
+            ]
+            message = {**message, "headers": headers}
+        await send(message)
+
+    return wrapped
+
+
+def _opaque_tag(tag: str) -> str:
+    """
+    약한 비교용: W/ 접두사 제거
+    """
+    return tag[2:] if tag.startswith("W/") else tag
+# ~~ 내부 헬퍼
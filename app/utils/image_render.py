@@ -0,0 +1,62 @@
+# app/utils/image_render.py
+
+"""
+이미지 파생본(썸네일/미리보기) 렌더링 - 프로세스 풀 워커에서 실행되는 순수 함수
+
+워커 프로세스가 가볍게 import 할 수 있도록 Pillow 외에는 앱 모듈을 import 하지 않음.
+Pillow(requirements.txt)가 없는 환경에서는 AVAILABLE=False 이고 파이프라인이 꺼짐.
+"""
+
+import hashlib
+import uuid
+from pathlib import Path
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - Pillow 없이 설치된 환경
+    Image = ImageOps = None
+
+AVAILABLE = Image is not None
+
+
+def render_variants(src: str, out_dir: str, sizes: dict[str, tuple[int, int]]) -> list[dict]:
+    """
+    src 이미지를 sizes의 각 상자 안에 들어가도록 축소해 out_dir에 저장하고, 결과 메타 목록을 반환
+    - 투명도가 있으면 PNG, 아니면 JPEG
+    - 원본보다 큰 상자는 확대하지 않음 (원본 크기 그대로 재인코딩)
+    """
+    results = []
+    largest = max(sizes.values())
+    with Image.open(src) as img:
+        # JPEG는 디코딩 단계에서 1/2, 1/4, 1/8로 줄여 읽어 CPU/메모리 절약
+        img.draft("RGB", largest)
+        img = ImageOps.exif_transpose(img)
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        fmt, ext, content_type = (
+            ("PNG", ".png", "image/png") if has_alpha else ("JPEG", ".jpg", "image/jpeg")
+        )
+
+        for name, box in sizes.items():
+            variant = img.copy()
+            variant.thumbnail(box, Image.Resampling.LANCZOS)
+            if fmt == "JPEG" and variant.mode != "RGB":
+                variant = variant.convert("RGB")
+            out_path = Path(out_dir) / f"{uuid.uuid4().hex}{ext}"
+            if fmt == "JPEG":
+                variant.save(out_path, fmt, quality=85, optimize=True, progressive=True)
+            else:
+                variant.save(out_path, fmt, optimize=True)
+
+            results.append(
+                {
+                    "name": name,
+                    "path": str(out_path),
+                    "ext": ext,
+                    "content_type": content_type,
+                    "width": variant.width,
+                    "height": variant.height,
+                    "size": out_path.stat().st_size,
+                    "checksum": hashlib.sha256(out_path.read_bytes()).hexdigest(),
+                }
+            )
+    return results
@@ -0,0 +1,13 @@
+# bench/__init__.py
+
+"""
+성능 측정(벤치마크/부하 테스트) 도구 - 앱 코드(app/)와 분리된 패키지
+
+- seed.py      : 현실적인 분포의 합성 데이터 생성 (게시판, 대량 게시글, 깊은 댓글 트리, 글이 수천 개인 유저)
+- scenarios.py : 측정 시나리오 (핫 엔드포인트 HTTP 요청 / WebSocket 채팅 fan-out)
+- runner.py    : 시나리오 실행(동시 가상 유저), p50/p95/p99·처리량 집계, 결과 JSON 저장/비교
+- __main__.py  : CLI (python -m bench seed | run | compare)
+
+DB는 앱과 같은 설정(DB_URL / DB_ASYNC)을 사용하므로 벤치마크 전용 DB를 지정해서 실행할 것.
+자세한 사용법은 README.bench.md 참고.
+"""
@@ -0,0 +1,105 @@
+# bench/__main__.py
+
+"""
+벤치마크 CLI
+
+사용법:
+    DB_URL=sqlite:///./bench.db python -m bench seed --profile small
+    DB_URL=sqlite:///./bench.db python -m bench run --concurrency 16 --duration 10
+    python -m bench run --db-url sqlite:///./bench.db --scenarios post_detail,comment_tree --out before.json
+    python -m bench compare before.json after.json --threshold 0.1
+    python -m bench list
+"""
+
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+from app.core.config import settings
+
+from bench import runner, seed as seeder
+from bench.scenarios import DEFAULT_SCENARIOS, SCENARIOS
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Benchmark and load-test the board API in-process")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="빈 DB에 합성 데이터 생성")
+    seed_parser.add_argument("--db-url", help="기본값: DB_URL 설정")
+    seed_parser.add_argument("--profile", choices=sorted(seeder.PROFILES), default="small")
+    seed_parser.add_argument("--seed", type=int, default=42)
+    seed_parser.add_argument("--batch-size", type=int, default=5_000)
+
+    run_parser = commands.add_parser("run", help="시나리오 실행 후 결과 JSON 저장")
+    run_parser.add_argument("--db-url", help="기본값: DB_URL 설정 (앱 엔진/풀 그대로 사용)")
+    run_parser.add_argument(
+        "--scenarios", default=",".join(DEFAULT_SCENARIOS), help="쉼표로 구분 (목록: python -m bench list)"
+    )
+    run_parser.add_argument("--concurrency", type=int, default=16, help="동시 가상 유저 수")
+    run_parser.add_argument("--duration", type=float, default=10.0, help="시나리오별 측정 시간 (초)")
+    run_parser.add_argument("--warmup", type=float, default=2.0, help="측정 전 예열 시간 (초)")
+    run_parser.add_argument("--requests", type=int, help="시간 대신 시나리오별 요청 수로 측정")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--out", type=Path, help="기본값: bench/results/<시각>-<커밋>.json")
+
+    compare_parser = commands.add_parser("compare", help="두 결과 JSON 비교 (회귀가 있으면 종료 코드 1)")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="p95 증가/처리량 감소 허용 비율")
+
+    commands.add_parser("list", help="시나리오 목록")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # 요청마다 남기는 로그 끄기
+
+    if args.command == "seed":
+        engine = create_engine(args.db_url or settings.DB_URL)
+        try:
+            seeder.seed(engine, seeder.PROFILES[args.profile], seed=args.seed, batch_size=args.batch_size)
+        finally:
+            engine.dispose()
+        return 0
+
+    if args.command == "run":
+        names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+        unknown = [name for name in names if name not in SCENARIOS]
+        if unknown:
+            parser.error(f"unknown scenarios: {', '.join(unknown)}")
+        document = asyncio.run(_run(args, names))
+        path = runner.save_results(document, args.out)
+        print(f"results saved to {path}")
+        return 0
+
+    if args.command == "compare":
+        lines, regressions = runner.compare(
+            runner.load_results(args.baseline), runner.load_results(args.current), args.threshold
+        )
+        print("\n".join(lines))
+        return 1 if regressions else 0
+
+    for name, scenario in SCENARIOS.items():
+        print(f"{name:<20} {scenario.description}")
+    return 0
+
+
+async def _run(args: argparse.Namespace, names: list[str]) -> dict:
+    from app.main import app  # 설정(.env)을 읽은 뒤에 앱을 만들도록 실행 시점에 import
+
+    async with runner.app_database(app, args.db_url) as engine:
+        return await runner.run_benchmarks(
+            app, engine, names,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            warmup=args.warmup,
+            requests=args.requests,
+            seed=args.seed,
+        )
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,364 @@
+# bench/runner.py
+
+"""
+시나리오 실행 · 결과 집계 · JSON 저장/비교
+
+- HTTP 시나리오: 동시 가상 유저 concurrency명이 warmup 후 duration초 동안(또는 requests개까지) 요청을 반복
+  httpx.AsyncClient + ASGITransport로 앱을 같은 프로세스에서 직접 호출 (네트워크/uvicorn 제외)
+  → 앱 코드(라우팅, 의존성, 직렬화, DB, threadpool)만의 비용
+- 결과: 시나리오별 요청 수, 오류 수, 상태 코드 분포, 처리량(req/s), 지연 p50/p95/p99/max/mean (ms)
+- 비교: 두 결과 파일의 같은 시나리오끼리 p95 증가 / 처리량 감소가 threshold를 넘으면 회귀로 표시
+"""
+
+import asyncio
+import json
+import logging
+import platform
+import random
+import subprocess
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+import httpx
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.deps import get_db, get_session
+from app.core.config import settings
+from app.db.session import engine as app_engine, to_async_url
+
+from bench.scenarios import BenchContext, ChatFanoutScenario, HttpScenario, SCENARIOS, VirtualUser
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+@asynccontextmanager
+async def app_database(app, db_url: Optional[str] = None) -> AsyncIterator[Engine]:
+    """
+    db_url이 없으면 앱 설정(DB_URL)의 엔진/풀을 그대로 사용하고,
+    있으면 그 DB를 보도록 세션 의존성을 잠시 바꿔 끼움 (DB_ASYNC면 비동기 세션으로)
+    """
+    if db_url is None:
+        yield app_engine
+        return
+
+    engine = create_engine(db_url)
+    async_engine = create_async_engine(to_async_url(db_url)) if settings.DB_ASYNC else None
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    saved = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = override_get_db
+    if async_engine is not None:
+        AsyncSession = async_sessionmaker(bind=async_engine, autoflush=False)
+
+        async def override_get_session():
+            async with AsyncSession() as db:
+                yield db
+
+        app.dependency_overrides[get_session] = override_get_session
+    try:
+        yield engine
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(saved)
+        if async_engine is not None:
+            await async_engine.dispose()
+        engine.dispose()
+
+
+async def run_benchmarks(
+    app,
+    engine: Engine,
+    names: list[str],
+    *,
+    concurrency: int = 16,
+    duration: float = 10.0,
+    warmup: float = 2.0,
+    requests: Optional[int] = None,
+    seed: int = 42,
+) -> dict[str, Any]:
+    """
+    names 순서대로 시나리오를 실행하고 결과 문서(meta + scenarios)를 반환
+    """
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"unknown scenarios: {', '.join(unknown)}")
+
+    context = BenchContext.discover(engine, seed)
+    chat_redis = redis.from_url(
+        settings.REDIS_URL, password=settings.REDIS_AUTH_PASSWORD, decode_responses=True
+    )
+    results: dict[str, Any] = {}
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name in names:
+                scenario = SCENARIOS[name]
+                logger.info("running %s", name)
+                if isinstance(scenario, HttpScenario):
+                    results[name] = await run_http(
+                        scenario, client, context,
+                        concurrency=concurrency, duration=duration, warmup=warmup,
+                        requests=requests, seed=seed,
+                    )
+                else:
+                    results[name] = await run_chat(scenario, chat_redis, seed=seed)
+                logger.info("%s: %s", name, _one_line(results[name]))
+        redis_status = await _redis_status(chat_redis)
+    finally:
+        await chat_redis.aclose()
+
+    return {
+        "meta": _meta(engine, context, redis_status, concurrency, duration, warmup, requests, seed),
+        "scenarios": results,
+    }
+
+
+async def run_http(
+    scenario: HttpScenario,
+    client: httpx.AsyncClient,
+    context: BenchContext,
+    *,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    requests: Optional[int] = None,
+    seed: int = 42,
+) -> dict[str, Any]:
+    latencies: list[float] = []
+    status_codes: dict[str, int] = {}
+    errors = 0
+    measuring = False
+    remaining = requests
+
+    async def virtual_user(index: int) -> None:
+        nonlocal errors, remaining
+        vu = VirtualUser(random.Random(f"{seed}:{scenario.name}:{index}"))
+        while not stop.is_set():
+            if measuring and remaining is not None:
+                if remaining <= 0:
+                    return
+                remaining -= 1
+            started = time.perf_counter()
+            try:
+                response = await scenario.request(client, context, vu)
+                status = str(response.status_code)
+            except Exception:
+                logger.exception("%s request failed", scenario.name)
+                status = "exception"
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if not measuring:
+                continue
+            latencies.append(elapsed_ms)
+            status_codes[status] = status_codes.get(status, 0) + 1
+            if not status.isdigit() or int(status) >= 400:
+                errors += 1
+
+    stop = asyncio.Event()
+    tasks = [asyncio.create_task(virtual_user(index)) for index in range(concurrency)]
+    try:
+        if warmup > 0:
+            await asyncio.sleep(warmup)
+        measuring = True
+        started = time.perf_counter()
+        if requests is None:
+            await asyncio.sleep(duration)
+            stop.set()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+    finally:
+        stop.set()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return {
+        "kind": "http",
+        "description": scenario.description,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "status_codes": status_codes,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": summarize(latencies),
+    }
+
+
+async def run_chat(scenario: ChatFanoutScenario, chat_redis, *, seed: int = 42) -> dict[str, Any]:
+    outcome = await scenario.run(chat_redis, seed)
+    elapsed = outcome["elapsed"]
+    return {
+        "kind": "websocket",
+        "description": scenario.description,
+        "rooms": scenario.rooms,
+        "subscribers_per_room": scenario.subscribers,
+        "messages_per_room": scenario.messages,
+        "published": outcome["published"],
+        "publish_rps": round(outcome["published"] / outcome["publish_seconds"], 2),
+        "deliveries_expected": outcome["expected"],
+        "deliveries": outcome["delivered"],
+        "slow_deliveries": outcome["slow_delivered"],
+        "evicted": outcome["evicted"],
+        "errors": outcome["expected"] - outcome["delivered"],
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(outcome["delivered"] / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": summarize(outcome["latencies_ms"]),
+    }
+
+
+def summarize(latencies: list[float]) -> dict[str, float]:
+    if not latencies:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0, "mean": 0.0}
+    ordered = sorted(latencies)
+    return {
+        "p50": _percentile(ordered, 0.50),
+        "p95": _percentile(ordered, 0.95),
+        "p99": _percentile(ordered, 0.99),
+        "max": round(ordered[-1], 3),
+        "mean": round(sum(ordered) / len(ordered), 3),
+    }
+
+
+# 결과 파일 ~~
+def save_results(document: dict[str, Any], path: Optional[Path] = None) -> Path:
+    """
+    path가 없으면 bench/results/<시각>-<커밋>.json
+    """
+    if path is None:
+        meta = document["meta"]
+        stamp = datetime.fromisoformat(meta["created_at"]).strftime("%Y%m%d-%H%M%S")
+        path = RESULTS_DIR / f"{stamp}-{meta['commit'] or 'nogit'}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2, ensure_ascii=False))
+    return path
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text())
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float = 0.10
+) -> tuple[list[str], list[str]]:
+    """
+    (표 형식 줄 목록, 회귀로 판단된 시나리오 이름 목록)
+    p95가 threshold 비율 이상 늘거나 처리량이 threshold 비율 이상 줄면 회귀
+    """
+    lines = [
+        f"baseline {baseline['meta'].get('commit')} -> current {current['meta'].get('commit')}",
+        f"{'scenario':<20} {'p50 ms':>18} {'p95 ms':>18} {'p99 ms':>18} {'throughput/s':>22}",
+    ]
+    regressions = []
+    for name, new in current["scenarios"].items():
+        old = baseline["scenarios"].get(name)
+        if old is None:
+            lines.append(f"{name:<20} (new)")
+            continue
+        cells = [
+            _delta(old["latency_ms"][key], new["latency_ms"][key]) for key in ("p50", "p95", "p99")
+        ]
+        cells.append(_delta(old["throughput_rps"], new["throughput_rps"]))
+        regressed = _relative(old["latency_ms"]["p95"], new["latency_ms"]["p95"]) > threshold or (
+            _relative(old["throughput_rps"], new["throughput_rps"]) < -threshold
+        )
+        if regressed:
+            regressions.append(name)
+        lines.append(
+            f"{name:<20} {cells[0]:>18} {cells[1]:>18} {cells[2]:>18} {cells[3]:>22}"
+            + ("  REGRESSION" if regressed else "")
+        )
+    return lines, regressions
+# ~~ 결과 파일
+
+
+# 내부 헬퍼 ~~
+def _percentile(sorted_values: list[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return round(sorted_values[index], 3)
+
+
+def _relative(old: float, new: float) -> float:
+    return (new - old) / old if old else 0.0
+
+
+def _delta(old: float, new: float) -> str:
+    return f"{old:.2f}->{new:.2f} ({_relative(old, new):+.0%})"
+
+
+def _one_line(result: dict[str, Any]) -> str:
+    latency = result["latency_ms"]
+    return (
+        f"{result['throughput_rps']}/s p50={latency['p50']}ms p95={latency['p95']}ms "
+        f"p99={latency['p99']}ms errors={result['errors']}"
+    )
+
+
+async def _redis_status(client) -> str:
+    try:
+        await client.ping()
+    except (RedisError, OSError):
+        return "unavailable"
+    return "ok"
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", *args], capture_output=True, text=True, timeout=10,
+            cwd=Path(__file__).resolve().parent.parent,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() if completed.returncode == 0 else None
+
+
+def _meta(
+    engine: Engine,
+    context: BenchContext,
+    redis_status: str,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    requests: Optional[int],
+    seed: int,
+) -> dict[str, Any]:
+    status = _git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "db": make_url(str(engine.url)).render_as_string(hide_password=True),
+        "db_async": settings.DB_ASYNC,
+        "redis": redis_status,
+        "dataset": {
+            "boards": len(context.board_ids),
+            "hot_board_id": context.hot_board_id,
+            "tree_posts": len(context.tree_post_ids),
+            "heavy_users": len(context.heavy_user_ids),
+        },
+        "concurrency": concurrency,
+        "duration_seconds": duration,
+        "warmup_seconds": warmup,
+        "requests": requests,
+        "seed": seed,
+    }
+# ~~ 내부 헬퍼
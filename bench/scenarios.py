@@ -0,0 +1,304 @@
+# bench/scenarios.py
+
+"""
+벤치마크 시나리오
+
+- HttpScenario : 가상 유저 하나가 반복해서 보내는 요청 하나 (in-process ASGI 클라이언트로 실행)
+- ChatFanoutScenario : 채팅방 여러 개에 구독자를 붙이고 메시지를 보내서
+    발행 → 각 구독자 소켓 전송까지의 지연과 초당 전달 수를 측정
+  httpx ASGITransport는 WebSocket을 지원하지 않으므로 ConnectionManager에 직접
+  메모리 소켓(_SinkWebSocket)을 붙임. 백플레인/기록(Redis Stream)/송신 큐(Outbox) 경로는 실제 코드 그대로
+  (Redis가 없으면 앱과 같이 fail-open - 결과 meta의 redis 항목으로 구분)
+
+BenchContext는 seed로 만든 DB에서 측정 대상(핫 게시판, 트리 게시글, heavy 유저 등)을 찾아 둔 것.
+"""
+
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+
+from app.core.security import create_access_token
+from app.db.models.board import Board
+from app.db.models.comment import Comment
+from app.db.models.post import Post
+from app.db.models.user import User
+from app.services.backplane import Backplane
+from app.services.websocket import ConnectionManager
+
+from bench.seed import BENCH_PASSWORD, HEAVY_USER_PREFIX, USER_PREFIX
+
+_POST_SAMPLE_SIZE = 5_000    # 단건 조회 대상으로 미리 뽑아 두는 게시글 수
+_USER_SAMPLE_SIZE = 200      # 토큰을 미리 만들어 두는 일반 유저 수
+_KEYSET_WALK_PAGES = 50      # 커서 페이지를 이만큼 넘기면 첫 페이지부터 다시
+
+
+@dataclass
+class BenchContext:
+    hot_board_id: int
+    board_ids: list[int]
+    posts: list[tuple[int, int]]          # (post_id, board_id) 샘플
+    tree_post_ids: list[int]
+    heavy_user_ids: list[int]
+    user_ids: list[int]
+    tokens: dict[int, str] = field(default_factory=dict)
+
+    @classmethod
+    def discover(cls, engine: Engine, seed: int = 42) -> "BenchContext":
+        rng = random.Random(seed)
+        with engine.connect() as conn:
+            board_rows = conn.execute(
+                select(Board.id).order_by(Board.post_count.desc(), Board.id)
+            ).scalars().all()
+            if not board_rows:
+                raise RuntimeError("benchmark database is empty - run `python -m bench seed` first")
+            max_post_id = conn.execute(select(func.max(Post.id))).scalar() or 0
+            candidate_ids = rng.sample(range(1, max_post_id + 1), min(_POST_SAMPLE_SIZE, max_post_id))
+            posts = conn.execute(
+                select(Post.id, Post.board_id).where(Post.id.in_(candidate_ids))
+            ).all()
+            tree_post_ids = conn.execute(select(Comment.post_id).distinct()).scalars().all()
+            heavy_user_ids = conn.execute(
+                select(User.id).where(User.username.like(f"{HEAVY_USER_PREFIX}%"))
+            ).scalars().all()
+            user_ids = conn.execute(
+                select(User.id).where(User.username.like(f"{USER_PREFIX}%")).limit(_USER_SAMPLE_SIZE)
+            ).scalars().all()
+
+        context = cls(
+            hot_board_id=board_rows[0],
+            board_ids=list(board_rows),
+            posts=[tuple(row) for row in posts],
+            tree_post_ids=list(tree_post_ids),
+            heavy_user_ids=list(heavy_user_ids),
+            user_ids=list(user_ids),
+        )
+        for user_id in (*context.heavy_user_ids, *context.user_ids):
+            context.tokens[user_id] = create_access_token({"sub": str(user_id)})
+        return context
+
+    def username(self, user_id: int) -> str:
+        prefix = HEAVY_USER_PREFIX if user_id in self.heavy_user_ids else USER_PREFIX
+        return f"{prefix}{user_id}"
+
+    def auth(self, user_id: int) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.tokens[user_id]}"}
+
+
+@dataclass
+class VirtualUser:
+    """
+    동시 가상 유저 하나의 상태 (커서 위치 등)
+    """
+    rng: random.Random
+    state: dict[str, Any] = field(default_factory=dict)
+
+
+RequestFn = Callable[[httpx.AsyncClient, BenchContext, VirtualUser], Awaitable[httpx.Response]]
+
+
+@dataclass(frozen=True)
+class HttpScenario:
+    name: str
+    description: str
+    request: RequestFn
+    writes: bool = False  # DB를 바꾸는 시나리오는 기본 실행 목록에서 제외
+
+
+# HTTP 요청 ~~
+async def _boards_list(client, ctx, vu):
+    return await client.get("/api/v1/boards/")
+
+
+async def _hot_board_offset(client, ctx, vu):
+    page = vu.rng.randint(1, 200)  # 깊은 OFFSET 포함
+    return await client.get(
+        f"/api/v1/posts/boards/{ctx.hot_board_id}/posts", params={"page": page, "size": 20}
+    )
+
+
+async def _hot_board_keyset(client, ctx, vu):
+    cursor = vu.state.get("cursor", "")
+    response = await client.get(
+        f"/api/v1/posts/boards/{ctx.hot_board_id}/posts", params={"cursor": cursor, "size": 20}
+    )
+    pages = vu.state.get("pages", 0) + 1
+    next_cursor = response.json().get("next_cursor") if response.status_code == 200 else None
+    if next_cursor is None or pages >= _KEYSET_WALK_PAGES:
+        next_cursor, pages = "", 0
+    vu.state.update(cursor=next_cursor, pages=pages)
+    return response
+
+
+async def _post_detail(client, ctx, vu):
+    post_id, board_id = vu.rng.choice(ctx.posts)
+    return await client.get(f"/api/v1/posts/boards/{board_id}/posts/{post_id}")
+
+
+async def _comment_tree(client, ctx, vu):
+    post_id = vu.rng.choice(ctx.tree_post_ids)
+    return await client.get(f"/api/v1/posts/{post_id}/comments/tree", params={"size": 200})
+
+
+async def _comments_flat(client, ctx, vu):
+    post_id = vu.rng.choice(ctx.tree_post_ids)
+    return await client.get(f"/api/v1/posts/{post_id}/comments")
+
+
+async def _me_heavy_user(client, ctx, vu):
+    return await client.get("/api/v1/users/me", headers=ctx.auth(vu.rng.choice(ctx.heavy_user_ids)))
+
+
+async def _me_ordinary_user(client, ctx, vu):
+    return await client.get("/api/v1/users/me", headers=ctx.auth(vu.rng.choice(ctx.user_ids)))
+
+
+async def _login(client, ctx, vu):
+    user_id = vu.rng.choice(ctx.user_ids)
+    return await client.post(
+        "/api/v1/auth/login", json={"username": ctx.username(user_id), "password": BENCH_PASSWORD}
+    )
+
+
+async def _create_comment(client, ctx, vu):
+    post_id = vu.rng.choice(ctx.tree_post_ids)
+    return await client.post(
+        f"/api/v1/posts/{post_id}/comments",
+        json={"content": "bench comment"},
+        headers=ctx.auth(vu.rng.choice(ctx.user_ids)),
+    )
+# ~~ HTTP 요청
+
+
+# WebSocket 채팅 fan-out ~~
+class _SinkWebSocket:
+    """
+    서버가 보내는 프레임을 받은 시각과 함께 넘겨주는 메모리 소켓 (delay로 느린 클라이언트 흉내)
+    """
+
+    def __init__(self, on_frame: Callable[[str, float], None], delay: float = 0.0) -> None:
+        self._on_frame = on_frame
+        self._delay = delay
+        self.close_code: Optional[int] = None
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, data: str) -> None:
+        if self._delay:
+            await asyncio.sleep(self._delay)
+        self._on_frame(data, time.perf_counter())
+
+    async def close(self, code: int = 1000) -> None:
+        self.close_code = code
+
+
+@dataclass(frozen=True)
+class ChatFanoutScenario:
+    name: str
+    description: str
+    rooms: int = 4
+    subscribers: int = 50          # 방당 구독자 수
+    messages: int = 200            # 방당 발행 메시지 수
+    slow_ratio: float = 0.0        # 느린 구독자 비율
+    slow_delay: float = 0.05       # 느린 구독자의 프레임당 전송 시간 (단위: 초)
+    drain_timeout: float = 30.0    # 발행 후 전달 완료까지 기다리는 최대 시간 (단위: 초)
+
+    async def run(self, redis, seed: int = 42) -> dict[str, Any]:
+        """
+        지연 샘플(ms, 빠른 구독자 기준)과 전달/발행/강제 종료 수를 반환
+        """
+        rng = random.Random(seed)
+        backplane = Backplane(redis)
+        manager = ConnectionManager(backplane=backplane, redis=redis)
+        sent_at: dict[str, float] = {}
+        latencies: list[float] = []
+        counts = {"delivered": 0, "slow_delivered": 0}
+
+        def sink(slow: bool) -> Callable[[str, float], None]:
+            def on_frame(data: str, received_at: float) -> None:
+                frame = json.loads(data)
+                started = sent_at.get(frame.get("text", "")) if frame.get("type") == "message" else None
+                if started is None:
+                    return  # 입장/기록 프레임
+                if slow:
+                    counts["slow_delivered"] += 1
+                else:
+                    counts["delivered"] += 1
+                    latencies.append((received_at - started) * 1000)
+            return on_frame
+
+        sockets: list[tuple[str, str, _SinkWebSocket]] = []  # (방, 이름, 소켓)
+        fast_subscribers = 0
+        for room in range(self.rooms):
+            room_id = f"bench-{room}"
+            for index in range(self.subscribers):
+                slow = rng.random() < self.slow_ratio
+                fast_subscribers += 0 if slow else 1
+                websocket = _SinkWebSocket(sink(slow), self.slow_delay if slow else 0.0)
+                username = f"bench{index}"
+                await manager.connect(websocket, room_id, username)
+                sockets.append((room_id, username, websocket))
+
+        async def publish(room_id: str) -> None:
+            for seq in range(self.messages):
+                text = f"{room_id}:{seq}"
+                sent_at[text] = time.perf_counter()
+                await manager.send_message(room_id, text)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(publish(f"bench-{room}") for room in range(self.rooms)))
+        published = time.perf_counter() - started
+        expected = fast_subscribers * self.messages
+        deadline = time.monotonic() + self.drain_timeout
+        while counts["delivered"] < expected and time.monotonic() < deadline:
+            await asyncio.sleep(0.005)
+        elapsed = time.perf_counter() - started
+
+        evicted = sum(1 for _, _, websocket in sockets if websocket.close_code is not None)
+        for room_id, username, websocket in sockets:
+            await manager.disconnect(websocket, room_id, username)
+        await backplane.close()
+        return {
+            "latencies_ms": latencies,
+            "elapsed": elapsed,
+            "publish_seconds": published,
+            "published": self.rooms * self.messages,
+            "expected": expected,
+            "delivered": counts["delivered"],
+            "slow_delivered": counts["slow_delivered"],
+            "evicted": evicted,
+        }
+# ~~ WebSocket 채팅 fan-out
+
+
+SCENARIOS: dict[str, HttpScenario | ChatFanoutScenario] = {
+    scenario.name: scenario
+    for scenario in (
+        HttpScenario("boards_list", "GET /boards/ - 게시판 목록", _boards_list),
+        HttpScenario("hot_board_offset", "가장 큰 게시판 OFFSET 목록 (1~200페이지)", _hot_board_offset),
+        HttpScenario("hot_board_keyset", "가장 큰 게시판 커서 목록 (50페이지까지 넘김)", _hot_board_keyset),
+        HttpScenario("post_detail", "게시글 단건 조회 (캐시 포함)", _post_detail),
+        HttpScenario("comment_tree", "깊은 댓글 트리 조회 (200노드 페이지)", _comment_tree),
+        HttpScenario("comments_flat", "댓글 전체 평면 목록", _comments_flat),
+        HttpScenario("me_heavy_user", "GET /users/me - 게시글이 수천 개인 유저", _me_heavy_user),
+        HttpScenario("me_ordinary_user", "GET /users/me - 일반 유저", _me_ordinary_user),
+        HttpScenario("login", "POST /auth/login (bcrypt)", _login),
+        HttpScenario("create_comment", "댓글 작성 (DB 변경)", _create_comment, writes=True),
+        ChatFanoutScenario("chat_fanout", "방 4개 x 구독자 50명, 방당 메시지 200개"),
+        ChatFanoutScenario(
+            "chat_fanout_slow", "chat_fanout + 구독자 10%가 느린 클라이언트(프레임당 50ms)",
+            slow_ratio=0.1,
+        ),
+    )
+}
+
+DEFAULT_SCENARIOS = [
+    name for name, scenario in SCENARIOS.items() if not getattr(scenario, "writes", False)
+]
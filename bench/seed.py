@@ -0,0 +1,247 @@
+# bench/seed.py
+
+"""
+벤치마크용 합성 데이터 생성기
+
+분포 (운영 데이터에서 느려지는 모양을 흉내 냄):
+- 게시판별 게시글 수는 Zipf 분포 (첫 번째 게시판이 가장 "핫"함 - 깊은 OFFSET/커서 페이지 측정용)
+- 상위 heavy_users명은 각자 heavy_user_posts개의 글을 씀 (User.posts selectin 로딩 비용 측정용)
+- comment_trees개 게시글에는 댓글 comments_per_tree개짜리 깊은 트리
+  (최근 댓글에 답글을 다는 경향 → COMMENT_MAX_DEPTH까지 이어지는 긴 체인)
+- 작성 시각은 최근 1년에 id 순으로 분포 (keyset 인덱스 (board_id, created_at, id) 순서와 일치)
+
+대량 삽입은 ORM을 거치지 않고 Core insert + executemany로 배치마다 커밋.
+id를 직접 지정하므로 빈 DB에서만 실행 가능 (다시 만들려면 DB를 지우고 실행).
+모든 유저의 비밀번호는 BENCH_PASSWORD (해시는 한 번만 계산해서 공유).
+"""
+
+import logging
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any, Iterator
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.db.base import Base
+from app.db.models.board import Board
+from app.db.models.comment import Comment
+from app.db.models.post import Post
+from app.db.models.user import User
+
+logger = logging.getLogger(__name__)
+
+BENCH_PASSWORD = "bench-password"
+USER_PREFIX = "bench_user_"
+HEAVY_USER_PREFIX = "bench_heavy_"
+
+_WORDS = (
+    "fastapi sqlalchemy redis websocket board post comment reply upload cache index query "
+    "latency worker pool cursor offset keyset stream backplane session token bcrypt async "
+    "게시판 게시글 댓글 대댓글 첨부파일 캐시 인덱스 쿼리 지연 워커 커넥션 세션 토큰 채팅 알림"
+).split()
+
+
+@dataclass(frozen=True)
+class SeedProfile:
+    users: int
+    boards: int
+    posts: int              # 전체 게시글 수 (heavy 유저 글 포함)
+    heavy_users: int
+    heavy_user_posts: int   # heavy 유저 1명당 게시글 수
+    comment_trees: int      # 깊은 댓글 트리가 달린 게시글 수
+    comments_per_tree: int
+
+
+PROFILES: dict[str, SeedProfile] = {
+    # 테스트/CI 스모크용
+    "tiny": SeedProfile(
+        users=50, boards=3, posts=2_000,
+        heavy_users=2, heavy_user_posts=300,
+        comment_trees=3, comments_per_tree=200,
+    ),
+    "small": SeedProfile(
+        users=1_000, boards=10, posts=100_000,
+        heavy_users=5, heavy_user_posts=5_000,
+        comment_trees=30, comments_per_tree=1_000,
+    ),
+    "medium": SeedProfile(
+        users=10_000, boards=30, posts=1_000_000,
+        heavy_users=10, heavy_user_posts=10_000,
+        comment_trees=200, comments_per_tree=2_000,
+    ),
+    "large": SeedProfile(
+        users=50_000, boards=50, posts=3_000_000,
+        heavy_users=20, heavy_user_posts=20_000,
+        comment_trees=500, comments_per_tree=3_000,
+    ),
+}
+
+
+def seed(engine: Engine, profile: SeedProfile, *, seed: int = 42, batch_size: int = 5_000) -> dict[str, Any]:
+    """
+    빈 DB에 테이블을 만들고 profile 규모의 데이터를 채움. 생성한 건수 요약을 반환
+    """
+    if profile.heavy_users * profile.heavy_user_posts > profile.posts:
+        raise ValueError("heavy_users * heavy_user_posts must not exceed posts")
+    if profile.heavy_users > profile.users:
+        raise ValueError("heavy_users must not exceed users")
+
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        if conn.execute(select(func.count()).select_from(Board.__table__)).scalar():
+            raise RuntimeError("database is not empty - seed a fresh benchmark database")
+
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    now = datetime.now().replace(microsecond=0)
+
+    _insert(engine, User.__table__, _users(profile, now), batch_size, "users")
+    _insert(engine, Board.__table__, _boards(profile, now), batch_size, "boards")
+    _insert(engine, Post.__table__, _posts(profile, rng, now), batch_size, "posts")
+    comments = _insert(engine, Comment.__table__, _comment_trees(profile, rng, now), batch_size, "comments")
+
+    # 비정규화 카운터를 실제 값으로 (board_counters.reconcile_post_counts와 같은 결과)
+    with engine.begin() as conn:
+        counts = conn.execute(
+            select(Post.board_id, func.count()).group_by(Post.board_id)
+        ).all()
+        for board_id, count in counts:
+            conn.execute(update(Board.__table__).where(Board.id == board_id).values(post_count=count))
+
+    summary = {**asdict(profile), "comments": comments, "seed": seed}
+    logger.info("seeded in %.1fs: %s", time.perf_counter() - started, summary)
+    return summary
+
+
+# 행 생성기 ~~
+def _users(profile: SeedProfile, now: datetime) -> Iterator[dict[str, Any]]:
+    hashed = get_password_hash(BENCH_PASSWORD)  # bcrypt는 느리므로 한 번만
+    for user_id in range(1, profile.users + 1):
+        prefix = HEAVY_USER_PREFIX if user_id <= profile.heavy_users else USER_PREFIX
+        username = f"{prefix}{user_id}"
+        yield {
+            "id": user_id,
+            "username": username,
+            "lastname": "Bench",
+            "firstname": f"User{user_id}",
+            "email": f"{username}@bench.example.com",
+            "hashed_password": hashed,
+            "is_active": True,
+            "is_admin": False,
+            "created_at": now - timedelta(days=400),
+        }
+
+
+def _boards(profile: SeedProfile, now: datetime) -> Iterator[dict[str, Any]]:
+    for board_id in range(1, profile.boards + 1):
+        yield {
+            "id": board_id,
+            "name": f"bench-board-{board_id}",
+            "description": f"benchmark board #{board_id}",
+            "post_count": 0,
+            "created_at": now - timedelta(days=400),
+        }
+
+
+def _posts(profile: SeedProfile, rng: random.Random, now: datetime) -> Iterator[dict[str, Any]]:
+    board_ids = list(range(1, profile.boards + 1))
+    board_weights = [1 / rank for rank in board_ids]  # Zipf
+    # heavy 유저 글을 전체 기간에 흩어 놓음
+    authors = [user_id for user_id in range(1, profile.heavy_users + 1) for _ in range(profile.heavy_user_posts)]
+    ordinary = range(profile.heavy_users + 1, profile.users + 1) or range(1, profile.users + 1)
+    authors += [rng.choice(ordinary) for _ in range(profile.posts - len(authors))]
+    rng.shuffle(authors)
+
+    span_seconds = 365 * 24 * 3600
+    start = now - timedelta(seconds=span_seconds)
+    board_choices = rng.choices(board_ids, weights=board_weights, k=profile.posts)
+    for index, (author_id, board_id) in enumerate(zip(authors, board_choices)):
+        post_id = index + 1
+        created_at = start + timedelta(seconds=span_seconds * index // profile.posts)
+        yield {
+            "id": post_id,
+            "title": f"{_sentence(rng, 3, 8)} #{post_id}",
+            "content": _sentence(rng, 20, 300),
+            "author_id": author_id,
+            "board_id": board_id,
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+
+
+def _comment_trees(profile: SeedProfile, rng: random.Random, now: datetime) -> Iterator[dict[str, Any]]:
+    """
+    트리 게시글은 가장 최근 글들 (목록 첫 페이지에서 바로 열리는 글)
+    """
+    max_depth = settings.COMMENT_MAX_DEPTH
+    comment_id = 0
+    first_post = max(profile.posts - profile.comment_trees + 1, 1)
+    for post_id in range(first_post, profile.posts + 1):
+        nodes: list[tuple[int, int, str]] = []  # (id, depth, path)
+        created_at = now - timedelta(hours=6)
+        for _ in range(profile.comments_per_tree):
+            comment_id += 1
+            created_at += timedelta(seconds=rng.randint(1, 20))
+            parent = _pick_parent(nodes, rng, max_depth)
+            segment = f"{comment_id:010d}"  # crud.comment._path_segment 과 같은 형식
+            if parent is None:
+                depth, path, parent_id = 0, segment, None
+            else:
+                parent_id, parent_depth, parent_path = parent
+                depth, path = parent_depth + 1, parent_path + segment
+            nodes.append((comment_id, depth, path))
+            yield {
+                "id": comment_id,
+                "content": _sentence(rng, 3, 40),
+                "parent_id": parent_id,
+                "depth": depth,
+                "path": path,
+                "post_id": post_id,
+                "author_id": rng.randint(1, profile.users),
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+
+
+def _pick_parent(
+    nodes: list[tuple[int, int, str]], rng: random.Random, max_depth: int
+) -> tuple[int, int, str] | None:
+    if not nodes or rng.random() < 0.15:
+        return None  # 최상위 댓글
+    # 대화는 주로 최근 댓글에 이어짐 → 깊은 체인
+    parent = nodes[-1] if rng.random() < 0.6 else rng.choice(nodes)
+    return parent if parent[1] < max_depth else None
+# ~~ 행 생성기
+
+
+# 내부 헬퍼 ~~
+def _insert(engine: Engine, table, rows: Iterator[dict[str, Any]], batch_size: int, label: str) -> int:
+    total = 0
+    batch: list[dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            total += _flush(engine, table, batch)
+            logger.info("%s: %d", label, total)
+    if batch:
+        total += _flush(engine, table, batch)
+    logger.info("%s: %d (done)", label, total)
+    return total
+
+
+def _flush(engine: Engine, table, batch: list[dict[str, Any]]) -> int:
+    with engine.begin() as conn:
+        conn.execute(insert(table), batch)  # executemany
+    count = len(batch)
+    batch.clear()
+    return count
+
+
+def _sentence(rng: random.Random, min_words: int, max_words: int) -> str:
+    return " ".join(rng.choices(_WORDS, k=rng.randint(min_words, max_words)))
+# ~~ 내부 헬퍼